@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
@@ -17,7 +18,10 @@ cli_path = Path(__file__).parent.parent.parent / "cli"
 sys.path.insert(0, str(cli_path))
 
 from nao_core.config import NaoConfig, NaoConfigError
+from nao_core.commands.sync.joins import JoinGraph, format_join_path, get_joins_path
 from nao_core.context import get_context_provider
+from nao_core.search import get_search_index_path, search
+from nao_core.templates.context import get_database_output_path
 
 port = int(os.environ.get("PORT", 8005))
 
@@ -106,6 +110,45 @@ class RefreshResponse(BaseModel):
     message: str
 
 
+class SearchRequest(BaseModel):
+    query: str
+    nao_project_folder: str
+    limit: int = 20
+    source: str | None = None
+
+
+class SearchHitModel(BaseModel):
+    path: str
+    source: str
+    title: str
+    snippet: str
+    score: float
+
+
+class SearchResponse(BaseModel):
+    hits: list[SearchHitModel]
+    took_ms: float
+
+
+class JoinPathRequest(BaseModel):
+    source: str
+    target: str
+    nao_project_folder: str
+    database_id: str | None = None
+
+
+class JoinEdgeModel(BaseModel):
+    source: str
+    target: str
+    on: list[list[str]]
+    kind: str
+
+
+class JoinPathResponse(BaseModel):
+    path: list[JoinEdgeModel]
+    sql: str
+
+
 class HealthResponse(BaseModel):
     status: str
     context_source: str
@@ -171,6 +214,45 @@ async def refresh_context():
         )
 
 
+def _get_database_config(config: NaoConfig, database_id: str | None):
+    """Pick the database a request targets, raising a 400 error when it is ambiguous."""
+    if len(config.databases) == 0:
+        raise HTTPException(
+            status_code=400,
+            detail="No databases configured in nao_config.yaml",
+        )
+
+    # Determine which database to use
+    if len(config.databases) == 1:
+        return config.databases[0]
+
+    available_databases = [db.name for db in config.databases]
+    if database_id:
+        # Find the database by name
+        db_config = next(
+            (db for db in config.databases if db.name == database_id),
+            None,
+        )
+        if db_config is None:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "message": f"Database '{database_id}' not found",
+                    "available_databases": available_databases,
+                },
+            )
+        return db_config
+
+    # Multiple databases and no database_id specified
+    raise HTTPException(
+        status_code=400,
+        detail={
+            "message": "Multiple databases configured. Please specify database_id.",
+            "available_databases": available_databases,
+        },
+    )
+
+
 @app.post("/execute_sql", response_model=ExecuteSQLResponse)
 async def execute_sql(request: ExecuteSQLRequest):
     try:
@@ -180,40 +262,7 @@ async def execute_sql(request: ExecuteSQLRequest):
         config = NaoConfig.try_load(project_path, raise_on_error=True)
         assert config is not None
 
-        if len(config.databases) == 0:
-            raise HTTPException(
-                status_code=400,
-                detail="No databases configured in nao_config.yaml",
-            )
-
-        # Determine which database to use
-        if len(config.databases) == 1:
-            db_config = config.databases[0]
-        elif request.database_id:
-            # Find the database by name
-            db_config = next(
-                (db for db in config.databases if db.name == request.database_id),
-                None,
-            )
-            if db_config is None:
-                available_databases = [db.name for db in config.databases]
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "message": f"Database '{request.database_id}' not found",
-                        "available_databases": available_databases,
-                    },
-                )
-        else:
-            # Multiple databases and no database_id specified
-            available_databases = [db.name for db in config.databases]
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "message": "Multiple databases configured. Please specify database_id.",
-                    "available_databases": available_databases,
-                },
-            )
+        db_config = _get_database_config(config, request.database_id)
 
         df = db_config.execute_sql(request.sql)
 
@@ -246,6 +295,76 @@ async def execute_sql(request: ExecuteSQLRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/search", response_model=SearchResponse)
+async def search_context(request: SearchRequest):
+    """Full-text search over the synced context, ranked by BM25.
+
+    Uses the index that `nao sync` maintains in `.nao/search.sqlite`.
+    """
+    index_path = get_search_index_path(Path(request.nao_project_folder))
+    if not index_path.exists():
+        raise HTTPException(
+            status_code=404,
+            detail="No search index found. Run `nao sync` to build it.",
+        )
+
+    try:
+        start = time.perf_counter()
+        hits = search(
+            index_path,
+            request.query,
+            limit=request.limit,
+            source=request.source,
+        )
+        took_ms = (time.perf_counter() - start) * 1000
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return SearchResponse(
+        hits=[SearchHitModel(**vars(hit)) for hit in hits],
+        took_ms=round(took_ms, 2),
+    )
+
+
+@app.post("/join_path", response_model=JoinPathResponse)
+async def join_path(request: JoinPathRequest):
+    """Shortest join path between two tables, from the join graph built by `nao sync`."""
+    try:
+        project_path = Path(request.nao_project_folder)
+        config = NaoConfig.try_load(project_path, raise_on_error=True)
+        assert config is not None
+        db_config = _get_database_config(config, request.database_id)
+
+        joins_path = get_joins_path(get_database_output_path(project_path, db_config))
+        if not joins_path.exists():
+            raise HTTPException(
+                status_code=404,
+                detail=f"No join graph found for '{db_config.name}'. Run `nao sync` to build it.",
+            )
+
+        graph = JoinGraph.load(joins_path)
+        try:
+            path = graph.shortest_path(request.source, request.target)
+        except KeyError as e:
+            raise HTTPException(status_code=400, detail=e.args[0])
+        if path is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No join path between '{request.source}' and '{request.target}'",
+            )
+
+        return JoinPathResponse(
+            path=[JoinEdgeModel(**edge.to_dict()) for edge in path],
+            sql=format_join_path(path) or f"FROM {graph.resolve(request.source)}",
+        )
+    except HTTPException:
+        raise
+    except NaoConfigError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 if __name__ == "__main__":
     nao_project_folder = os.getenv("NAO_DEFAULT_PROJECT_PATH")
     if nao_project_folder:
@@ -153,4 +153,122 @@ def test_execute_sql_with_cte_bigquery(bigquery_project_folder):
             {"id": 2, "name": "Bob"},
             {"id": 3, "name": "Charlie"},
         ],
-    )
\ No newline at end of file
+    )
+
+def test_search_ranks_synced_context(duckdb_project_folder):
+    """Test search endpoint over a project indexed by `nao sync`."""
+    from nao_core.search import update_search_index
+
+    table_dir = (
+        Path(duckdb_project_folder)
+        / "databases"
+        / "type=duckdb"
+        / "database=memory"
+        / "schema=main"
+        / "table=orders"
+    )
+    table_dir.mkdir(parents=True)
+    (table_dir / "columns.md").write_text("# orders\n\n- customer_id (int64)\n")
+    (Path(duckdb_project_folder) / "RULES.md").write_text("# Rules\n\nBe concise.\n")
+    update_search_index(Path(duckdb_project_folder))
+    client = TestClient(app)
+
+    response = client.post(
+        "/search",
+        json={"query": "customer", "nao_project_folder": duckdb_project_folder},
+    )
+
+    assert response.status_code == 200
+    hits = response.json()["hits"]
+    assert [hit["title"] for hit in hits] == ["memory.main.orders columns"]
+    assert hits[0]["source"] == "databases"
+    assert "**customer_id**" in hits[0]["snippet"]
+
+
+def test_search_without_index(duckdb_project_folder):
+    """Test search endpoint before the project was synced."""
+    client = TestClient(app)
+
+    response = client.post(
+        "/search",
+        json={"query": "orders", "nao_project_folder": duckdb_project_folder},
+    )
+
+    assert response.status_code == 404
+
+
+def test_join_path_duckdb(duckdb_project_folder):
+    """Test join_path endpoint with a join graph built by `nao sync`."""
+    from nao_core.commands.sync.joins import JoinEdge, JoinGraph, write_join_graph
+
+    graph = JoinGraph(
+        tables={"main.orders", "main.customers", "main.countries"},
+        edges=[
+            JoinEdge("main.orders", "main.customers", (("customer_id", "id"),)),
+            JoinEdge("main.customers", "main.countries", (("country_id", "id"),), "inferred"),
+        ],
+    )
+    db_path = Path(duckdb_project_folder) / "databases" / "type=duckdb" / "database=memory"
+    write_join_graph(db_path / "joins.json", graph)
+    client = TestClient(app)
+
+    response = client.post(
+        "/join_path",
+        json={
+            "source": "orders",
+            "target": "countries",
+            "nao_project_folder": duckdb_project_folder,
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [edge["target"] for edge in data["path"]] == ["main.customers", "main.countries"]
+    assert data["sql"] == (
+        "FROM main.orders\n"
+        "JOIN main.customers ON main.orders.customer_id = main.customers.id\n"
+        "JOIN main.countries ON main.customers.country_id = main.countries.id"
+    )
+
+
+def test_join_path_in_custom_output_dir(duckdb_project_folder):
+    """Test join_path endpoint when `nao sync` wrote the databases to another folder."""
+    from nao_core.commands.sync.joins import JoinEdge, JoinGraph, write_join_graph
+    from nao_core.outputs import save_output_dirs
+
+    graph = JoinGraph(
+        tables={"main.orders", "main.customers"},
+        edges=[JoinEdge("main.orders", "main.customers", (("customer_id", "id"),))],
+    )
+    save_output_dirs(Path(duckdb_project_folder), {"Databases": "context/databases"})
+    db_path = Path(duckdb_project_folder) / "context" / "databases" / "type=duckdb" / "database=memory"
+    write_join_graph(db_path / "joins.json", graph)
+    client = TestClient(app)
+
+    response = client.post(
+        "/join_path",
+        json={
+            "source": "orders",
+            "target": "customers",
+            "nao_project_folder": duckdb_project_folder,
+        },
+    )
+
+    assert response.status_code == 200
+    assert [edge["target"] for edge in response.json()["path"]] == ["main.customers"]
+
+
+def test_join_path_without_join_graph(duckdb_project_folder):
+    """Test join_path endpoint before the database was synced."""
+    client = TestClient(app)
+
+    response = client.post(
+        "/join_path",
+        json={
+            "source": "orders",
+            "target": "countries",
+            "nao_project_folder": duckdb_project_folder,
+        },
+    )
+
+    assert response.status_code == 404
@@ -8,16 +8,20 @@ from cyclopts import Parameter
 from rich.console import Console
 
 from nao_core.config import NaoConfig
+from nao_core.outputs import get_generated_dirs, save_output_dirs
+from nao_core.search import update_search_index
 from nao_core.templates.render import render_all_templates
 from nao_core.tracking import track_command
 
 from .providers import (
     PROVIDER_CHOICES,
     ProviderSelection,
+    SyncOptions,
     SyncResult,
     get_all_providers,
     get_providers_by_names,
 )
+from .sharding import Shard
 
 console = Console()
 
@@ -35,6 +39,36 @@ def sync(
     output_dirs: Annotated[dict[str, str] | None, Parameter(show=False)] = None,
     _providers: Annotated[list[ProviderSelection] | None, Parameter(show=False)] = None,
     render_templates: bool = True,
+    resume: Annotated[
+        bool,
+        Parameter(
+            help="Resume an interrupted database sync from its last checkpoint, retrying unfinished tables first.",
+        ),
+    ] = False,
+    shard: Annotated[
+        str | None,
+        Parameter(
+            help="Only sync shard i of N (e.g. 2/4) of the database tables, split by a stable hash. Run `nao sync --merge` once every shard has finished.",
+        ),
+    ] = None,
+    merge: Annotated[
+        bool,
+        Parameter(
+            help="Merge the outputs of `--shard` runs into the databases folder, then remove stale schemas and tables.",
+        ),
+    ] = False,
+    force_templates: Annotated[
+        bool,
+        Parameter(
+            help="Render every Jinja template, even those whose source and inputs are unchanged since the last sync.",
+        ),
+    ] = False,
+    repo_workers: Annotated[
+        int | None,
+        Parameter(
+            help="Number of repositories cloned or updated in parallel (8 by default).",
+        ),
+    ] = None,
 ):
     """Sync resources using configured providers.
 
@@ -44,10 +78,29 @@ def sync(
 
     After syncing providers, renders any Jinja templates (*.j2 files) found in
     the project directory, making the `nao` context object available for
-    accessing provider data.
+    accessing provider data. Templates whose source and inputs did not change
+    since the last sync are skipped unless `--force-templates` is given.
+    Finally, the markdown of the project is indexed for full-text search in
+    `.nao/search.sqlite`, re-reading only changed files.
+
+    With `--shard i/N`, only database tables owned by that shard are synced and
+    templates are not rendered nor indexed; `--merge` then combines all shard outputs, runs
+    the other providers and renders templates.
     """
     console.print("\n[bold cyan]🔄 nao sync[/bold cyan]\n")
 
+    if shard is not None and merge:
+        console.print("[red]Error:[/red] --shard and --merge cannot be used together")
+        sys.exit(1)
+    if repo_workers is not None and repo_workers < 1:
+        console.print("[red]Error:[/red] --repo-workers must be at least 1")
+        sys.exit(1)
+    try:
+        parsed_shard = Shard.parse(shard) if shard is not None else None
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(1)
+
     config = NaoConfig.try_load(exit_on_error=True)
     assert config is not None  # Help type checker after exit_on_error=True
 
@@ -68,7 +121,17 @@ def sync(
     else:
         active_providers = get_all_providers()
 
-    output_dirs = output_dirs or {}
+    # Output folder of every provider (custom or default), recorded for template rendering and the backend
+    resolved_output_dirs = {
+        selection.provider.name: (output_dirs or {}).get(selection.provider.name, selection.provider.default_output_dir)
+        for selection in [*get_all_providers(), *active_providers]
+    }
+    if parsed_shard is None:
+        save_output_dirs(project_path, resolved_output_dirs)
+    options = SyncOptions(resume=resume, shard=parsed_shard, merge=merge, repo_workers=repo_workers)
+    if parsed_shard is not None:
+        active_providers = [selection for selection in active_providers if selection.provider.supports_shards]
+        render_templates = False
 
     # Run each provider
     results: list[SyncResult] = []
@@ -76,9 +139,7 @@ def sync(
         sync_provider = selection.provider
         connection_filter = selection.connection_name
 
-        # Get output directory (custom or default)
-        output_dir = output_dirs.get(sync_provider.name, sync_provider.default_output_dir)
-        output_path = Path(output_dir)
+        output_path = Path(resolved_output_dirs[sync_provider.name])
 
         try:
             sync_provider.pre_sync(config, output_path)
@@ -96,7 +157,7 @@ def sync(
                     )
                     continue
 
-            result = sync_provider.sync(items, output_path, project_path=project_path)
+            result = sync_provider.sync(items, output_path, project_path=project_path, options=options)
             results.append(result)
         except Exception as e:
             # Capture error but continue with other providers
@@ -107,7 +168,21 @@ def sync(
     template_result = None
     if render_templates:
         console.print("\n[bold cyan]📝 Rendering templates[/bold cyan]\n")
-        template_result = render_all_templates(project_path, config, console)
+        template_result = render_all_templates(
+            project_path,
+            config,
+            console,
+            force=force_templates,
+            generated_dirs=get_generated_dirs(project_path, resolved_output_dirs),
+        )
+
+    # Update the full-text search index over the generated context
+    search_result = None
+    if parsed_shard is None:
+        try:
+            search_result = update_search_index(project_path)
+        except Exception as e:
+            console.print(f"  [yellow]⚠[/yellow] Search index not updated: [red]{e}[/red]")
 
     # Separate successful and failed results
     successful_results = [r for r in results if r.success]
@@ -131,10 +206,19 @@ def sync(
             console.print(f"  [dim]{result.provider_name}:[/dim] {result.get_summary()}")
 
     # Show template results
-    if template_result and (template_result.templates_rendered > 0 or template_result.templates_failed > 0):
+    if template_result and (
+        template_result.templates_rendered > 0
+        or template_result.templates_failed > 0
+        or template_result.templates_skipped > 0
+    ):
         has_results = True
         console.print(f"  [dim]Templates:[/dim] {template_result.get_summary()}")
 
+    # Show search index results
+    if search_result and (search_result.indexed > 0 or search_result.removed > 0):
+        has_results = True
+        console.print(f"  [dim]Search index:[/dim] {search_result.get_summary()}")
+
     # Show errors section if any
     if failed_results:
         has_results = True
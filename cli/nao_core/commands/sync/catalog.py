@@ -0,0 +1,145 @@
+"""Per-database catalog index written alongside the markdown tree.
+
+The catalog is a JSON Lines file at the root of each database folder, with one
+line per table holding its description, row count, columns and output files.
+Consumers can answer questions such as "which tables have column X" with a
+single file read instead of walking thousands of table folders.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from rich.console import Console
+
+from nao_core.fs import stage_file, write_if_changed
+from nao_core.memo import MemoizedContext
+
+console = Console()
+
+CATALOG_FILENAME = "catalog.jsonl"
+
+CatalogKey = tuple[str, str]
+
+
+def get_catalog_path(db_path: Path) -> Path:
+    """Return the catalog file of a database output folder.
+
+    e.g. databases/type=duckdb/database=mydb → databases/type=duckdb/database=mydb/catalog.jsonl
+    """
+    return db_path / CATALOG_FILENAME
+
+
+def build_catalog_entry(
+    schema: str, table: str, files: list[str], ctx: Any | None = None, verbose: bool = False
+) -> dict[str, Any]:
+    """Build the catalog line of a table.
+
+    Metadata is read from the table's template context, whose accessors are
+    memoized, so values already fetched for the templates cost no extra query.
+    The row count is only included when a template fetched it, since counting
+    rows can scan the whole table. Metadata that cannot be fetched is left as null.
+
+    Args:
+        schema: The schema/dataset name
+        table: The table name
+        files: Output files of the table, relative to the database folder
+        ctx: The template context of the table (e.g. DatabaseContext)
+        verbose: Whether to print the metadata that could not be fetched
+    """
+    entry: dict[str, Any] = {
+        "schema": schema,
+        "table": table,
+        "description": None,
+        "row_count": None,
+        "columns": None,
+        "files": sorted(files),
+    }
+    if ctx is None:
+        return entry
+
+    for accessor in ("description", "row_count", "columns"):
+        if accessor == "row_count" and isinstance(ctx, MemoizedContext) and not ctx.is_memoized(accessor):
+            continue
+        try:
+            entry[accessor] = getattr(ctx, accessor)()
+        except Exception as e:
+            # Backends raise their own driver errors, so any failure leaves the metadata as null
+            if verbose:
+                console.print(f"  [yellow]⚠[/yellow] No {accessor} in the catalog for {schema}.{table}: {e}")
+    if entry["columns"] is not None:
+        entry["columns"] = [
+            {
+                "name": col["name"],
+                "type": col.get("type"),
+                "nullable": col.get("nullable"),
+                "description": col.get("description"),
+            }
+            for col in entry["columns"]
+        ]
+    if entry["row_count"] is not None:
+        entry["row_count"] = int(entry["row_count"])
+    return entry
+
+
+def read_catalog(path: Path) -> dict[CatalogKey, dict[str, Any]]:
+    """Read a catalog file into entries keyed by (schema, table).
+
+    Later lines win over earlier ones for the same table, and a truncated
+    last line left by a crash is ignored. Returns an empty dict if the file
+    does not exist.
+    """
+    entries: dict[CatalogKey, dict[str, Any]] = {}
+    if not path.exists():
+        return entries
+    with path.open() as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            entries[(entry["schema"], entry["table"])] = entry
+    return entries
+
+
+def append_catalog_entry(path: Path, entry: dict[str, Any]) -> None:
+    """Append the entry of a table to a staged catalog as soon as the table is synced.
+
+    Appending keeps the entries of completed tables when an interrupted sync is resumed.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as f:
+        f.write(json.dumps(entry, default=str) + "\n")
+
+
+def write_catalog(
+    path: Path,
+    entries: Iterable[dict[str, Any]],
+    synced_tables: dict[str, set[str]],
+    live_path: Path | None = None,
+) -> list[dict[str, Any]]:
+    """Write the final catalog, keeping one sorted line per synced table.
+
+    Args:
+        path: Destination catalog file (usually inside a staging directory)
+        entries: Catalog entries; later entries win for the same table
+        synced_tables: Schemas mapped to the tables that belong in the catalog
+        live_path: The published catalog, reused when nothing changed
+
+    Returns:
+        The entries written, in catalog order
+    """
+    latest = {(entry["schema"], entry["table"]): entry for entry in entries}
+    kept = [latest[key] for key in sorted(latest) if key[1] in synced_tables.get(key[0], set())]
+    lines = [json.dumps(entry, default=str) for entry in kept]
+    path.unlink(missing_ok=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    content = "".join(f"{line}\n" for line in lines)
+    if live_path is None:
+        write_if_changed(path, content)
+    else:
+        stage_file(path, content, live_path)
+    return kept
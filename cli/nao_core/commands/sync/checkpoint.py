@@ -0,0 +1,127 @@
+"""Checkpoints that let an interrupted database sync resume where it stopped."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+CHECKPOINT_SUFFIX = ".checkpoint.jsonl"
+
+
+def get_checkpoint_path(db_path: Path) -> Path:
+    """Return the checkpoint file stored next to a database output path.
+
+    e.g. databases/type=duckdb/database=mydb → databases/type=duckdb/.database=mydb.checkpoint.jsonl
+    """
+    return db_path.with_name(f".{db_path.name}{CHECKPOINT_SUFFIX}")
+
+
+def compute_fingerprint(**settings: Any) -> str:
+    """Hash the settings that decide what a sync produces.
+
+    A checkpoint is only reused when the fingerprint matches, so changing
+    include/exclude patterns or accessors between runs starts a fresh sync.
+    """
+    payload = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SyncCheckpoint:
+    """Append-only progress log for the sync of a single database.
+
+    Each line is a JSON event: the resolved schema list, the resolved table
+    list of each schema, and the status of each table (`started`, `done` or
+    `failed`). Appending one small line per event keeps checkpointing cheap
+    even for databases with thousands of tables.
+    """
+
+    def __init__(self, path: Path, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.schemas: list[str] | None = None
+        self.schema_tables: dict[str, list[str]] = {}
+        self._status: dict[tuple[str, str], str] = {}
+        self._loaded_fingerprint: str | None = None
+
+    @classmethod
+    def start(cls, path: Path, fingerprint: str) -> SyncCheckpoint:
+        """Start a fresh checkpoint, discarding any previous one."""
+        checkpoint = cls(path, fingerprint)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+        checkpoint._append({"event": "start", "fingerprint": fingerprint})
+        return checkpoint
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str) -> SyncCheckpoint | None:
+        """Load a checkpoint left by a previous run.
+
+        Returns:
+            The checkpoint, or None if there is none or it was produced with
+            different settings.
+        """
+        if not path.exists():
+            return None
+
+        checkpoint = cls(path, fingerprint)
+        with path.open() as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a truncated last line
+                    continue
+                checkpoint._apply(event)
+
+        if checkpoint._loaded_fingerprint != fingerprint:
+            return None
+        return checkpoint
+
+    def _apply(self, event: dict[str, Any]) -> None:
+        kind = event.get("event")
+        if kind == "start":
+            self._loaded_fingerprint = event.get("fingerprint")
+        elif kind == "schemas":
+            self.schemas = event["schemas"]
+        elif kind == "schema":
+            self.schema_tables[event["schema"]] = event["tables"]
+        elif kind == "table":
+            self._status[(event["schema"], event["table"])] = event["status"]
+
+    def _append(self, event: dict[str, Any]) -> None:
+        with self.path.open("a") as f:
+            f.write(json.dumps(event) + "\n")
+
+    def record_schemas(self, schemas: list[str]) -> None:
+        """Record the resolved list of schemas to sync."""
+        self.schemas = schemas
+        self._append({"event": "schemas", "schemas": schemas})
+
+    def record_schema(self, schema: str, tables: list[str]) -> None:
+        """Record the tables of a schema after include/exclude resolution."""
+        self.schema_tables[schema] = tables
+        self._append({"event": "schema", "schema": schema, "tables": tables})
+
+    def record_table(self, schema: str, table: str, status: str) -> None:
+        """Record the status of a table (`started`, `done` or `failed`)."""
+        self._status[(schema, table)] = status
+        self._append({"event": "table", "schema": schema, "table": table, "status": status})
+
+    def is_done(self, schema: str, table: str) -> bool:
+        """Check whether a table was fully synced by a previous run."""
+        return self._status.get((schema, table)) == "done"
+
+    def unfinished_tables(self) -> list[tuple[str, str]]:
+        """Tables that were started or failed but never completed, in sync order."""
+        return [key for key, status in self._status.items() if status != "done"]
+
+    @property
+    def completed_count(self) -> int:
+        """Number of tables completed so far."""
+        return sum(1 for status in self._status.values() if status == "done")
+
+    def discard(self) -> None:
+        """Remove the checkpoint file once the sync has been published."""
+        self.path.unlink(missing_ok=True)
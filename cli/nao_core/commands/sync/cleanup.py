@@ -8,6 +8,8 @@ from typing import Dict, List
 
 from rich.console import Console
 
+from nao_core.fs import WriteStats
+
 console = Console()
 
 
@@ -33,6 +35,18 @@ class DatabaseSyncState:
     tables_synced: int = 0
     """Count of tables synced"""
 
+    writes: WriteStats = field(default_factory=WriteStats)
+    """Counts of files written vs. left unchanged because their content was identical"""
+
+    stale_removed: int = 0
+    """Count of stale schemas and tables dropped when the sync output was published"""
+
+    files_timed_out: int = 0
+    """Count of files replaced by degraded output because their accessor ran out of time"""
+
+    tables_deferred: int = 0
+    """Count of tables not reached before the sync deadline, which keep their previous output"""
+
     def add_table(self, schema: str, table: str) -> None:
         """Record that a table was synced.
 
@@ -56,59 +70,11 @@ class DatabaseSyncState:
         self.schemas_synced += 1
 
 
-def cleanup_stale_paths(state: DatabaseSyncState, verbose: bool = False) -> int:
-    """Remove directories that exist on disk but weren't synced.
-
-    This function cleans up:
-    - Table directories that no longer exist in the source
-    - Schema directories that no longer exist or have no tables
-
-    Args:
-        state: The sync state tracking what was synced
-        verbose: Whether to print cleanup messages
+def cleanup_stale_databases(active_databases: List, base_path: Path, verbose: bool = False):
+    """Remove databases that are not present in the config file.
 
-    Returns:
-        Number of stale paths removed
+    Scans the whole folder, so it is only used when no output manifest exists yet.
     """
-    removed_count = 0
-
-    if not state.db_path.exists():
-        return 0
-
-    # Find all existing schema directories
-    existing_schemas = {
-        d.name.replace("schema=", ""): d for d in state.db_path.iterdir() if d.is_dir() and d.name.startswith("schema=")
-    }
-
-    # Remove schemas that weren't synced
-    for schema_name, schema_path in existing_schemas.items():
-        if schema_name not in state.synced_schemas:
-            if verbose:
-                console.print(f"  [dim red]removing stale schema:[/dim red] {schema_name}")
-            shutil.rmtree(schema_path)
-            removed_count += 1
-            continue
-
-        # Find existing tables in this schema
-        existing_tables = {
-            d.name.replace("table=", ""): d for d in schema_path.iterdir() if d.is_dir() and d.name.startswith("table=")
-        }
-
-        synced_tables_for_schema = state.synced_tables.get(schema_name, set())
-
-        # Remove tables that weren't synced
-        for table_name, table_path in existing_tables.items():
-            if table_name not in synced_tables_for_schema:
-                if verbose:
-                    console.print(f"  [dim red]removing stale table:[/dim red] {schema_name}.{table_name}")
-                shutil.rmtree(table_path)
-                removed_count += 1
-
-    return removed_count
-
-
-def cleanup_stale_databases(active_databases: List, base_path: Path, verbose: bool = False):
-    """Remove databases that are not present in the config file."""
 
     valid_db_folders_by_type: Dict[str, set] = defaultdict(set)
 
@@ -120,7 +86,8 @@ def cleanup_stale_databases(active_databases: List, base_path: Path, verbose: bo
         valid_db_folders_by_type[type_folder].add(db_folder)
 
     for type_dir in base_path.iterdir():
-        if not type_dir.is_dir():
+        # Hidden folders (e.g. `.shards`) hold sync output that is not published yet
+        if not type_dir.is_dir() or type_dir.name.startswith("."):
             continue
 
         type_folder_name = type_dir.name
@@ -139,14 +106,20 @@ def cleanup_stale_databases(active_databases: List, base_path: Path, verbose: bo
             if not db_dir.is_dir():
                 continue
 
-            if db_dir.name not in valid_db_folders:
+            # Hidden folders (e.g. `.database=mydb.staging`) hold in-progress sync output;
+            # keep them as long as the database they belong to is still configured.
+            db_folder_name = db_dir.name[1:].rsplit(".", 1)[0] if db_dir.name.startswith(".") else db_dir.name
+            if db_folder_name not in valid_db_folders:
                 shutil.rmtree(db_dir)
                 if verbose:
                     console.print(f"\n[yellow] Removed unused database:[/yellow] {type_folder_name}/{db_dir.name}")
 
 
 def cleanup_stale_repos(config_repos: list, base_path: Path, verbose: bool = False) -> None:
-    """Remove repositories that are not present in the config file."""
+    """Remove repositories that are not present in the config file.
+
+    Scans the whole folder, so it is only used when no output manifest exists yet.
+    """
 
     repo_names = {repo.name for repo in config_repos}
     for repo_dir in base_path.iterdir():
@@ -0,0 +1,154 @@
+"""Compact, token-budgeted digests of a synced database.
+
+A digest lists one line per table with its key columns, their types and the
+row count, so the whole layout of a database or schema fits in a single read.
+Digests are built from the catalog entries, i.e. the same metadata the
+database templates receive.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from nao_core.config.databases.base import DigestConfig
+from nao_core.fs import stage_file, write_if_changed
+
+DIGEST_FILENAME = "digest.md"
+CHARS_PER_TOKEN = 4
+
+KEY_COLUMN_SUFFIXES = ("_id", "_key", "_pk")
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of LLM tokens in a text (about 4 characters per token)."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _is_key_column(name: str) -> bool:
+    name = name.lower()
+    return name == "id" or name.endswith(KEY_COLUMN_SUFFIXES)
+
+
+def _short_type(column_type: str | None) -> str:
+    return (column_type or "?").removesuffix(" NOT NULL")
+
+
+def format_table_line(entry: dict[str, Any], max_columns: int) -> str:
+    """Format one table as a single line, listing up to `max_columns` columns, key columns first.
+
+    With `max_columns` set to 0, only the number of columns is given.
+    """
+    columns = entry.get("columns") or []
+    details = []
+    if entry.get("row_count") is not None:
+        details.append(f"{entry['row_count']:,} rows")
+    if columns and max_columns == 0:
+        details.append(f"{len(columns)} columns")
+
+    line = f"- {entry['table']}" + (f" ({', '.join(details)})" if details else "")
+    if not columns or max_columns == 0:
+        return line
+
+    ordered = sorted(columns, key=lambda col: not _is_key_column(col["name"]))
+    shown = [f"{col['name']} {_short_type(col.get('type'))}" for col in ordered[:max_columns]]
+    hidden = len(columns) - len(shown)
+    if hidden:
+        shown.append(f"+{hidden} more")
+    return f"{line}: {', '.join(shown)}"
+
+
+def _render(
+    title: str,
+    schemas: dict[str, list[dict[str, Any]]],
+    max_columns: int,
+    max_tables: int | None,
+    link_schemas: bool,
+) -> str:
+    table_count = sum(len(entries) for entries in schemas.values())
+    lines = [
+        f"# {title}",
+        "",
+        f"{table_count} tables across {len(schemas)} schemas. Key columns are listed first."
+        if len(schemas) > 1
+        else f"{table_count} tables. Key columns are listed first.",
+    ]
+    for schema, entries in schemas.items():
+        lines += ["", f"## {schema} ({len(entries)} tables)", ""]
+        shown = entries if max_tables is None else entries[:max_tables]
+        lines += [format_table_line(entry, max_columns) for entry in shown]
+        if len(shown) < len(entries):
+            more = f"- … {len(entries) - len(shown)} more tables"
+            if link_schemas:
+                more += f", see `schema={schema}/{DIGEST_FILENAME}`"
+            lines.append(more)
+    return "\n".join(lines) + "\n"
+
+
+def build_digest(
+    title: str,
+    entries: Iterable[dict[str, Any]],
+    settings: DigestConfig,
+    link_schemas: bool = False,
+) -> str:
+    """Build a digest that fits the token budget of `settings`.
+
+    Column lists are shortened first, down to table names and row counts
+    only; if that still exceeds the budget, the tables of each schema are
+    cut off and summarized by a count.
+
+    Args:
+        title: Heading of the digest
+        entries: Catalog entries of the tables to list
+        settings: Token budget and column cap
+        link_schemas: Point summarized schemas to their own digest file
+    """
+    schemas: dict[str, list[dict[str, Any]]] = {}
+    for entry in sorted(entries, key=lambda e: (e["schema"], e["table"])):
+        schemas.setdefault(entry["schema"], []).append(entry)
+
+    for max_columns in range(settings.max_columns, -1, -1):
+        digest = _render(title, schemas, max_columns, None, link_schemas)
+        if estimate_tokens(digest) <= settings.token_budget:
+            return digest
+
+    # Largest number of tables per schema that fits the budget
+    low, high = 0, max((len(tables) for tables in schemas.values()), default=0)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(_render(title, schemas, 0, mid, link_schemas)) <= settings.token_budget:
+            low = mid
+        else:
+            high = mid - 1
+    return _render(title, schemas, 0, low, link_schemas)
+
+
+def write_digests(
+    db_path: Path,
+    title: str,
+    entries: list[dict[str, Any]],
+    settings: DigestConfig,
+    live_path: Path | None = None,
+) -> None:
+    """Write the database digest and one digest per schema.
+
+    Args:
+        db_path: Database folder to write into (usually a staging directory)
+        title: Name of the database, used in headings
+        entries: Catalog entries of the synced tables
+        settings: Token budget and column cap
+        live_path: The published database folder, whose identical files are reused
+    """
+    files = {Path(DIGEST_FILENAME): build_digest(title, entries, settings, link_schemas=True)}
+    for schema in sorted({entry["schema"] for entry in entries}):
+        schema_entries = [entry for entry in entries if entry["schema"] == schema]
+        files[Path(f"schema={schema}") / DIGEST_FILENAME] = build_digest(f"{title}.{schema}", schema_entries, settings)
+
+    for relative_path, content in files.items():
+        path = db_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if live_path is None:
+            write_if_changed(path, content)
+        else:
+            stage_file(path, content, live_path / relative_path)
@@ -0,0 +1,295 @@
+"""Join graph of a synced database, built once at sync time.
+
+Edges come from declared foreign keys and from candidate joins inferred from
+column names and types (e.g. `orders.customer_id` → `customers.id`). The graph
+is stored as a compact adjacency file at the root of the database folder, so
+the shortest join path between two tables is a lookup instead of a series of
+exploratory queries.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from nao_core.config.databases.base import ForeignKeyColumn
+from nao_core.fs import stage_file, write_if_changed
+
+JOINS_FILENAME = "joins.json"
+JOINS_VERSION = 1
+
+FOREIGN_KEY = "foreign_key"
+INFERRED = "inferred"
+
+_INTEGER_TYPE = re.compile(r"u?int\d*|integer|bigint|smallint|tinyint|number|decimal\(\d+, ?0\)|numeric\(\d+, ?0\)")
+_STRING_TYPE = re.compile(r"string|text|uuid|(var)?char.*")
+
+
+def get_joins_path(db_path: Path) -> Path:
+    """Return the join graph file of a database output folder."""
+    return db_path / JOINS_FILENAME
+
+
+@dataclass(frozen=True)
+class JoinEdge:
+    """A join from one table to another, on one or more column pairs."""
+
+    source: str
+    """Qualified source table (`schema.table`)"""
+    target: str
+    """Qualified target table (`schema.table`)"""
+    on: tuple[tuple[str, str], ...]
+    """(source column, target column) pairs"""
+    kind: str = FOREIGN_KEY
+    """`foreign_key` for declared constraints, `inferred` for name-based candidates"""
+
+    def reversed(self) -> JoinEdge:
+        return JoinEdge(self.target, self.source, tuple((b, a) for a, b in self.on), self.kind)
+
+    @property
+    def condition(self) -> str:
+        """The join condition, e.g. `sales.orders.customer_id = sales.customers.id`."""
+        return " AND ".join(f"{self.source}.{a} = {self.target}.{b}" for a, b in self.on)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"source": self.source, "target": self.target, "on": [list(pair) for pair in self.on], "kind": self.kind}
+
+
+def format_join_path(path: list[JoinEdge]) -> str:
+    """Format a join path as the FROM/JOIN clauses of a SQL query."""
+    if not path:
+        return ""
+    lines = [f"FROM {path[0].source}"]
+    lines.extend(f"JOIN {edge.target} ON {edge.condition}" for edge in path)
+    return "\n".join(lines)
+
+
+@dataclass
+class JoinGraph:
+    """Undirected adjacency of the tables of a database.
+
+    Only edges in their declared direction (from the referencing table) are
+    stored; lookups also follow them in reverse.
+    """
+
+    tables: set[str] = field(default_factory=set)
+    edges: list[JoinEdge] = field(default_factory=list)
+    _adjacency: dict[str, list[JoinEdge]] | None = field(default=None, repr=False)
+
+    @property
+    def adjacency(self) -> dict[str, list[JoinEdge]]:
+        if self._adjacency is None:
+            adjacency: dict[str, list[JoinEdge]] = {table: [] for table in self.tables}
+            for edge in self.edges:
+                adjacency.setdefault(edge.source, []).append(edge)
+                adjacency.setdefault(edge.target, []).append(edge.reversed())
+            self._adjacency = adjacency
+        return self._adjacency
+
+    def resolve(self, table: str) -> str:
+        """Resolve a table name to its qualified name; bare names must be unique across schemas.
+
+        Raises:
+            KeyError: If the table is unknown or its bare name is ambiguous.
+        """
+        if table in self.tables:
+            return table
+        matches = sorted(name for name in self.tables if name.split(".", 1)[1] == table)
+        if len(matches) == 1:
+            return matches[0]
+        if matches:
+            raise KeyError(f"Table '{table}' is ambiguous: {', '.join(matches)}")
+        raise KeyError(f"Table '{table}' not found")
+
+    def neighbors(self, table: str) -> list[JoinEdge]:
+        """List the joins from a table, declared foreign keys first."""
+        return sorted(
+            self.adjacency.get(self.resolve(table), []), key=lambda edge: (edge.kind != FOREIGN_KEY, edge.target)
+        )
+
+    def shortest_path(self, source: str, target: str) -> list[JoinEdge] | None:
+        """Find the path with the fewest joins between two tables.
+
+        Among paths of the same length, the one with the fewest inferred joins wins.
+        Returns an empty list when both tables are the same, None when they are not connected.
+
+        Raises:
+            KeyError: If a table is unknown or ambiguous.
+        """
+        source, target = self.resolve(source), self.resolve(target)
+        adjacency = self.adjacency
+        best: dict[str, tuple[int, int]] = {source: (0, 0)}
+        queue: list[tuple[int, int, str, list[JoinEdge]]] = [(0, 0, source, [])]
+        while queue:
+            hops, inferred, table, path = heapq.heappop(queue)
+            if table == target:
+                return path
+            if best.get(table, (hops, inferred)) < (hops, inferred):
+                continue
+            for edge in sorted(adjacency.get(table, []), key=lambda edge: (edge.target, edge.on)):
+                cost = (hops + 1, inferred + (edge.kind == INFERRED))
+                if cost < best.get(edge.target, (len(adjacency) + 1, 0)):
+                    best[edge.target] = cost
+                    heapq.heappush(queue, (*cost, edge.target, [*path, edge]))
+        return None
+
+    def to_json(self) -> str:
+        """Serialize as `{"tables": {table: [[target, [[column, target_column], ...], kind], ...]}}`."""
+        adjacency: dict[str, list[Any]] = {table: [] for table in sorted(self.tables)}
+        for edge in sorted(self.edges, key=lambda edge: (edge.source, edge.target, edge.on)):
+            adjacency.setdefault(edge.source, []).append([edge.target, [list(pair) for pair in edge.on], edge.kind])
+        return json.dumps({"version": JOINS_VERSION, "tables": adjacency}, separators=(",", ":")) + "\n"
+
+    @classmethod
+    def load(cls, path: Path) -> JoinGraph:
+        """Read a join graph file.
+
+        Raises:
+            FileNotFoundError: If the database has not been synced with join graphs yet.
+        """
+        data = json.loads(path.read_text())
+        graph = cls(tables=set(data["tables"]))
+        for source, edges in data["tables"].items():
+            for target, on, kind in edges:
+                graph.edges.append(JoinEdge(source, target, tuple((a, b) for a, b in on), kind))
+        return graph
+
+
+def _type_family(column_type: str | None) -> str | None:
+    if not column_type:
+        return None
+    base = column_type.lower().removesuffix(" not null").lstrip("!")
+    if _INTEGER_TYPE.fullmatch(base):
+        return "integer"
+    if _STRING_TYPE.fullmatch(base):
+        return "string"
+    return base
+
+
+def _compatible(a: dict[str, Any], b: dict[str, Any]) -> bool:
+    family_a, family_b = _type_family(a.get("type")), _type_family(b.get("type"))
+    return family_a is None or family_b is None or family_a == family_b
+
+
+def _table_names(stem: str) -> set[str]:
+    """Table names a `<stem>_id` column may refer to (singular and plural forms)."""
+    names = {stem, f"{stem}s", f"{stem}es"}
+    if stem.endswith("y"):
+        names.add(f"{stem[:-1]}ies")
+    return names
+
+
+def _infer_edges(entries: list[dict[str, Any]], declared: set[tuple[str, str]]) -> list[JoinEdge]:
+    """Infer `<stem>_id` → `<stem>(s).id` (or `<stem>(s).<stem>_id`) joins between catalog tables.
+
+    Tables of the same schema are preferred; tables whose name ends with
+    `_<stem>(s)` (e.g. `dim_customers`) are only used when no exact name matches.
+    """
+    tables: dict[str, tuple[str, dict[str, dict[str, Any]]]] = {}
+    for entry in entries:
+        columns = {col["name"].lower(): col for col in entry.get("columns") or []}
+        tables[f"{entry['schema']}.{entry['table']}"] = (entry["schema"], columns)
+
+    # Tables by lowercased name and by each `_<suffix>` of their name, so candidates are looked up, not scanned
+    order = {table: i for i, table in enumerate(tables)}
+    by_name: dict[str, list[str]] = {}
+    by_suffix: dict[str, list[str]] = {}
+    for table in tables:
+        table_name = table.split(".", 1)[1].lower()
+        by_name.setdefault(table_name, []).append(table)
+        for suffix in {table_name[i + 1 :] for i, char in enumerate(table_name) if char == "_"}:
+            by_suffix.setdefault(suffix, []).append(table)
+
+    def lookup(index: dict[str, list[str]], names: set[str], source: str) -> list[str]:
+        found = {table for n in names for table in index.get(n, ()) if table != source}
+        return sorted(found, key=order.__getitem__)
+
+    edges = []
+    for entry in entries:
+        source = f"{entry['schema']}.{entry['table']}"
+        for col in entry.get("columns") or []:
+            name = col["name"].lower()
+            if not name.endswith("_id") or name == "_id" or (source, col["name"]) in declared:
+                continue
+            names = _table_names(name[:-3])
+            candidates = lookup(by_name, names, source) or lookup(by_suffix, names, source)
+            same_schema = [table for table in candidates if tables[table][0] == entry["schema"]]
+            for target in same_schema or candidates:
+                target_columns = tables[target][1]
+                target_column = target_columns.get("id") or target_columns.get(name)
+                if target_column is not None and _compatible(col, target_column):
+                    edges.append(JoinEdge(source, target, ((col["name"], target_column["name"]),), INFERRED))
+    return edges
+
+
+def build_join_graph(
+    entries: Iterable[dict[str, Any]],
+    foreign_keys: dict[str, list[ForeignKeyColumn]],
+    synced_tables: dict[str, set[str]] | None = None,
+) -> JoinGraph:
+    """Build the join graph of a database from its catalog and declared foreign keys.
+
+    Args:
+        entries: Catalog entries of the synced tables
+        foreign_keys: Declared foreign keys, by schema
+        synced_tables: Schemas mapped to their synced tables; foreign keys to other tables are dropped.
+            None keeps every declared foreign key (used by shards, whose tables are merged later).
+    """
+    entries = list(entries)
+    graph = JoinGraph(tables={f"{entry['schema']}.{entry['table']}" for entry in entries})
+
+    def is_synced(schema: str, table: str) -> bool:
+        return synced_tables is None or table in synced_tables.get(schema, set())
+
+    grouped: dict[tuple[str, str, str], list[ForeignKeyColumn]] = {}
+    for schema, keys in sorted(foreign_keys.items()):
+        for key in keys:
+            if is_synced(schema, key.table) and is_synced(key.ref_schema, key.ref_table):
+                grouped.setdefault((schema, key.table, key.constraint), []).append(key)
+
+    declared: set[tuple[str, str]] = set()
+    for (schema, table, _), keys in grouped.items():
+        source = f"{schema}.{table}"
+        graph.edges.append(
+            JoinEdge(
+                source,
+                f"{keys[0].ref_schema}.{keys[0].ref_table}",
+                tuple((key.column, key.ref_column) for key in keys),
+                FOREIGN_KEY,
+            )
+        )
+        declared.update((source, key.column) for key in keys)
+
+    graph.edges.extend(_infer_edges(entries, declared))
+    graph.edges = list(dict.fromkeys(graph.edges))
+    return graph
+
+
+def declared_foreign_keys(graph: JoinGraph) -> dict[str, list[ForeignKeyColumn]]:
+    """Recover the declared foreign keys stored in a join graph, by schema."""
+    foreign_keys: dict[str, list[ForeignKeyColumn]] = {}
+    for i, edge in enumerate(graph.edges):
+        if edge.kind != FOREIGN_KEY:
+            continue
+        schema, table = edge.source.split(".", 1)
+        ref_schema, ref_table = edge.target.split(".", 1)
+        foreign_keys.setdefault(schema, []).extend(
+            ForeignKeyColumn(f"fk_{i}", table, column, ref_schema, ref_table, ref_column)
+            for column, ref_column in edge.on
+        )
+    return foreign_keys
+
+
+def write_join_graph(path: Path, graph: JoinGraph, live_path: Path | None = None) -> None:
+    """Write a join graph file, reusing the published file when nothing changed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if live_path is None:
+        write_if_changed(path, graph.to_json())
+    else:
+        path.unlink(missing_ok=True)
+        stage_file(path, graph.to_json(), live_path)
@@ -0,0 +1,107 @@
+"""Output manifests recording which paths a sync provider owns in its output folder."""
+
+from __future__ import annotations
+
+import json
+import shutil
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+from rich.console import Console
+
+from nao_core.fs import write_if_changed
+
+console = Console()
+
+MANIFEST_FILENAME = ".nao-manifest.json"
+
+
+def _is_inside(relative_path: str) -> bool:
+    """Check that a manifest path stays within the output folder."""
+    path = PurePosixPath(relative_path)
+    return bool(path.parts) and not path.is_absolute() and ".." not in path.parts
+
+
+def _remove_empty_parents(path: Path, root: Path) -> None:
+    """Remove the empty folders between `path` and `root` (excluded), bottom-up."""
+    while path != root and root in path.parents:
+        try:
+            path.rmdir()
+        except OSError:
+            return
+        path = path.parent
+
+
+@dataclass
+class OutputManifest:
+    """Paths written by a provider, persisted in its output folder between syncs.
+
+    Stale cleanup is the difference between the paths of the previous sync
+    and the paths that are still wanted, so only files and folders that nao
+    created are ever deleted and the output tree is never scanned.
+    """
+
+    output_path: Path
+    paths: set[str] = field(default_factory=set)
+    """Owned paths, relative to the output folder (e.g. `type=duckdb/database=mydb`)"""
+
+    exists: bool = False
+    """Whether the manifest was loaded from disk; False before the first manifest-aware sync"""
+
+    @property
+    def path(self) -> Path:
+        return self.output_path / MANIFEST_FILENAME
+
+    @classmethod
+    def load(cls, output_path: Path) -> OutputManifest:
+        """Load the manifest of an output folder, or an empty one if there is none yet."""
+        manifest = cls(output_path)
+        try:
+            data = json.loads(manifest.path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return manifest
+        manifest.paths = {path for path in data.get("paths", []) if _is_inside(path)}
+        manifest.exists = True
+        return manifest
+
+    def add(self, paths: Iterable[str]) -> None:
+        """Record paths written by the current sync."""
+        self.paths.update(paths)
+
+    def save(self) -> None:
+        """Persist the manifest, leaving the file untouched if nothing changed."""
+        self.output_path.mkdir(parents=True, exist_ok=True)
+        write_if_changed(self.path, json.dumps({"paths": sorted(self.paths)}, indent=2) + "\n")
+        self.exists = True
+
+    def remove_stale(self, keep: Iterable[str], verbose: bool = False, label: str = "path") -> int:
+        """Delete the owned paths that are not in `keep` and forget them.
+
+        Folders left empty by the removal are deleted as well, up to the
+        output folder. Anything not listed in the manifest is left alone.
+
+        Args:
+            keep: Paths that are still wanted
+            verbose: Whether to print a message per removed path
+            label: What a path represents, used in messages (e.g. "page")
+
+        Returns:
+            Number of stale paths removed
+        """
+        stale = self.paths - set(keep)
+        removed_count = 0
+        for relative_path in sorted(stale):
+            target = self.output_path / relative_path
+            if target.is_dir() and not target.is_symlink():
+                shutil.rmtree(target)
+            elif target.exists() or target.is_symlink():
+                target.unlink()
+            else:
+                continue
+            removed_count += 1
+            _remove_empty_parents(target.parent, self.output_path)
+            if verbose:
+                console.print(f"  [dim red]removing stale {label}:[/dim red] {relative_path}")
+        self.paths -= stale
+        return removed_count
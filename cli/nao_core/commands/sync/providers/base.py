@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from nao_core.commands.sync.sharding import Shard
 from nao_core.config import NaoConfig
 
 
@@ -17,6 +18,8 @@ class SyncResult:
     details: dict[str, Any] | None = None
     summary: str | None = None
     error: str | None = None
+    files_written: int = 0
+    files_unchanged: int = 0
 
     @property
     def success(self) -> bool:
@@ -41,6 +44,23 @@ class SyncResult:
         )
 
 
+@dataclass
+class SyncOptions:
+    """Run-wide options passed from the sync command to every provider."""
+
+    resume: bool = False
+    """Continue an interrupted sync from its last checkpoint instead of starting over"""
+
+    shard: Shard | None = None
+    """Only sync the slice of tables owned by this shard, into a separate shard output folder"""
+
+    merge: bool = False
+    """Combine the outputs of all shards into the live tree instead of syncing"""
+
+    repo_workers: int | None = None
+    """Repositories synced in parallel; None keeps the provider's default"""
+
+
 class SyncProvider(ABC):
     """Abstract base class for sync providers.
 
@@ -79,19 +99,34 @@ class SyncProvider(ABC):
         ...
 
     @abstractmethod
-    def sync(self, items: list[Any], output_path: Path, project_path: Path | None = None) -> SyncResult:
+    def sync(
+        self,
+        items: list[Any],
+        output_path: Path,
+        project_path: Path | None = None,
+        options: SyncOptions | None = None,
+    ) -> SyncResult:
         """Sync the items to the output path.
 
         Args:
                 items: List of items to sync
                 output_path: Path where synced data should be written
                 project_path: Path to the nao project root (for template resolution)
+                options: Run-wide sync options (defaults when None)
 
         Returns:
                 SyncResult with statistics about what was synced
         """
         ...
 
+    @property
+    def supports_shards(self) -> bool:
+        """Whether this provider can split its work with `SyncOptions.shard`.
+
+        Providers that don't are skipped by sharded runs and run once, during the merge.
+        """
+        return False
+
     def should_sync(self, config: NaoConfig) -> bool:
         """Check if this provider has items to sync.
 
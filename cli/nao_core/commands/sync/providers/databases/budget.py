@@ -0,0 +1,77 @@
+"""Time budgets bounding how long a database sync can run."""
+
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def run_with_timeout(func: Callable[[], T], timeout: float | None, on_abandoned: Callable[[], None] | None = None) -> T:
+    """Run a callable, giving up after `timeout` seconds.
+
+    The call runs in a daemon thread so a warehouse query that never returns
+    cannot keep the process alive. Python cannot cancel a running thread, so
+    on timeout the call is abandoned and its result discarded. It keeps
+    running meanwhile: the caller must stop using anything the call shares
+    with it, such as its database connection. `on_abandoned` is called from
+    that thread once an abandoned call returns, to release what it used.
+
+    Raises:
+        TimeoutError: If the call did not finish within the timeout.
+    """
+    if timeout is None:
+        return func()
+
+    outcome: dict[str, Any] = {}
+    lock = threading.Lock()
+
+    def target() -> None:
+        try:
+            outcome["result"] = func()
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            with lock:
+                outcome["done"] = True
+                abandoned = outcome.get("abandoned", False)
+            if abandoned and on_abandoned is not None:
+                on_abandoned()
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(max(timeout, 0))
+
+    with lock:
+        if not outcome.get("done"):
+            outcome["abandoned"] = True
+            raise TimeoutError(f"timed out after {timeout:g}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+class SyncBudget:
+    """Tracks the per-accessor timeouts and overall deadline of a database sync."""
+
+    def __init__(self, accessor_timeouts: dict[str, float] | None = None, deadline: float | None = None):
+        self._accessor_timeouts = accessor_timeouts or {}
+        self._deadline_at = time.monotonic() + deadline if deadline is not None else None
+
+    def remaining(self) -> float | None:
+        """Seconds left before the sync deadline, or None without a deadline."""
+        if self._deadline_at is None:
+            return None
+        return max(self._deadline_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        """Whether the sync deadline has passed."""
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def timeout_for(self, accessor: str | None = None) -> float | None:
+        """Time allowed for the next call: the accessor timeout capped by the deadline."""
+        limits = [t for t in (self._accessor_timeouts.get(accessor or ""), self.remaining()) if t is not None]
+        return min(limits) if limits else None
@@ -1,15 +1,34 @@
 """Database context exposing methods available in templates during sync."""
 
+from collections.abc import Callable
 from typing import Any
 
+import ibis
+import pandas as pd
 from ibis import BaseBackend
 
+from nao_core.config.databases.base import ColumnProfileConfig
+from nao_core.memo import MemoizedContext, memoized
 
-class DatabaseContext:
+
+def _to_template_value(val: Any) -> Any:
+    """Convert a value returned by the warehouse into a JSON-friendly one."""
+    if val is None or (not isinstance(val, (list, dict)) and pd.isna(val)):
+        return None
+    if hasattr(val, "item"):
+        val = val.item()
+    if not isinstance(val, (str, int, float, bool, list, dict)):
+        return str(val)
+    return val
+
+
+class DatabaseContext(MemoizedContext):
     """Context object passed to Jinja2 templates during database sync.
 
     Exposes data-fetching methods that templates can call to retrieve
-    column metadata, row previews, table descriptions, etc.
+    column metadata, row previews, table descriptions, etc. Results are
+    memoized per table, so templates can call them as often as they like;
+    use `invalidate()` to force a refetch.
     """
 
     def __init__(
@@ -19,6 +38,9 @@ class DatabaseContext:
         table_name: str,
         table_description: str | None = None,
         column_descriptions: dict[str, str] | None = None,
+        column_profile: ColumnProfileConfig | None = None,
+        preview_plan: Callable[[ibis.Table, int], list[ibis.Table]] | None = None,
+        preview_rows: int = 10,
     ):
         self._conn = conn
         self._schema = schema
@@ -26,6 +48,9 @@ class DatabaseContext:
         self._table_ref = None
         self._table_description = table_description
         self._column_descriptions = column_descriptions or {}
+        self._column_profile = column_profile or ColumnProfileConfig()
+        self._preview_plan = preview_plan
+        self._preview_rows = preview_rows
 
     @property
     def table(self):
@@ -33,6 +58,13 @@ class DatabaseContext:
             self._table_ref = self._conn.table(self._table_name, database=self._schema)
         return self._table_ref
 
+    def invalidate(self, accessor: str | None = None) -> None:
+        """Drop memoized results, and the table reference when invalidating everything."""
+        super().invalidate(accessor)
+        if accessor is None:
+            self._table_ref = None
+
+    @memoized
     def columns(self) -> list[dict[str, Any]]:
         """Return column metadata: name, type, nullable, description."""
         schema = self.table.schema()
@@ -54,9 +86,29 @@ class DatabaseContext:
             return f"{raw[1:]} NOT NULL"
         return raw
 
-    def preview(self, limit: int = 10) -> list[dict[str, Any]]:
-        """Return the first N rows as a list of dictionaries."""
-        df = self.table.limit(limit).execute()
+    @memoized
+    def preview(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Return up to N rows (the configured preview size by default) as a list of dictionaries.
+
+        The queries of the preview plan (e.g. latest partition, then plain
+        LIMIT) are tried in order; one that fails or returns no rows falls
+        through to the next.
+        """
+        limit = self._preview_rows if limit is None else limit
+        plan = list(self._preview_plan(self.table, limit)) if self._preview_plan else []
+        plan = plan or [self.table.limit(limit)]
+
+        for i, expr in enumerate(plan):
+            is_last = i == len(plan) - 1
+            try:
+                df = expr.execute()
+            except Exception:
+                if is_last:
+                    raise
+                continue
+            if len(df) or is_last:
+                break
+
         rows = []
         for _, row in df.iterrows():
             row_dict = row.to_dict()
@@ -66,14 +118,107 @@ class DatabaseContext:
             rows.append(row_dict)
         return rows
 
+    @memoized
     def row_count(self) -> int:
         """Return the total number of rows in the table."""
         return self.table.count().execute()
 
+    @memoized
     def column_count(self) -> int:
         """Return the number of columns in the table."""
         return len(self.table.schema())
 
+    @memoized
     def description(self) -> str | None:
         """Return the table description if available."""
         return self._table_description
+
+    @memoized
+    def profile(self) -> dict[str, Any]:
+        """Return per-column statistics: null %, approximate distinct count, min/max and top values.
+
+        The statistics, including the row count, come from one aggregate
+        query. With `column_profile.sample_rows` set, the table is counted
+        first (unless `row_count()` already was) and tables with more rows are
+        profiled on a random sample. One extra UNION ALL query fetches the top
+        values, only when some columns have at most
+        `low_cardinality_threshold` distinct values and `top_k` is positive.
+        """
+        settings = self._column_profile
+        sample_rows = settings.sample_rows
+        # The aggregate counts the rows itself; the table is only counted up front to decide on sampling
+        row_count = self.row_count() if sample_rows is not None or self.is_memoized("row_count") else None
+
+        table = self.table
+        sampled = sample_rows is not None and row_count is not None and row_count > sample_rows
+        if sampled:
+            table = table.sample(sample_rows / row_count, method="row")
+
+        all_columns = list(table.schema().items())
+        columns = all_columns[: settings.max_columns]
+
+        metrics: dict[str, Any] = {"rows": table.count()}
+        for i, (name, dtype) in enumerate(columns):
+            column = table[name]
+            metrics[f"nulls_{i}"] = column.isnull().sum()
+            if not dtype.is_nested():
+                metrics[f"distinct_{i}"] = column.approx_nunique()
+            if dtype.is_numeric() or dtype.is_temporal() or dtype.is_string():
+                metrics[f"min_{i}"] = column.min()
+                metrics[f"max_{i}"] = column.max()
+        stats = table.aggregate(**metrics).execute().iloc[0].to_dict()
+
+        rows_profiled = int(stats["rows"] or 0)
+        profiled_columns: list[dict[str, Any]] = []
+        low_cardinality: list[str] = []
+        for i, (name, dtype) in enumerate(columns):
+            nulls = int(stats[f"nulls_{i}"] or 0)
+            raw_distinct = stats.get(f"distinct_{i}")
+            distinct = int(raw_distinct) if raw_distinct is not None and not pd.isna(raw_distinct) else None
+            if distinct is not None and distinct <= settings.low_cardinality_threshold:
+                low_cardinality.append(name)
+            profiled_columns.append(
+                {
+                    "name": name,
+                    "type": self._format_type(dtype),
+                    "null_pct": round(100 * nulls / rows_profiled, 2) if rows_profiled else None,
+                    "distinct": distinct,
+                    "min": _to_template_value(stats.get(f"min_{i}")),
+                    "max": _to_template_value(stats.get(f"max_{i}")),
+                    "top_values": [],
+                }
+            )
+
+        if low_cardinality and settings.top_k > 0:
+            top_values = self._top_values(table, low_cardinality, settings.top_k)
+            for col in profiled_columns:
+                col["top_values"] = top_values.get(col["name"], [])
+
+        return {
+            "row_count": row_count if row_count is not None else rows_profiled,
+            "rows_profiled": rows_profiled,
+            "sampled": sampled,
+            "column_count": len(all_columns),
+            "columns": profiled_columns,
+        }
+
+    @staticmethod
+    def _top_values(table: Any, columns: list[str], top_k: int) -> dict[str, list[dict[str, Any]]]:
+        """Fetch the most frequent non-null values of several columns in a single UNION ALL query."""
+        queries = [
+            table.filter(table[name].notnull())
+            .group_by(value=table[name].cast("string"))
+            .aggregate(count=ibis._.count())
+            .mutate(column=ibis.literal(name))
+            .order_by(ibis.desc("count"))
+            .limit(top_k)
+            for name in columns
+        ]
+        df = ibis.union(*queries).execute()
+
+        top_values: dict[str, list[dict[str, Any]]] = {name: [] for name in columns}
+        for row in df.to_dict("records"):
+            top_values[row["column"]].append({"value": _to_template_value(row["value"]), "count": int(row["count"])})
+        for values in top_values.values():
+            values.sort(key=lambda v: (-v["count"], str(v["value"])))
+        return top_values
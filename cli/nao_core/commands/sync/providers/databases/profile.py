@@ -0,0 +1,208 @@
+"""Timing profile of database syncs, broken down by schema, table, accessor and phase."""
+
+from __future__ import annotations
+
+import functools
+import json
+import threading
+import time
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from ibis import BaseBackend
+
+PROFILE_FILENAME = "sync_profile.json"
+
+# Backend methods that issue at least one warehouse query
+QUERY_METHODS = ("raw_sql", "sql", "execute", "table", "list_tables", "list_databases", "to_pandas", "to_pyarrow")
+
+
+@dataclass
+class Timing:
+    """Wall time and warehouse queries spent in one unit of work."""
+
+    seconds: float = 0.0
+    queries: int = 0
+    query_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "seconds": round(self.seconds, 4),
+            "queries": self.queries,
+            "query_seconds": round(self.query_seconds, 4),
+        }
+
+
+class QueryCounter:
+    """Counts the warehouse queries issued through an Ibis connection.
+
+    Calls made from inside another counted call (e.g. `execute` delegating to
+    `raw_sql`) are not counted twice. Queries of a detached connection are
+    no longer counted, including those still running when it was detached.
+    """
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.query_seconds = 0.0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._attached: dict[int, threading.Event] = {}
+
+    def instrument(self, conn: BaseBackend) -> BaseBackend:
+        """Wrap the query methods of a connection in place."""
+        attached = threading.Event()
+        attached.set()
+        self._attached[id(conn)] = attached
+        for name in QUERY_METHODS:
+            method = getattr(conn, name, None)
+            if callable(method):
+                try:
+                    setattr(conn, name, self._wrap(method, attached))
+                except (AttributeError, TypeError):
+                    continue
+        return conn
+
+    def detach(self, conn: BaseBackend) -> None:
+        """Stop counting the queries of a connection, e.g. one left to a timed out call."""
+        if (attached := self._attached.pop(id(conn), None)) is not None:
+            attached.clear()
+
+    def _wrap(self, method: Callable[..., Any], attached: threading.Event) -> Callable[..., Any]:
+        @functools.wraps(method)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if getattr(self._local, "active", False):
+                return method(*args, **kwargs)
+
+            self._local.active = True
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._local.active = False
+                with self._lock:
+                    if attached.is_set():
+                        self.queries += 1
+                        self.query_seconds += time.perf_counter() - start
+
+        return wrapper
+
+    @contextmanager
+    def measure(self, timing: Timing) -> Generator[Timing, None, None]:
+        """Add the wall time and queries of the enclosed block to `timing`."""
+        start = time.perf_counter()
+        queries, query_seconds = self.queries, self.query_seconds
+        try:
+            yield timing
+        finally:
+            timing.seconds += time.perf_counter() - start
+            timing.queries += self.queries - queries
+            timing.query_seconds += self.query_seconds - query_seconds
+
+
+@dataclass
+class TableProfile:
+    """Timings of a single table."""
+
+    schema: str
+    name: str
+    total: Timing = field(default_factory=Timing)
+    phases: dict[str, Timing] = field(default_factory=dict)
+    """Work outside templates, e.g. `metadata` for description lookups"""
+    accessors: dict[str, Timing] = field(default_factory=dict)
+    """Template render time per accessor, including the queries it issued"""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            **self.total.to_dict(),
+            "phases": {name: timing.to_dict() for name, timing in self.phases.items()},
+            "accessors": {name: timing.to_dict() for name, timing in self.accessors.items()},
+        }
+
+
+@dataclass
+class DatabaseProfile:
+    """Timings of the sync of a single database."""
+
+    name: str
+    type: str
+    counter: QueryCounter = field(default_factory=QueryCounter)
+    total: Timing = field(default_factory=Timing)
+    phases: dict[str, Timing] = field(default_factory=dict)
+    """Database-wide phases: `connect`, `list_schemas` and `publish`"""
+    list_tables: dict[str, Timing] = field(default_factory=dict)
+    """Time spent listing the tables of each schema"""
+    tables: list[TableProfile] = field(default_factory=list)
+
+    def measure(self, timing: Timing) -> AbstractContextManager[Timing]:
+        """Measure a block against this database's query counter."""
+        return self.counter.measure(timing)
+
+    def phase(self, name: str) -> Timing:
+        """Get the timing of a database-wide phase."""
+        return self.phases.setdefault(name, Timing())
+
+    def add_table(self, schema: str, table: str) -> TableProfile:
+        """Start profiling a table."""
+        table_profile = TableProfile(schema=schema, name=table)
+        self.tables.append(table_profile)
+        return table_profile
+
+    def to_dict(self) -> dict[str, Any]:
+        schemas: dict[str, dict[str, Any]] = {}
+        for schema, timing in self.list_tables.items():
+            schemas[schema] = {"name": schema, "list_tables": timing.to_dict(), "tables": []}
+        for table in self.tables:
+            entry = schemas.setdefault(table.schema, {"name": table.schema, "list_tables": None, "tables": []})
+            entry["tables"].append(table.to_dict())
+
+        return {
+            "name": self.name,
+            "type": self.type,
+            **self.total.to_dict(),
+            "phases": {name: timing.to_dict() for name, timing in self.phases.items()},
+            "schemas": list(schemas.values()),
+        }
+
+
+@dataclass
+class SyncProfile:
+    """Timing profile of a `nao sync` run over all databases."""
+
+    databases: list[DatabaseProfile] = field(default_factory=list)
+
+    def add_database(self, name: str, type: str) -> DatabaseProfile:
+        """Start profiling a database."""
+        db_profile = DatabaseProfile(name=name, type=type)
+        self.databases.append(db_profile)
+        return db_profile
+
+    def slowest_tables(self, limit: int = 5) -> list[tuple[DatabaseProfile, TableProfile]]:
+        """Tables that took the longest to sync, slowest first."""
+        tables = [(db, table) for db in self.databases for table in db.tables]
+        return sorted(tables, key=lambda item: item[1].total.seconds, reverse=True)[:limit]
+
+    def slowest_accessors(self, limit: int = 5) -> list[tuple[TableProfile, str, Timing]]:
+        """Table accessors that took the longest to render, slowest first."""
+        accessors = [
+            (table, name, timing)
+            for db in self.databases
+            for table in db.tables
+            for name, timing in table.accessors.items()
+        ]
+        return sorted(accessors, key=lambda item: item[2].seconds, reverse=True)[:limit]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "databases": [db.to_dict() for db in self.databases],
+        }
+
+    def write(self, path: Path) -> None:
+        """Write the profile as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2))
@@ -1,21 +1,50 @@
 """Database sync provider implementation."""
 
+import functools
+import shutil
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
+from ibis import BaseBackend
 from rich.console import Console
 from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
 
-from nao_core.commands.sync.cleanup import DatabaseSyncState, cleanup_stale_databases, cleanup_stale_paths
+from nao_core.commands.sync.catalog import (
+    append_catalog_entry,
+    build_catalog_entry,
+    get_catalog_path,
+    read_catalog,
+    write_catalog,
+)
+from nao_core.commands.sync.checkpoint import SyncCheckpoint, compute_fingerprint, get_checkpoint_path
+from nao_core.commands.sync.cleanup import DatabaseSyncState, cleanup_stale_databases
+from nao_core.commands.sync.digest import write_digests
+from nao_core.commands.sync.joins import (
+    JoinGraph,
+    build_join_graph,
+    declared_foreign_keys,
+    get_joins_path,
+    write_join_graph,
+)
+from nao_core.commands.sync.manifest import OutputManifest
+from nao_core.commands.sync.sharding import Shard, get_shard_base_path, merge_shards, write_shard_state
+from nao_core.commands.sync.staging import get_staging_path, publish_staged_database
 from nao_core.config import AnyDatabaseConfig, NaoConfig
-from nao_core.config.databases.base import DatabaseConfig
-from nao_core.templates.engine import get_template_engine
+from nao_core.config.databases.base import DatabaseConfig, ForeignKeyColumn
+from nao_core.fs import get_project_state_dir, link_tree
+from nao_core.templates.engine import TemplateEngine, get_template_engine
 
-from ..base import SyncProvider, SyncResult
+from ..base import SyncOptions, SyncProvider, SyncResult
+from .budget import SyncBudget, run_with_timeout
 from .context import DatabaseContext
+from .profile import PROFILE_FILENAME, DatabaseProfile, SyncProfile, TableProfile, Timing
 
 console = Console()
 
+T = TypeVar("T")
+
 TEMPLATE_PREFIX = "databases"
 
 
@@ -25,43 +54,230 @@ def _filter_templates_by_accessor(templates: list[str], db_config: DatabaseConfi
     return [t for t in templates if Path(t).stem.replace(".md", "") in allowed]
 
 
+def get_relative_db_path(db_config: DatabaseConfig) -> Path:
+    """Return the folder of a database relative to the databases output folder (e.g. `type=duckdb/database=mydb`)."""
+    return Path(f"type={db_config.type}") / f"database={db_config.get_database_name()}"
+
+
+def _record_outputs(output_path: Path, db_paths: list[str]) -> None:
+    """Add the published database folders to the output manifest used for stale cleanup."""
+    manifest = OutputManifest.load(output_path)
+    manifest.add(db_paths)
+    manifest.save()
+
+
+@dataclass
+class _DatabaseSyncRun:
+    """Everything needed to render the tables of one database into its staging directory."""
+
+    db_config: DatabaseConfig
+    conn: BaseBackend
+    engine: TemplateEngine
+    templates: list[str]
+    staging_path: Path
+    state: DatabaseSyncState
+    checkpoint: SyncCheckpoint
+    budget: SyncBudget
+    profile: DatabaseProfile
+    published_path: Path
+    """Live tree that tables not reached before the deadline are carried over from"""
+    shard: Shard | None = None
+    _published_catalog: dict[tuple[str, str], dict[str, Any]] | None = field(default=None, repr=False)
+
+    @property
+    def published_catalog(self) -> dict[tuple[str, str], dict[str, Any]]:
+        """Catalog entries of the live tree, read once when a table is carried over."""
+        if self._published_catalog is None:
+            self._published_catalog = read_catalog(get_catalog_path(self.published_path))
+        return self._published_catalog
+
+    def owned_tables(self, schema: str, tables: list[str]) -> list[str]:
+        """Keep the tables of a schema that this run is responsible for (all of them unless sharded)."""
+        if self.shard is None:
+            return tables
+        db_name = f"{self.db_config.type}/{self.db_config.get_database_name()}"
+        return [table for table in tables if self.shard.owns(db_name, schema, table)]
+
+
 def sync_database(
     db_config: DatabaseConfig,
     base_path: Path,
     progress: Progress,
     project_path: Path | None = None,
+    resume: bool = False,
+    profile: DatabaseProfile | None = None,
+    shard: Shard | None = None,
 ) -> DatabaseSyncState:
-    """Sync a single database by rendering all database templates for each table."""
-    engine = get_template_engine(project_path)
-    templates = _filter_templates_by_accessor(engine.list_templates(TEMPLATE_PREFIX), db_config)
+    """Sync a single database by rendering all database templates for each table.
+
+    Output is built in a sibling staging directory and swapped in place of the
+    live tree once every table has been rendered, so readers never see a
+    half-updated database folder. Progress is checkpointed per table; if the
+    sync fails, the staging directory and checkpoint are kept so that a run
+    with `resume=True` continues from the last completed table.
+
+    Each template render is bounded by its accessor timeout and the database's
+    sync deadline. Renders that run out of time produce degraded output, and
+    tables not reached before the deadline keep their previously synced files.
+
+    Time and warehouse queries are recorded per phase, table and accessor in
+    `profile` when one is given.
+
+    With a `shard`, only the tables owned by that shard are synced, into the
+    shard's own folder under `base_path`; `merge_shards` later combines the
+    shard outputs into the live tree.
+    """
+    profile = profile or DatabaseProfile(name=db_config.name, type=db_config.type)
+    with profile.measure(profile.total):
+        engine = get_template_engine(project_path)
+        templates = _filter_templates_by_accessor(engine.list_templates(TEMPLATE_PREFIX), db_config)
+
+        with profile.measure(profile.phase("connect")):
+            conn = profile.counter.instrument(db_config.connect())
+        relative_db_path = get_relative_db_path(db_config)
+        published_path = base_path / relative_db_path
+        db_path = get_shard_base_path(base_path, shard) / relative_db_path if shard else published_path
+        state = DatabaseSyncState(db_path=db_path)
+
+        staging_path = get_staging_path(db_path)
+        checkpoint_path = get_checkpoint_path(db_path)
+        fingerprint = compute_fingerprint(
+            type=db_config.type,
+            name=db_config.name,
+            include=db_config.include,
+            exclude=db_config.exclude,
+            templates=templates,
+        )
+
+        checkpoint = SyncCheckpoint.load(checkpoint_path, fingerprint) if resume and staging_path.exists() else None
+        if checkpoint is None:
+            if staging_path.exists():
+                shutil.rmtree(staging_path)
+            checkpoint = SyncCheckpoint.start(checkpoint_path, fingerprint)
+        else:
+            console.print(f"[dim]Resuming {db_config.name}: {checkpoint.completed_count} tables already synced[/dim]")
+
+        budget = SyncBudget(
+            {accessor.value: timeout for accessor, timeout in db_config.accessor_timeouts.items()},
+            db_config.sync_deadline,
+        )
+
+        run = _DatabaseSyncRun(
+            db_config, conn, engine, templates, staging_path, state, checkpoint, budget, profile, published_path, shard
+        )
+        _sync_schemas(run, progress)
+        with profile.measure(profile.phase("joins")):
+            foreign_keys = _fetch_foreign_keys(run)
+        with profile.measure(profile.phase("publish")):
+            staged_catalog = get_catalog_path(staging_path)
+            catalog = write_catalog(
+                staged_catalog,
+                read_catalog(staged_catalog).values(),
+                state.synced_tables,
+                live_path=get_catalog_path(db_path),
+            )
+            write_digests(staging_path, db_config.name, catalog, db_config.digest, live_path=db_path)
+            # Shards keep every declared foreign key, tables synced by other shards are only known at merge time
+            join_graph = build_join_graph(catalog, foreign_keys, state.synced_tables if shard is None else None)
+            write_join_graph(get_joins_path(staging_path), join_graph, live_path=get_joins_path(db_path))
+            state.stale_removed = publish_staged_database(state, staging_path, verbose=shard is None)
+        if shard is not None:
+            write_shard_state(state)
+        checkpoint.discard()
 
-    conn = db_config.connect()
-    db_name = db_config.get_database_name()
-    db_path = base_path / f"type={db_config.type}" / f"database={db_name}"
-    state = DatabaseSyncState(db_path=db_path)
+    return state
 
-    schemas = db_config.get_schemas(conn)
+
+def _fetch_foreign_keys(run: _DatabaseSyncRun) -> dict[str, list[ForeignKeyColumn]]:
+    """Fetch the declared foreign keys of every synced schema, for the join graph.
+
+    Each schema is fetched within the remaining sync budget. Schemas that time
+    out or are reached after the deadline reuse the foreign keys of the
+    published join graph instead.
+    """
+    published: dict[str, list[ForeignKeyColumn]] | None = None
+
+    def published_keys(schema: str) -> list[ForeignKeyColumn]:
+        nonlocal published
+        if published is None:
+            try:
+                published = declared_foreign_keys(JoinGraph.load(get_joins_path(run.published_path)))
+            except (OSError, ValueError, KeyError):
+                published = {}
+        return published.get(schema, [])
+
+    foreign_keys: dict[str, list[ForeignKeyColumn]] = {}
+    for schema in sorted(run.state.synced_tables):
+        if run.budget.expired:
+            foreign_keys[schema] = published_keys(schema)
+            continue
+        try:
+            foreign_keys[schema] = _run_with_timeout(
+                run,
+                lambda schema=schema, conn=run.conn: run.db_config.fetch_foreign_keys(conn, schema),
+                run.budget.timeout_for(),
+            )
+        except TimeoutError as e:
+            console.print(f"[yellow]⚠[/yellow] Foreign keys of {schema} {e}")
+            _reconnect(run)
+            foreign_keys[schema] = published_keys(schema)
+    return foreign_keys
+
+
+def _sync_schemas(run: _DatabaseSyncRun, progress: Progress) -> None:
+    """Render every matching table of every schema into the staging directory.
+
+    Schema and table lists recorded in the checkpoint are reused so a resumed
+    sync works on exactly the same set of tables. Tables left unfinished by the
+    previous run are retried first, then the remaining tables are synced.
+    Once the deadline has passed, schemas are no longer listed and tables are
+    carried over from the live tree instead of being rendered.
+    """
+    db_config, checkpoint, state, budget = run.db_config, run.checkpoint, run.state, run.budget
+
+    if checkpoint.schemas is None:
+        with run.profile.measure(run.profile.phase("list_schemas")):
+            # Schemas excluded as a whole are dropped here so their tables are never listed
+            schemas = [schema for schema in db_config.get_schemas(run.conn) if db_config.matches_schema(schema)]
+        checkpoint.record_schemas(schemas)
+    schemas = checkpoint.schemas or []
 
     schema_task = progress.add_task(
         f"[dim]{db_config.name}[/dim]",
         total=len(schemas),
     )
 
-    for schema in schemas:
-        try:
-            all_tables = conn.list_tables(database=schema)
-        except Exception:
-            progress.update(schema_task, advance=1)
-            continue
+    retried: set[tuple[str, str]] = set()
+    unfinished = checkpoint.unfinished_tables()
+    if unfinished:
+        retry_task = progress.add_task("  [yellow]retrying unfinished tables[/yellow]", total=len(unfinished))
+        for schema, table in unfinished:
+            if budget.expired:
+                break
+            _sync_table(run, schema, table)
+            retried.add((schema, table))
+            progress.update(retry_task, advance=1)
 
-        tables = [t for t in all_tables if db_config.matches_pattern(schema, t)]
+    for schema in schemas:
+        tables = checkpoint.schema_tables.get(schema)
+        if tables is None and budget.expired:
+            tables = run.owned_tables(schema, _list_live_tables(run.published_path / f"schema={schema}"))
+        elif tables is None:
+            try:
+                with run.profile.measure(run.profile.list_tables.setdefault(schema, Timing())):
+                    all_tables = run.conn.list_tables(database=schema)
+            except Exception:
+                progress.update(schema_task, advance=1)
+                continue
+
+            tables = run.owned_tables(schema, [t for t in all_tables if db_config.matches_pattern(schema, t)])
+            checkpoint.record_schema(schema, tables)
 
         if not tables:
             progress.update(schema_task, advance=1)
             continue
 
-        schema_path = db_path / f"schema={schema}"
-        schema_path.mkdir(parents=True, exist_ok=True)
+        (run.staging_path / f"schema={schema}").mkdir(parents=True, exist_ok=True)
         state.add_schema(schema)
 
         table_task = progress.add_task(
@@ -70,38 +286,207 @@ def sync_database(
         )
 
         for table in tables:
-            table_path = schema_path / f"table={table}"
-            table_path.mkdir(parents=True, exist_ok=True)
-
-            # Use custom context if database config provides one (e.g., for Redshift)
-            create_context = getattr(db_config, "create_context", None)
-            if create_context and callable(create_context):
-                ctx = create_context(conn, schema, table)
+            if checkpoint.is_done(schema, table) or (schema, table) in retried:
+                pass
+            elif budget.expired:
+                _defer_table(run, schema, table)
             else:
-                table_desc = db_config.fetch_table_description(conn, schema, table)
-                col_descs = db_config.fetch_column_descriptions(conn, schema, table)
-                ctx = DatabaseContext(conn, schema, table, table_description=table_desc, column_descriptions=col_descs)
-
-            for template_name in templates:
-                # Derive output filename: "databases/columns.md.j2" → "columns.md"
-                output_filename = Path(template_name).stem  # "columns.md" (stem strips .j2)
-
-                try:
-                    content = engine.render(template_name, db=ctx, table_name=table, dataset=schema)
-                except Exception as e:
-                    error_msg = f"Error generating {output_filename} for {schema}.{table}: {e}"
-                    console.print(f"[bold red]✗[/bold red] {error_msg}")
-                    content = f"# {table}\n\nError generating content: {e}"
-
-                output_file = table_path / output_filename
-                output_file.write_text(content)
+                _sync_table(run, schema, table)
 
             state.add_table(schema, table)
             progress.update(table_task, advance=1)
 
         progress.update(schema_task, advance=1)
 
-    return state
+    if state.tables_deferred:
+        console.print(
+            f"[yellow]⚠[/yellow] {db_config.name}: sync deadline reached, "
+            f"{state.tables_deferred} tables kept their previous output"
+        )
+
+
+def _list_live_tables(live_schema_path: Path) -> list[str]:
+    """List the tables of a schema from the currently published tree."""
+    if not live_schema_path.is_dir():
+        return []
+    return sorted(
+        entry.name.removeprefix("table=")
+        for entry in live_schema_path.iterdir()
+        if entry.is_dir() and entry.name.startswith("table=")
+    )
+
+
+def _defer_table(run: _DatabaseSyncRun, schema: str, table: str) -> None:
+    """Carry a table that was not reached before the deadline over from the live tree."""
+    relative_path = Path(f"schema={schema}") / f"table={table}"
+    live_table_path = run.published_path / relative_path
+    if live_table_path.is_dir():
+        link_tree(live_table_path, run.staging_path / relative_path)
+    if entry := run.published_catalog.get((schema, table)):
+        append_catalog_entry(get_catalog_path(run.staging_path), entry)
+    run.state.tables_deferred += 1
+
+
+def _close_abandoned(conn: BaseBackend) -> None:
+    try:
+        conn.disconnect()
+    except Exception as e:
+        console.print(f"[dim]Could not close a timed out connection: {e}[/dim]")
+
+
+def _run_with_timeout(run: _DatabaseSyncRun, func: Callable[[], T], timeout: float | None) -> T:
+    """Run a call on the run's connection with a timeout.
+
+    If the call times out, its connection is closed once the abandoned call returns.
+    """
+    conn = run.conn
+    return run_with_timeout(func, timeout, on_abandoned=lambda: _close_abandoned(conn))
+
+
+def _reconnect(run: _DatabaseSyncRun) -> None:
+    """Give the run a new connection after a timeout.
+
+    The timed out call is still running on the current connection, which
+    Ibis connections can't share between threads. Its query is cancelled when
+    the driver supports it, and the connection is left to the abandoned
+    thread, which closes it when the call returns. Its queries are no longer
+    counted in the profile.
+    """
+    abandoned = run.conn
+    try:
+        run.db_config.interrupt(abandoned)
+    except Exception as e:
+        console.print(f"[yellow]⚠[/yellow] Could not cancel the timed out query on {run.db_config.name}: {e}")
+    run.profile.counter.detach(abandoned)
+    run.conn = run.profile.counter.instrument(run.db_config.connect())
+
+
+def _sync_table(run: _DatabaseSyncRun, schema: str, table: str) -> None:
+    """Render all templates of a single table into the staging directory."""
+    table_profile = run.profile.add_table(schema, table)
+    with run.profile.measure(table_profile.total):
+        _render_table(run, table_profile, schema, table)
+
+
+def _render_table(run: _DatabaseSyncRun, table_profile: TableProfile, schema: str, table: str) -> None:
+    """Build the template context of a table and render each accessor, recording timings in `table_profile`."""
+    db_config, conn, state, checkpoint, budget = run.db_config, run.conn, run.state, run.checkpoint, run.budget
+    checkpoint.record_table(schema, table, "started")
+
+    relative_path = Path(f"schema={schema}") / f"table={table}"
+    table_path = run.staging_path / relative_path
+    live_table_path = state.db_path / relative_path
+    table_path.mkdir(parents=True, exist_ok=True)
+
+    table_desc: str | None = None
+    col_descs: dict[str, str] = {}
+    # Use custom context if database config provides one (e.g., for Redshift)
+    create_context = getattr(db_config, "create_context", None)
+    if not (create_context and callable(create_context)):
+        try:
+            with run.profile.measure(table_profile.phases.setdefault("metadata", Timing())):
+                table_desc, col_descs = _run_with_timeout(
+                    run,
+                    lambda: (
+                        db_config.fetch_table_description(conn, schema, table),
+                        db_config.fetch_column_descriptions(conn, schema, table),
+                    ),
+                    budget.timeout_for(),
+                )
+        except TimeoutError:
+            _reconnect(run)
+            _defer_table(run, schema, table)
+            checkpoint.record_table(schema, table, "failed")
+            return
+
+    def table_context() -> Any:
+        if create_context and callable(create_context):
+            return create_context(run.conn, schema, table)
+        return DatabaseContext(
+            run.conn,
+            schema,
+            table,
+            table_description=table_desc,
+            column_descriptions=col_descs,
+            column_profile=db_config.column_profile,
+            preview_plan=functools.partial(db_config.get_preview_plan, run.conn, schema, table),
+            preview_rows=db_config.preview.rows,
+        )
+
+    ctx = table_context()
+    failed = False
+    files: list[str] = []
+    for template_name in run.templates:
+        # Derive output filename: "databases/columns.md.j2" → "columns.md"
+        output_filename = Path(template_name).stem  # "columns.md" (stem strips .j2)
+        accessor = output_filename.removesuffix(".md")
+
+        try:
+            with run.profile.measure(table_profile.accessors.setdefault(accessor, Timing())):
+                content = _run_with_timeout(
+                    run,
+                    lambda template_name=template_name, ctx=ctx: run.engine.render(
+                        template_name, db=ctx, table_name=table, dataset=schema
+                    ),
+                    budget.timeout_for(accessor),
+                )
+        except TimeoutError as e:
+            console.print(f"[yellow]⚠[/yellow] {accessor} for {schema}.{table} {e}")
+            content = f"# {table}\n\n_{accessor.capitalize()} unavailable: {e}._\n"
+            state.files_timed_out += 1
+            failed = True
+            # The next accessors query a new connection, as the timed out render may still be using this one
+            _reconnect(run)
+            ctx = table_context()
+        except Exception as e:
+            error_msg = f"Error generating {output_filename} for {schema}.{table}: {e}"
+            console.print(f"[bold red]✗[/bold red] {error_msg}")
+            content = f"# {table}\n\nError generating content: {e}"
+            failed = True
+
+        state.writes.write(table_path / output_filename, content, live_path=live_table_path / output_filename)
+        files.append(str(relative_path / output_filename))
+
+    try:
+        with run.profile.measure(table_profile.phases.setdefault("catalog", Timing())):
+            entry = _run_with_timeout(
+                run, lambda: build_catalog_entry(schema, table, files, ctx, verbose=True), budget.timeout_for()
+            )
+    except TimeoutError:
+        _reconnect(run)
+        entry = build_catalog_entry(schema, table, files)
+    append_catalog_entry(get_catalog_path(run.staging_path), entry)
+
+    checkpoint.record_table(schema, table, "failed" if failed else "done")
+
+
+def _print_profile_summary(profile: SyncProfile, limit: int = 5) -> None:
+    """Print the slowest tables and accessors of a sync."""
+    slowest_tables = [(db, table) for db, table in profile.slowest_tables(limit) if table.total.seconds > 0]
+    if not slowest_tables:
+        return
+
+    console.print("\n[dim]Slowest tables:[/dim]")
+    for db, table in slowest_tables:
+        console.print(
+            f"  {db.name} {table.schema}.{table.name} "
+            f"[dim]{table.total.seconds:.2f}s, {table.total.queries} queries[/dim]"
+        )
+
+    console.print("[dim]Slowest accessors:[/dim]")
+    for table, accessor, timing in profile.slowest_accessors(limit):
+        console.print(
+            f"  {table.schema}.{table.name} {accessor} "
+            f"[dim]{timing.seconds:.2f}s ({timing.query_seconds:.2f}s in {timing.queries} queries)[/dim]"
+        )
+
+
+def _remove_sync_leftovers(db_path: Path) -> None:
+    """Remove the hidden staging tree and checkpoint kept next to a database output path."""
+    staging_path = get_staging_path(db_path)
+    if staging_path.is_dir():
+        shutil.rmtree(staging_path)
+    get_checkpoint_path(db_path).unlink(missing_ok=True)
 
 
 class DatabaseSyncProvider(SyncProvider):
@@ -119,24 +504,54 @@ class DatabaseSyncProvider(SyncProvider):
     def default_output_dir(self) -> str:
         return "databases"
 
+    @property
+    def supports_shards(self) -> bool:
+        return True
+
     def pre_sync(self, config: NaoConfig, output_path: Path) -> None:
-        cleanup_stale_databases(config.databases, output_path, verbose=True)
+        manifest = OutputManifest.load(output_path)
+        if not manifest.exists:
+            # Output from before manifests were tracked: fall back to scanning the folder once
+            cleanup_stale_databases(config.databases, output_path, verbose=True)
+            return
+        configured = {get_relative_db_path(db).as_posix() for db in config.databases}
+        for relative_path in manifest.paths - configured:
+            _remove_sync_leftovers(output_path / relative_path)
+        manifest.remove_stale(configured, verbose=True, label="database")
+        manifest.save()
 
     def get_items(self, config: NaoConfig) -> list[AnyDatabaseConfig]:
         return config.databases
 
-    def sync(self, items: list[Any], output_path: Path, project_path: Path | None = None) -> SyncResult:
+    def sync(
+        self,
+        items: list[Any],
+        output_path: Path,
+        project_path: Path | None = None,
+        options: SyncOptions | None = None,
+    ) -> SyncResult:
+        options = options or SyncOptions()
         if not items:
             console.print("\n[dim]No databases configured[/dim]")
             return SyncResult(provider_name=self.name, items_synced=0)
 
+        if options.merge:
+            return self._merge(items, output_path)
+
         total_datasets = 0
         total_tables = 0
         total_removed = 0
-        sync_states: list[DatabaseSyncState] = []
+        total_written = 0
+        total_unchanged = 0
+        total_timed_out = 0
+        total_deferred = 0
+        synced_paths: list[str] = []
+        profile = SyncProfile()
 
         console.print(f"\n[bold cyan]{self.emoji}  Syncing {self.name}[/bold cyan]")
         console.print(f"[dim]Location:[/dim] {output_path.absolute()}")
+        if options.shard is not None:
+            console.print(f"[dim]Shard:[/dim] {options.shard}")
 
         for db in items:
             accessor_names = [a.value for a in db.accessors]
@@ -153,20 +568,44 @@ class DatabaseSyncProvider(SyncProvider):
         ) as progress:
             for db in items:
                 try:
-                    state = sync_database(db, output_path, progress, project_path)
-                    sync_states.append(state)
+                    state = sync_database(
+                        db,
+                        output_path,
+                        progress,
+                        project_path,
+                        resume=options.resume,
+                        profile=profile.add_database(db.name, db.type),
+                        shard=options.shard,
+                    )
                     total_datasets += state.schemas_synced
                     total_tables += state.tables_synced
+                    total_written += state.writes.written
+                    total_unchanged += state.writes.unchanged
+                    total_removed += state.stale_removed
+                    total_timed_out += state.files_timed_out
+                    total_deferred += state.tables_deferred
+                    synced_paths.append(get_relative_db_path(db).as_posix())
                 except Exception as e:
                     console.print(f"[bold red]✗[/bold red] Failed to sync {db.name}: {e}")
+                    base_path = get_shard_base_path(output_path, options.shard) if options.shard else output_path
+                    db_path = base_path / get_relative_db_path(db)
+                    if get_checkpoint_path(db_path).exists():
+                        console.print("  [dim]Run `nao sync --resume` to continue from the last completed table[/dim]")
 
-        for state in sync_states:
-            removed = cleanup_stale_paths(state, verbose=True)
-            total_removed += removed
+        if options.shard is None:
+            _record_outputs(output_path, synced_paths)
+        _print_profile_summary(profile)
+        if project_path is not None:
+            profile.write(get_project_state_dir(project_path) / PROFILE_FILENAME)
 
         summary = f"{total_tables} tables across {total_datasets} datasets"
+        summary += f", {total_written} files written, {total_unchanged} unchanged"
         if total_removed > 0:
             summary += f", {total_removed} stale removed"
+        if total_timed_out > 0:
+            summary += f", {total_timed_out} timed out"
+        if total_deferred > 0:
+            summary += f", {total_deferred} deferred"
 
         return SyncResult(
             provider_name=self.name,
@@ -175,6 +614,55 @@ class DatabaseSyncProvider(SyncProvider):
                 "datasets": total_datasets,
                 "tables": total_tables,
                 "removed": total_removed,
+                "timed_out": total_timed_out,
+                "deferred": total_deferred,
             },
             summary=summary,
+            files_written=total_written,
+            files_unchanged=total_unchanged,
+        )
+
+    def _merge(self, items: list[Any], output_path: Path) -> SyncResult:
+        """Combine the shard outputs of every database into the live tree."""
+        console.print(f"\n[bold cyan]{self.emoji}  Merging {self.name} shards[/bold cyan]")
+        console.print(f"[dim]Location:[/dim] {output_path.absolute()}\n")
+
+        total_datasets = 0
+        total_tables = 0
+        total_removed = 0
+        total_written = 0
+        total_unchanged = 0
+        errors: list[str] = []
+        merged_paths: list[str] = []
+
+        for db in items:
+            relative_db_path = get_relative_db_path(db)
+            try:
+                state = merge_shards(output_path, relative_db_path, digest=db.digest, title=db.name, verbose=True)
+            except Exception as e:
+                console.print(f"[bold red]✗[/bold red] Failed to merge {db.name}: {e}")
+                errors.append(f"{db.name}: {e}")
+                continue
+            console.print(f"[green]✓[/green] {db.name}: {state.tables_synced} tables")
+            total_datasets += state.schemas_synced
+            total_tables += state.tables_synced
+            total_written += state.writes.written
+            total_unchanged += state.writes.unchanged
+            total_removed += state.stale_removed
+            merged_paths.append(relative_db_path.as_posix())
+
+        _record_outputs(output_path, merged_paths)
+        summary = f"{total_tables} tables across {total_datasets} datasets merged"
+        summary += f", {total_written} files written, {total_unchanged} unchanged"
+        if total_removed > 0:
+            summary += f", {total_removed} stale removed"
+
+        return SyncResult(
+            provider_name=self.name,
+            items_synced=total_tables,
+            details={"datasets": total_datasets, "tables": total_tables, "removed": total_removed},
+            summary=summary,
+            error="; ".join(errors) if errors else None,
+            files_written=total_written,
+            files_unchanged=total_unchanged,
         )
@@ -0,0 +1,100 @@
+"""On-disk cache of Notion pages exported as markdown.
+
+Exporting a page walks its whole block tree, which takes dozens of paginated
+API calls for a large page. The cache keeps the last export of each page in
+`.nao/notion/`, keyed by page id, and is validated with the page's
+`last_edited_time`, which a single `pages.retrieve` call returns.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+from nao_core.fs import get_project_state_dir
+
+NOTION_CACHE_DIR = "notion"
+NOTION_CACHE_VERSION = 2
+
+# Notion rounds `last_edited_time` down to the minute, so an edit made in the
+# same minute as an export doesn't change it. Exports made less than this long
+# after the last edit are never trusted.
+EDIT_TIME_RESOLUTION = timedelta(minutes=1)
+
+
+class ChildRef(NamedTuple):
+    """A page or database referenced by a page (child page, child database or link)."""
+
+    kind: str
+    """`page` or `database`"""
+    id: str
+    title: str | None = None
+
+
+@dataclass
+class CachedPage:
+    """The markdown export of a page, as of its `last_edited_time`."""
+
+    title: str
+    markdown: str
+    last_edited_time: str
+    exported_at: str
+    children: list[ChildRef] = field(default_factory=list)
+    """Pages and databases found in the page's blocks, in the order they were listed"""
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class NotionPageCache:
+    """Exported Notion pages stored as one JSON file per page id."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    @classmethod
+    def for_project(cls, project_path: Path) -> NotionPageCache:
+        return cls(get_project_state_dir(project_path) / NOTION_CACHE_DIR)
+
+    def _page_path(self, page_id: str) -> Path:
+        return self.path / f"{page_id}.json"
+
+    def get(self, page_id: str, last_edited_time: str | None) -> CachedPage | None:
+        """Return the cached export of a page if the page was not edited since.
+
+        Args:
+            page_id: The 32-character page id
+            last_edited_time: The page's current `last_edited_time`; nothing is reused without it.
+        """
+        if not last_edited_time:
+            return None
+        try:
+            data = json.loads(self._page_path(page_id).read_text())
+            if data.get("version") != NOTION_CACHE_VERSION or data["last_edited_time"] != last_edited_time:
+                return None
+            if _parse_time(data["exported_at"]) < _parse_time(last_edited_time) + EDIT_TIME_RESOLUTION:
+                return None
+            return CachedPage(
+                data["title"],
+                data["markdown"],
+                data["last_edited_time"],
+                data["exported_at"],
+                [ChildRef(*child) for child in data.get("children", [])],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, page_id: str, page: CachedPage) -> None:
+        """Store the export of a page; failures to write only cost a re-export next time."""
+        data = {"version": NOTION_CACHE_VERSION, **asdict(page)}
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._page_path(page_id).with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data))
+            tmp_path.replace(self._page_path(page_id))
+        except OSError:
+            pass
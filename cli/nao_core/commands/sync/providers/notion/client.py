@@ -0,0 +1,269 @@
+"""Rate-limited Notion API client shared by the pages synced in parallel.
+
+Notion allows an average of about three requests per second per integration
+and answers `429 Too Many Requests` with a `Retry-After` header beyond that.
+Every request of a sync goes through one token bucket, so parallel page
+exports run at the allowed throughput, and a rate-limited request pauses all
+of them for the time the API asked for before being retried.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, cast
+
+import httpx
+from notion2md.notion_api import NotionClient
+from notion_client import Client
+
+from .cache import ChildRef
+
+NOTION_REQUESTS_PER_SECOND = 3.0
+NOTION_MAX_RETRIES = 5
+NOTION_MAX_BACKOFF = 30.0
+
+# Points the client to another server, e.g. a local stand-in for Notion in tests
+NOTION_API_URL_ENV = "NOTION_API_URL"
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests per second, with bursts of up to `capacity`."""
+
+    def __init__(
+        self,
+        rate: float = NOTION_REQUESTS_PER_SECOND,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + max(0.0, now - self._updated) * self.rate)
+                self._updated = max(self._updated, now)
+                # Tolerate rounding errors, which would otherwise leave waits too short to advance the clock
+                if self._tokens >= 1 - 1e-9:
+                    self._tokens = max(0.0, self._tokens - 1)
+                    return
+                wait = (1 - self._tokens) / self.rate + max(0.0, self._updated - now)
+            self._sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for `seconds`, e.g. after the API answered 429."""
+        with self._lock:
+            resume = self._clock() + seconds
+            if resume > self._updated:
+                # Tokens only refill from the end of the pause, so it isn't followed by a burst
+                self._updated = resume
+                self._tokens = 0.0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a `Retry-After` header (seconds or an HTTP date) into a delay in seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """HTTP transport taking a token before every request and retrying rate-limited ones."""
+
+    def __init__(
+        self,
+        bucket: TokenBucket,
+        transport: httpx.BaseTransport | None = None,
+        max_retries: int = NOTION_MAX_RETRIES,
+    ):
+        self._bucket = bucket
+        self._transport = transport or httpx.HTTPTransport()
+        self._max_retries = max_retries
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            self._bucket.acquire()
+            response = self._transport.handle_request(request)
+            if response.status_code != 429 or attempt >= self._max_retries:
+                return response
+            delay = parse_retry_after(response.headers.get("retry-after"))
+            if delay is None:
+                delay = min(NOTION_MAX_BACKOFF, 2.0**attempt)
+            response.close()
+            self._bucket.pause(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+def create_client(
+    api_key: str,
+    bucket: TokenBucket | None = None,
+    base_url: str | None = None,
+    transport: httpx.BaseTransport | None = None,
+) -> Client:
+    """Create a Notion client whose requests are rate limited by `bucket`.
+
+    Args:
+        api_key: Notion integration token
+        bucket: Token bucket shared by every client of the same integration (a new one by default)
+        base_url: Notion API URL, `$NOTION_API_URL` or the public API by default
+        transport: Transport sending the requests (the network by default)
+    """
+    options: dict[str, Any] = {"auth": api_key}
+    base_url = base_url or os.environ.get(NOTION_API_URL_ENV)
+    if base_url:
+        options["base_url"] = base_url.rstrip("/")
+    http_client = httpx.Client(transport=RateLimitedTransport(bucket or TokenBucket(), transport))
+    return Client(options, client=http_client)
+
+
+class BlockChildren:
+    """Lists blocks for notion2md's `BlockConvertor` through the shared client.
+
+    The convertor only calls `get_children` on its client. Passing this
+    adapter in place of notion2md's `NotionClient`, a process-wide client
+    created for the first token it sees and neither rate limited nor
+    retried, keeps every request of a sync on the shared client. The pages
+    and databases referenced by the listed blocks are collected along the
+    way, so following them costs no extra request.
+
+    The convertor drops the blocks whose children could not be listed
+    without reporting it, so listing errors are recorded in `errors` to
+    tell a complete export from a truncated one.
+    """
+
+    def __init__(self, client: Client):
+        self._client = client
+        self.children: list[ChildRef] = []
+        self.errors: list[Exception] = []
+
+    def get_children(self, parent_id: str) -> list[dict[str, Any]]:
+        results: list[dict[str, Any]] = []
+        start_cursor = None
+        try:
+            while True:
+                response: Any = self._client.blocks.children.list(
+                    block_id=parent_id, start_cursor=start_cursor, page_size=100
+                )
+                results.extend(response["results"])
+                if not response.get("has_more"):
+                    break
+                start_cursor = response["next_cursor"]
+        except Exception as e:
+            self.errors.append(e)
+            raise
+        self.children.extend(child for block in results if (child := child_reference(block)) is not None)
+        return results
+
+    def as_notion2md_client(self) -> NotionClient:
+        """This adapter, typed as the client `BlockConvertor` expects (it only calls `get_children`)."""
+        return cast(NotionClient, self)
+
+
+def normalize_id(notion_id: str) -> str:
+    """Notion ids without dashes, as used in URLs and the page cache."""
+    return notion_id.replace("-", "")
+
+
+def child_reference(block: dict[str, Any]) -> ChildRef | None:
+    """Return the page or database a block refers to, if any."""
+    block_type = block.get("type")
+    if block_type == "child_page":
+        return ChildRef("page", normalize_id(block["id"]), block["child_page"].get("title"))
+    if block_type == "child_database":
+        return ChildRef("database", normalize_id(block["id"]), block["child_database"].get("title"))
+    if block_type == "link_to_page":
+        link = block["link_to_page"]
+        if link.get("type") == "page_id":
+            return ChildRef("page", normalize_id(link["page_id"]))
+        if link.get("type") == "database_id":
+            return ChildRef("database", normalize_id(link["database_id"]))
+    return None
+
+
+def query_database(client: Client, database_id: str, **kwargs: Any) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Retrieve a database and list its rows (pages).
+
+    Supports both the data source API (Notion-Version 2025-09-03, notion-client 3)
+    and the earlier `databases.query` endpoint.
+
+    Args:
+        client: Notion client
+        database_id: The 32-character database id
+        **kwargs: Query options, e.g. `filter` or `filter_properties`
+
+    Returns:
+        Tuple of (database object, row page objects)
+    """
+    database: Any = client.databases.retrieve(database_id=database_id)
+    return database, query_rows(client, database, **kwargs)
+
+
+def query_rows(client: Client, database: dict[str, Any], **kwargs: Any) -> list[dict[str, Any]]:
+    """List the rows (pages) of a database object already retrieved.
+
+    Args:
+        client: Notion client
+        database: Database object returned by `databases.retrieve`
+        **kwargs: Query options, e.g. `filter` or `filter_properties`
+    """
+    if hasattr(client, "data_sources"):
+        queries = [
+            lambda source_id=source["id"], **options: client.data_sources.query(data_source_id=source_id, **options)
+            for source in database.get("data_sources", [])
+        ]
+    else:
+        queries = [lambda **options: client.databases.query(database_id=database["id"], **options)]  # type: ignore[attr-defined]
+
+    rows: list[dict[str, Any]] = []
+    for query in queries:
+        start_cursor = None
+        while True:
+            response: Any = query(start_cursor=start_cursor, page_size=100, **kwargs)
+            rows.extend(row for row in response["results"] if row.get("object") == "page")
+            if not response.get("has_more"):
+                break
+            start_cursor = response["next_cursor"]
+    return rows
+
+
+def database_schema(client: Client, database: dict[str, Any]) -> dict[str, str]:
+    """Get the properties of a database object already retrieved, as name → property type.
+
+    With the data source API, the properties are those of its data sources,
+    retrieved with one request each.
+    """
+    sources: list[dict[str, Any]] = [database]
+    if "properties" not in database and hasattr(client, "data_sources"):
+        sources = [
+            cast(dict[str, Any], client.data_sources.retrieve(data_source_id=source["id"]))
+            for source in database.get("data_sources", [])
+        ]
+    schema: dict[str, str] = {}
+    for source in sources:
+        for name, prop in source.get("properties", {}).items():
+            schema.setdefault(name, prop.get("type", "unknown"))
+    return schema
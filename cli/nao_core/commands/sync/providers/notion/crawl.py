@@ -0,0 +1,145 @@
+"""Recursive crawl of the pages and databases below the configured Notion pages.
+
+Starting from the root pages, the crawl follows child pages, child
+databases and links to pages breadth-first, one level at a time, with each
+level exported in parallel. Pages are visited once even when several pages
+link to them, and each page is written under the folder of the page it was
+first found in, mirroring the workspace hierarchy:
+
+    docs/notion/
+    ├── handbook.md
+    └── handbook/
+        ├── onboarding.md
+        └── projects/          (a database)
+            └── roadmap.md
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from typing import Any
+
+from notion_client import Client
+
+from .cache import CachedPage, ChildRef
+from .client import normalize_id, query_database
+
+
+def slugify_title(title: str) -> str:
+    """Turn a page title into a file or folder name (e.g. `Road Map` → `road-map`)."""
+    return re.sub(r"[^\w\s-]", "", title).strip().replace(" ", "-").lower()
+
+
+def get_database_title(database: dict[str, Any], database_id: str) -> str:
+    """Get the title of a database object returned by the Notion API."""
+    title = "".join(t.get("plain_text", "") for t in database.get("title") or [])
+    return title or database_id
+
+
+@dataclass
+class CrawledPage:
+    """A page exported by the crawl, with its place in the mirrored hierarchy."""
+
+    id: str
+    title: str
+    markdown: str
+    path: PurePosixPath
+    """Output file, relative to the Notion output folder"""
+    depth: int
+
+
+@dataclass
+class CrawlResult:
+    pages: list[CrawledPage] = field(default_factory=list)
+    errors: list[tuple[ChildRef, Exception]] = field(default_factory=list)
+
+
+@dataclass
+class _Node:
+    ref: ChildRef
+    folder: PurePosixPath
+    depth: int
+
+
+class _Names:
+    """Unique names per folder; a sibling with the same title gets its id appended."""
+
+    def __init__(self) -> None:
+        self._taken: dict[PurePosixPath, set[str]] = {}
+
+    def claim(self, folder: PurePosixPath, title: str, notion_id: str) -> str:
+        taken = self._taken.setdefault(folder, set())
+        name = slugify_title(title) or notion_id
+        if name in taken:
+            name = f"{name}-{notion_id[:8]}"
+        taken.add(name)
+        return name
+
+
+def crawl(
+    roots: list[str],
+    client: Client,
+    export: Callable[[str], CachedPage],
+    max_depth: int,
+    max_workers: int,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> CrawlResult:
+    """Export the root pages and everything below them, up to `max_depth` levels.
+
+    Args:
+        roots: Ids of the root pages
+        client: Client used to list the rows of databases
+        export: Exports a page by id (reusing cached exports)
+        max_depth: Levels of child pages and databases to follow (0 exports only the roots)
+        max_workers: Pages and databases fetched in parallel
+        on_progress: Called with (done, discovered) after each page or database
+
+    Returns:
+        The exported pages in breadth-first order, and the pages or databases that failed.
+    """
+    result = CrawlResult()
+    names = _Names()
+    seen = set(roots)
+    level = [_Node(ChildRef("page", root), PurePosixPath(), 0) for root in dict.fromkeys(roots)]
+    done, discovered = 0, len(level)
+
+    def visit(node: _Node) -> tuple[str, list[ChildRef], CachedPage | None]:
+        if node.ref.kind == "page":
+            page = export(node.ref.id)
+            return page.title, page.children, page
+        database, rows = query_database(client, node.ref.id)
+        children = [ChildRef("page", normalize_id(row["id"])) for row in rows]
+        return node.ref.title or get_database_title(database, node.ref.id), children, None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while level:
+            futures = [executor.submit(visit, node) for node in level]
+            next_level: list[_Node] = []
+            # Results are handled in discovery order, so names and folders don't depend on timing
+            for node, future in zip(level, futures):
+                done += 1
+                try:
+                    title, children, page = future.result()
+                except Exception as e:
+                    result.errors.append((node.ref, e))
+                else:
+                    name = names.claim(node.folder, title, node.ref.id)
+                    if page is not None:
+                        result.pages.append(
+                            CrawledPage(node.ref.id, title, page.markdown, node.folder / f"{name}.md", node.depth)
+                        )
+                    if node.depth < max_depth:
+                        for child in children:
+                            if child.id not in seen:
+                                seen.add(child.id)
+                                next_level.append(_Node(child, node.folder / name, node.depth + 1))
+                                discovered += 1
+                if on_progress is not None:
+                    on_progress(done, discovered)
+            level = next_level
+
+    return result
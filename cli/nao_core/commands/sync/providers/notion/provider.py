@@ -1,22 +1,43 @@
 import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, cast
 
-from notion2md.exporter.block import StringExporter
+from notion2md.config import Config
+from notion2md.convertor.block import BlockConvertor
 from notion_client import Client
 from rich.console import Console
 from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
 
+from nao_core.commands.sync.manifest import OutputManifest
 from nao_core.config.base import NaoConfig
 from nao_core.config.notion import NotionConfig
-
-from ..base import SyncProvider, SyncResult
+from nao_core.fs import WriteStats
+
+from ..base import SyncOptions, SyncProvider, SyncResult
+from .cache import CachedPage, NotionPageCache
+from .client import NOTION_REQUESTS_PER_SECOND, BlockChildren, TokenBucket, create_client
+from .crawl import crawl, slugify_title
+from .tables import (
+    ROWS_FILENAME,
+    SUMMARY_FILENAME,
+    TABLES_DIR,
+    DatabaseExport,
+    export_database,
+    find_exports,
+    format_summary,
+    read_export,
+)
 
 console = Console()
 
 # Notion page IDs are 32-character hex strings (UUID without dashes)
 NOTION_PAGE_ID_PATTERN = re.compile(r"[a-f0-9]{32}")
 
+# Pages exported in parallel; the token bucket keeps requests within Notion's rate limit
+DEFAULT_NOTION_WORKERS = 8
+
 
 def cleanup_stale_pages(synced_files: set[str], output_path: Path, verbose: bool = False) -> int:
     """Remove markdown files that were not synced.
@@ -70,6 +91,11 @@ def extract_page_id(page_url: str) -> str:
 def get_page_title(client: Client, page_id: str) -> str:
     """Get the title of a Notion page."""
     page = cast(dict[str, Any], client.pages.retrieve(page_id=page_id))
+    return get_title_from_page(page, page_id)
+
+
+def get_title_from_page(page: dict[str, Any], page_id: str) -> str:
+    """Get the title from a page object returned by the Notion API."""
     properties = page.get("properties", {})
 
     # Try common title property names
@@ -81,30 +107,80 @@ def get_page_title(client: Client, page_id: str) -> str:
                 if title_array:
                     return "".join(t.get("plain_text", "") for t in title_array)
 
+    # Database rows name their title property after the column
+    for title_prop in properties.values():
+        if title_prop.get("type") == "title" and title_prop.get("title"):
+            return "".join(t.get("plain_text", "") for t in title_prop["title"])
+
     # Fallback to page ID if no title found
     return page_id
 
 
-def get_page_as_markdown(page_url: str, api_key: str) -> tuple[str, str]:
+def export_page(
+    page_id: str, api_key: str, cache: NotionPageCache | None = None, client: Client | None = None
+) -> CachedPage:
+    """Export a Notion page to markdown, reusing the cached export if the page was not edited since.
+
+    Checking the cache costs a single `pages.retrieve` call; the block tree is
+    only exported when the page changed. Exports missing blocks whose children
+    could not be listed are returned but not cached.
+
+    Args:
+        page_id: The 32-character page id
+        api_key: Notion integration token
+        cache: Exports of previous runs
+        client: Client shared by the pages of a sync (a new rate-limited client by default)
+    """
+    if client is None:
+        client = create_client(api_key)
+        try:
+            return export_page(page_id, api_key, cache, client)
+        finally:
+            client.close()
+
+    page = cast(dict[str, Any], client.pages.retrieve(page_id=page_id))
+    last_edited_time = page.get("last_edited_time")
+    if cache is not None and (cached := cache.get(page_id, last_edited_time)):
+        return cached
+
+    exported_at = datetime.now(timezone.utc).isoformat()
+    # Convert to markdown with notion2md, listing blocks through our client
+    blocks = BlockChildren(client)
+    convertor = BlockConvertor(Config(block_id=page_id), blocks.as_notion2md_client())
+    # notion2md annotates the list of blocks as a dict
+    top_level_blocks = cast(Any, blocks.get_children(page_id))
+    # Strip images since we can't read them
+    markdown = strip_images(convertor.to_string(top_level_blocks))
+
+    exported = CachedPage(
+        get_title_from_page(page, page_id), markdown, str(last_edited_time), exported_at, blocks.children
+    )
+    if blocks.errors:
+        # Not cached, so the next sync exports the page again instead of reusing a truncated export
+        console.print(
+            f"[yellow]⚠[/yellow] Page {exported.title} exported without some of its blocks: {blocks.errors[0]}"
+        )
+    elif cache is not None and last_edited_time:
+        cache.put(page_id, exported)
+    return exported
+
+
+def get_page_as_markdown(
+    page_url: str, api_key: str, cache: NotionPageCache | None = None, client: Client | None = None
+) -> tuple[str, str]:
     """Fetch a Notion page and convert it to markdown.
 
     Returns:
         Tuple of (title, markdown_content)
     """
     page_id = extract_page_id(page_url)
+    page = export_page(page_id, api_key, cache, client)
+    return page.title, format_page(page.title, page_id, page.markdown)
 
-    # Get page title for the filename
-    client = Client(auth=api_key)
-    title = get_page_title(client, page_id)
-
-    # Export to markdown string using notion2md
-    md_exporter = StringExporter(block_id=page_id, token=api_key)
-    markdown = md_exporter.export()
-
-    # Strip images since we can't read them
-    markdown = strip_images(markdown)
 
-    content = f"""---
+def format_page(title: str, page_id: str, markdown: str) -> str:
+    """Format an exported page as a markdown file with a frontmatter."""
+    return f"""---
 title: {title}
 id: {page_id}
 ---
@@ -112,12 +188,18 @@ id: {page_id}
 {markdown}
 """
 
-    return title, content
-
 
 class NotionSyncProvider(SyncProvider):
     """Provider for syncing Notion pages and databases."""
 
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_NOTION_WORKERS,
+        requests_per_second: float = NOTION_REQUESTS_PER_SECOND,
+    ):
+        self.max_workers = max_workers
+        self.requests_per_second = requests_per_second
+
     @property
     def name(self) -> str:
         return "Notion"
@@ -133,13 +215,27 @@ class NotionSyncProvider(SyncProvider):
     def get_items(self, config: NaoConfig) -> list[NotionConfig]:
         return [config.notion] if config.notion else []
 
-    def sync(self, items: list[NotionConfig], output_path: Path, project_path: Path | None = None) -> SyncResult:
+    def sync(
+        self,
+        items: list[NotionConfig],
+        output_path: Path,
+        project_path: Path | None = None,
+        options: SyncOptions | None = None,
+    ) -> SyncResult:
         """Sync Notion pages to local filesystem as markdown files.
 
         Args:
             items: Notion configuration with pages to sync.
             output_path: Path where synced markdown files should be written.
             project_path: Path to the nao project root.
+            options: Run-wide sync options (unused for Notion).
+
+        Pages are exported in parallel through one client, whose requests are
+        rate limited to what the Notion API allows. In recursive mode, the
+        pages and databases below the configured pages are crawled as well and
+        written as a folder hierarchy. Configured databases are exported as
+        tables under `databases/`, only fetching the rows edited since the
+        previous sync.
 
         Returns:
             SyncResult with statistics about what was synced.
@@ -153,53 +249,200 @@ class NotionSyncProvider(SyncProvider):
         pages_synced = 0
         synced_pages: list[str] = []
         synced_files: set[str] = set()
+        writes = WriteStats()
 
         console.print(f"\n[bold cyan]{self.emoji}  Syncing {self.name}[/bold cyan]")
         console.print(f"[dim]Location:[/dim] {output_path.absolute()}\n")
 
         api_key = notion_config.api_key
-        total_pages = len(notion_config.pages)
-
-        with Progress(
-            SpinnerColumn(style="dim"),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(bar_width=30, style="dim", complete_style="cyan", finished_style="green"),
-            TaskProgressColumn(),
-            console=console,
-            transient=False,
-        ) as progress:
-            task = progress.add_task("Syncing pages", total=total_pages)
-
-            for page_url in notion_config.pages:
-                try:
-                    title, markdown = get_page_as_markdown(page_url, api_key)
-
-                    # Sanitize title for filename
-                    safe_title = re.sub(r"[^\w\s-]", "", title).strip().replace(" ", "-").lower()
-                    filename = f"{safe_title}.md"
-
-                    with open(output_path / filename, "w") as f:
-                        f.write(markdown)
-
-                    pages_synced += 1
-                    synced_pages.append(title)
-                    synced_files.add(filename)
-                    progress.update(task, advance=1, description=f"Synced: {title}")
-                except Exception as e:
-                    console.print(f"[bold red]✗[/bold red] Failed to sync page {page_url}: {e}")
-                    progress.update(task, advance=1)
-
-        # Clean up stale pages
-        removed_count = cleanup_stale_pages(synced_files, output_path, verbose=True)
+        cache = NotionPageCache.for_project(project_path) if project_path is not None else None
+        client = create_client(api_key, TokenBucket(self.requests_per_second))
+
+        try:
+            with Progress(
+                SpinnerColumn(style="dim"),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(bar_width=30, style="dim", complete_style="cyan", finished_style="green"),
+                TaskProgressColumn(),
+                console=console,
+                transient=False,
+            ) as progress:
+                if notion_config.recursive:
+                    synced = self._crawl_pages(notion_config, cache, client, progress)
+                else:
+                    synced = self._export_pages(notion_config, cache, client, progress)
+                if notion_config.databases:
+                    databases, table_files = self._export_databases(
+                        notion_config, client, output_path, project_path, progress
+                    )
+                else:
+                    databases, table_files = [], []
+        finally:
+            client.close()
+
+        for relative_path, title, content in synced:
+            (output_path / relative_path).parent.mkdir(parents=True, exist_ok=True)
+            writes.write(output_path / relative_path, content)
+            pages_synced += 1
+            synced_pages.append(title)
+            synced_files.add(relative_path)
+
+        for relative_path, content in table_files:
+            (output_path / relative_path).parent.mkdir(parents=True, exist_ok=True)
+            writes.write(output_path / relative_path, content)
+            synced_files.add(relative_path)
+
+        # Clean up stale pages: only those written by a previous sync, unless no manifest exists yet
+        manifest = OutputManifest.load(output_path)
+        if manifest.exists:
+            removed_count = manifest.remove_stale(synced_files, verbose=True, label="page")
+        else:
+            removed_count = cleanup_stale_pages(synced_files, output_path, verbose=True)
+        manifest.add(synced_files)
+        manifest.save()
 
         # Build summary
-        summary = f"{pages_synced} pages synced as markdown"
+        summary = f"{pages_synced} pages synced as markdown, {writes.get_summary()}"
+        if notion_config.databases:
+            summary += f", {len(databases)} databases exported"
         if removed_count > 0:
             summary += f", {removed_count} stale removed"
 
         return SyncResult(
             provider_name=self.name,
             items_synced=pages_synced,
-            details={"pages": synced_pages, "removed": removed_count},
+            details={
+                "pages": synced_pages,
+                "databases": [database.title for database in databases],
+                "removed": removed_count,
+            },
             summary=summary,
+            files_written=writes.written,
+            files_unchanged=writes.unchanged,
+        )
+
+    def _export_pages(
+        self, notion_config: NotionConfig, cache: NotionPageCache | None, client: Client, progress: Progress
+    ) -> list[tuple[str, str, str]]:
+        """Export the configured pages in parallel, as files named after their title.
+
+        Returns:
+            (relative path, title, content) of the exported pages, in config order
+        """
+        synced: list[tuple[str, str, str]] = []
+        task = progress.add_task("Syncing pages", total=len(notion_config.pages))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(get_page_as_markdown, page_url, notion_config.api_key, cache, client)
+                for page_url in notion_config.pages
+            ]
+
+            # Pages are reported in config order, as their exports complete
+            for page_url, future in zip(notion_config.pages, futures):
+                try:
+                    title, markdown = future.result()
+                    synced.append((f"{slugify_title(title)}.md", title, markdown))
+                    progress.update(task, advance=1, description=f"Synced: {title}")
+                except Exception as e:
+                    console.print(f"[bold red]✗[/bold red] Failed to sync page {page_url}: {e}")
+                    progress.update(task, advance=1)
+        return synced
+
+    def _crawl_pages(
+        self, notion_config: NotionConfig, cache: NotionPageCache | None, client: Client, progress: Progress
+    ) -> list[tuple[str, str, str]]:
+        """Export the configured pages and the pages and databases below them, as a folder hierarchy.
+
+        Returns:
+            (relative path, title, content) of the exported pages, breadth-first
+        """
+        roots = []
+        for page_url in notion_config.pages:
+            try:
+                roots.append(extract_page_id(page_url))
+            except ValueError as e:
+                console.print(f"[bold red]✗[/bold red] Failed to sync page {page_url}: {e}")
+
+        task = progress.add_task("Crawling pages", total=len(roots))
+        result = crawl(
+            roots,
+            client,
+            lambda page_id: export_page(page_id, notion_config.api_key, cache, client),
+            max_depth=notion_config.max_depth,
+            max_workers=self.max_workers,
+            on_progress=lambda done, discovered: progress.update(task, completed=done, total=discovered),
         )
+        for ref, e in result.errors:
+            console.print(f"[bold red]✗[/bold red] Failed to sync {ref.kind} {ref.title or ref.id}: {e}")
+        return [
+            (page.path.as_posix(), page.title, format_page(page.title, page.id, page.markdown)) for page in result.pages
+        ]
+
+    def _export_databases(
+        self,
+        notion_config: NotionConfig,
+        client: Client,
+        output_path: Path,
+        project_path: Path | None,
+        progress: Progress,
+    ) -> tuple[list[DatabaseExport], list[tuple[str, str]]]:
+        """Export the configured databases in parallel, each as a rows file and a summary.
+
+        Each database is updated from its previous export, found by id in
+        `databases/`. The files of a database that fails to export are kept
+        as they were.
+
+        Returns:
+            The exported databases, and (relative path, content) of their files, in config order
+        """
+        tables_path = output_path / TABLES_DIR
+        previous = find_exports(tables_path)
+        try:
+            rows_base = tables_path.relative_to(project_path) if project_path is not None else tables_path
+        except ValueError:
+            rows_base = tables_path
+
+        def export(database_id: str) -> DatabaseExport:
+            folder = previous.get(database_id)
+            return export_database(client, database_id, read_export(folder) if folder is not None else None)
+
+        exports: list[DatabaseExport] = []
+        files: list[tuple[str, str]] = []
+        names: set[str] = set()
+        task = progress.add_task("Exporting databases", total=len(notion_config.databases))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for database_url in notion_config.databases:
+                try:
+                    futures[database_url] = executor.submit(export, extract_page_id(database_url))
+                except ValueError as e:
+                    console.print(f"[bold red]✗[/bold red] Failed to export database {database_url}: {e}")
+                    progress.update(task, advance=1)
+
+            for database_url, future in futures.items():
+                try:
+                    database = future.result()
+                except Exception as e:
+                    console.print(f"[bold red]✗[/bold red] Failed to export database {database_url}: {e}")
+                    progress.update(task, advance=1)
+                    folder = previous.get(extract_page_id(database_url))
+                    if folder is not None:
+                        for path in (folder / ROWS_FILENAME, folder / SUMMARY_FILENAME):
+                            if path.is_file():
+                                files.append((path.relative_to(output_path).as_posix(), path.read_text()))
+                    continue
+
+                name = slugify_title(database.title) or database.id
+                if name in names:
+                    name = f"{name}-{database.id[:8]}"
+                names.add(name)
+                rows_path = (rows_base / name / ROWS_FILENAME).as_posix()
+                files.append((f"{TABLES_DIR}/{name}/{ROWS_FILENAME}", database.rows_jsonl()))
+                files.append((f"{TABLES_DIR}/{name}/{SUMMARY_FILENAME}", format_summary(database, rows_path)))
+                exports.append(database)
+                progress.update(
+                    task,
+                    advance=1,
+                    description=f"Exported: {database.title} ({database.fetched} rows fetched)",
+                )
+        return exports, files
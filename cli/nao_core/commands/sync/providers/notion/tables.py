@@ -0,0 +1,292 @@
+"""Notion databases exported as tables.
+
+Each configured database is written as a JSON Lines file with one object per
+row and one key per property, flattened to plain values (text, numbers,
+booleans, ISO dates, lists of names), next to a summary markdown describing
+its columns. Agents can read the rows directly or query them with DuckDB:
+
+    SELECT status, count(*) FROM read_json_auto('docs/notion/databases/projects/rows.jsonl') GROUP BY 1
+
+Exports are incremental: only the rows edited since the previous export are
+fetched. Every row is fetched again when the schema of the database changed,
+as that changes rows without changing their `last_edited_time`, and once a
+day, which also drops deleted rows.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from notion_client import Client
+
+from .client import database_schema, normalize_id, query_rows
+from .crawl import get_database_title
+
+TABLES_DIR = "databases"
+ROWS_FILENAME = "rows.jsonl"
+SUMMARY_FILENAME = "summary.md"
+
+ROW_METADATA = ("id", "url", "created_time", "last_edited_time")
+SUMMARY_EXAMPLES = 3
+
+# How often every row is fetched again; deleted rows leave the export then
+FULL_REFRESH_INTERVAL = timedelta(days=1)
+
+
+def _plain_text(rich_text: list[dict[str, Any]] | None) -> str:
+    return "".join(t.get("plain_text", "") for t in rich_text or [])
+
+
+def _user_name(user: dict[str, Any]) -> str | None:
+    return user.get("name") or user.get("id")
+
+
+def property_value(prop: dict[str, Any]) -> Any:
+    """Flatten a Notion property value to a plain JSON value."""
+    prop_type = prop.get("type")
+    value = prop.get(prop_type) if prop_type else None
+    if value is None:
+        return None
+    if prop_type in ("title", "rich_text"):
+        return _plain_text(value)
+    if prop_type in ("select", "status"):
+        return value.get("name")
+    if prop_type == "multi_select":
+        return [option.get("name") for option in value]
+    if prop_type == "date":
+        return value.get("start")
+    if prop_type == "people":
+        return [_user_name(user) for user in value]
+    if prop_type in ("created_by", "last_edited_by"):
+        return _user_name(value)
+    if prop_type == "relation":
+        return [normalize_id(relation["id"]) for relation in value]
+    if prop_type == "files":
+        return [file.get("name") for file in value]
+    if prop_type == "formula":
+        return property_value(value)
+    if prop_type == "rollup":
+        if value.get("type") == "array":
+            return [property_value(item) for item in value.get("array", [])]
+        return property_value(value)
+    if prop_type == "unique_id":
+        prefix = value.get("prefix")
+        return f"{prefix}-{value.get('number')}" if prefix else value.get("number")
+    if prop_type == "verification":
+        return value.get("state")
+    if isinstance(value, dict):
+        return None
+    # number, checkbox, url, email, phone_number, created_time, last_edited_time
+    return value
+
+
+def row_record(page: dict[str, Any], columns: dict[str, str]) -> dict[str, Any]:
+    """Turn a database row (a page object) into a flat record with one key per column."""
+    record: dict[str, Any] = {
+        "id": normalize_id(page["id"]),
+        "url": page.get("url"),
+        "created_time": page.get("created_time"),
+        "last_edited_time": page.get("last_edited_time"),
+    }
+    properties = page.get("properties", {})
+    for name in columns:
+        record.setdefault(name, property_value(properties[name]) if name in properties else None)
+    return record
+
+
+def read_rows(path: Path) -> dict[str, dict[str, Any]]:
+    """Read a previous export, keyed by row id. Returns an empty dict if there is none."""
+    rows: dict[str, dict[str, Any]] = {}
+    try:
+        with path.open() as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                rows[row["id"]] = row
+    except OSError:
+        pass
+    return rows
+
+
+@dataclass
+class PreviousExport:
+    """What a database export needs to know about the previous one."""
+
+    rows: dict[str, dict[str, Any]]
+    """Rows keyed by id"""
+    columns: dict[str, str]
+    refreshed_at: datetime | None
+    """When every row was last fetched"""
+
+
+@dataclass
+class DatabaseExport:
+    """The rows of a database after an export, and what the export fetched."""
+
+    id: str
+    title: str
+    rows: list[dict[str, Any]]
+    columns: dict[str, str]
+    """Property name → Notion property type, from the database schema"""
+    fetched: int
+    """Rows fetched with their properties (all rows on a full refresh)"""
+    removed: int
+    refreshed_at: datetime
+    """When every row was last fetched"""
+
+    def rows_jsonl(self) -> str:
+        return "".join(json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in self.rows)
+
+
+def _needs_full_refresh(previous: PreviousExport | None, columns: dict[str, str], now: datetime) -> bool:
+    if previous is None or not previous.rows or previous.refreshed_at is None:
+        return True
+    return previous.columns != columns or now - previous.refreshed_at >= FULL_REFRESH_INTERVAL
+
+
+def export_database(
+    client: Client,
+    database_id: str,
+    previous: PreviousExport | None = None,
+    now: datetime | None = None,
+) -> DatabaseExport:
+    """Export the rows of a database, only fetching those edited since the previous export.
+
+    Every row is fetched instead on the first export, when the schema of the
+    database changed, or when the last full refresh is older than
+    `FULL_REFRESH_INTERVAL`. Deleted rows are only dropped then.
+
+    Args:
+        client: Notion client
+        database_id: The 32-character database id
+        previous: The previous export of the database
+        now: Time of the export (the current time by default)
+
+    Returns:
+        The rows of the database, ordered by creation time.
+    """
+    now = now or datetime.now(timezone.utc)
+    database: Any = client.databases.retrieve(database_id=database_id)
+    columns = database_schema(client, database)
+
+    if previous is None or _needs_full_refresh(previous, columns, now):
+        pages = query_rows(client, database)
+        rows = {normalize_id(page["id"]): row_record(page, columns) for page in pages}
+        removed = len(previous.rows.keys() - rows.keys()) if previous is not None else 0
+        refreshed_at = now
+    else:
+        since = max(row.get("last_edited_time") or "" for row in previous.rows.values())
+        # Notion rounds last_edited_time to the minute, so rows edited in the minute of the
+        # last export are fetched again rather than missed
+        pages = query_rows(
+            client, database, filter={"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": since}}
+        )
+        rows = dict(previous.rows)
+        rows.update((normalize_id(page["id"]), row_record(page, columns)) for page in pages)
+        removed = 0
+        refreshed_at = previous.refreshed_at or now
+
+    ordered = sorted(rows.values(), key=lambda row: (row.get("created_time") or "", row["id"]))
+    return DatabaseExport(
+        id=database_id,
+        title=get_database_title(database, database_id),
+        rows=ordered,
+        columns=columns,
+        fetched=len(pages),
+        removed=removed,
+        refreshed_at=refreshed_at,
+    )
+
+
+def read_frontmatter(summary_path: Path) -> dict[str, str]:
+    """Read the `key: value` frontmatter of a summary. Returns an empty dict if there is none."""
+    try:
+        lines = summary_path.read_text().splitlines()
+    except OSError:
+        return {}
+    if not lines or lines[0] != "---":
+        return {}
+    frontmatter: dict[str, str] = {}
+    for line in lines[1:]:
+        if line == "---":
+            break
+        key, _, value = line.partition(": ")
+        frontmatter[key] = value
+    return frontmatter
+
+
+def find_exports(tables_path: Path) -> dict[str, Path]:
+    """Find the folders of previous exports, keyed by database id."""
+    exports: dict[str, Path] = {}
+    if tables_path.is_dir():
+        for summary_path in tables_path.glob(f"*/{SUMMARY_FILENAME}"):
+            if database_id := read_frontmatter(summary_path).get("id"):
+                exports[database_id] = summary_path.parent
+    return exports
+
+
+def read_export(folder: Path) -> PreviousExport:
+    """Read the rows, column types and last full refresh of a previous export."""
+    frontmatter = read_frontmatter(folder / SUMMARY_FILENAME)
+    try:
+        columns = json.loads(frontmatter.get("columns", "{}"))
+    except json.JSONDecodeError:
+        columns = {}
+    try:
+        refreshed_at = datetime.fromisoformat(frontmatter["refreshed"])
+    except (KeyError, ValueError):
+        refreshed_at = None
+    return PreviousExport(read_rows(folder / ROWS_FILENAME), columns, refreshed_at)
+
+
+def _format_example(value: Any) -> str:
+    text = ", ".join(str(item) for item in value) if isinstance(value, list) else str(value)
+    text = text.replace("|", "\\|").replace("\n", " ")
+    return text if len(text) <= 40 else f"{text[:37]}..."
+
+
+def format_summary(export: DatabaseExport, rows_path: str) -> str:
+    """Describe an exported database: row count, columns with their types, fill rates and examples.
+
+    Args:
+        export: The exported database
+        rows_path: Path of the rows file, relative to the project (used in the DuckDB example)
+    """
+    lines = [
+        "---",
+        f"title: {export.title}",
+        f"id: {export.id}",
+        f"rows: {len(export.rows)}",
+        f"columns: {json.dumps(export.columns, ensure_ascii=False)}",
+        f"refreshed: {export.refreshed_at.isoformat()}",
+        "---",
+        "",
+        f"# {export.title}",
+        "",
+        f"Notion database with {len(export.rows)} rows, exported to `{ROWS_FILENAME}` (one JSON object per row).",
+        "",
+        "| Column | Type | Filled | Examples |",
+        "|---|---|---|---|",
+    ]
+    for name in (*ROW_METADATA, *(column for column in export.columns if column not in ROW_METADATA)):
+        values = [row.get(name) for row in export.rows]
+        filled = [value for value in values if value not in (None, "", [])]
+        examples = list(dict.fromkeys(_format_example(value) for value in filled))[:SUMMARY_EXAMPLES]
+        column_type = export.columns.get(name, "metadata")
+        lines.append(f"| {name} | {column_type} | {len(filled)}/{len(values)} | {', '.join(examples)} |")
+    lines += [
+        "",
+        "Query it with DuckDB:",
+        "",
+        "```sql",
+        f"SELECT * FROM read_json_auto('{rows_path}')",
+        "```",
+        "",
+    ]
+    return "\n".join(lines)
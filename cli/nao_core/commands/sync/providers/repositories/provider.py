@@ -1,89 +1,161 @@
 """Repository sync provider implementation."""
 
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from rich.console import Console
 
 from nao_core.commands.sync.cleanup import cleanup_stale_repos
+from nao_core.commands.sync.manifest import OutputManifest
 from nao_core.config import NaoConfig
 from nao_core.config.repos import RepoConfig
 
-from ..base import SyncProvider, SyncResult
+from ..base import SyncOptions, SyncProvider, SyncResult
 
 console = Console()
 
 
-def clone_or_pull_repo(repo: RepoConfig, base_path: Path) -> bool:
-    """Clone a repository if it doesn't exist, or pull latest changes if it does.
+# Repositories synced in parallel; each sync is mostly spent waiting on the remote
+DEFAULT_REPO_WORKERS = 8
+
+# Outcomes of a repository sync
+CLONED = "cloned"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+
+
+def _git(args: list[str], cwd: Path | None = None) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=False)
+
+
+def get_remote_head(repo: RepoConfig) -> tuple[str, str] | None:
+    """Get the branch and commit a repository should be synced to, with a single `git ls-remote`.
+
+    Returns:
+        Tuple of (branch, commit sha), or None if the remote could not be read
+    """
+    result = _git(["ls-remote", "--symref", repo.url, f"refs/heads/{repo.branch}" if repo.branch else "HEAD"])
+    if result.returncode != 0:
+        return None
+    branch, sha = repo.branch, None
+    for line in result.stdout.splitlines():
+        ref = line.split("\t", 1)[0]
+        if ref.startswith("ref: refs/heads/"):
+            # The default branch, when syncing the remote HEAD
+            branch = ref.removeprefix("ref: refs/heads/")
+        elif ref and sha is None:
+            sha = ref
+    if branch is None or sha is None:
+        return None
+    return branch, sha
+
+
+def get_local_head(repo_path: Path) -> tuple[str, str] | None:
+    """Get the checked out branch and commit of a local repository."""
+    result = _git(["rev-parse", "HEAD", "--abbrev-ref", "HEAD"], cwd=repo_path)
+    lines = result.stdout.split() if result.returncode == 0 else []
+    if len(lines) != 2:
+        return None
+    sha, branch = lines
+    return branch, sha
+
+
+def _clone_options(repo: RepoConfig) -> list[str]:
+    # Shallow by default; a full history is cloned without file contents, which are loaded on demand
+    return [f"--depth={repo.depth}"] if repo.depth is not None else ["--filter=blob:none"]
+
+
+def _fetch_options(repo: RepoConfig, repo_path: Path) -> list[str]:
+    """Keep the history of an existing clone: only shallow clones are fetched shallow."""
+    result = _git(["rev-parse", "--is-shallow-repository"], cwd=repo_path)
+    if result.stdout.strip() != "true":
+        return []
+    return [f"--depth={repo.depth}"] if repo.depth is not None else ["--unshallow"]
+
+
+def clone_or_pull_repo(repo: RepoConfig, base_path: Path) -> str | None:
+    """Clone a repository if it doesn't exist, or update it if the remote branch moved.
+
+    A `git ls-remote` compares the remote branch with the local checkout first,
+    so an unchanged repository costs one round-trip and no fetch. New clones
+    are shallow (`depth`, 1 by default), or partial when the full history is
+    configured. Updates keep the history of existing full clones; only
+    shallow clones are fetched shallow.
 
     Args:
             repo: Repository configuration
             base_path: Base path where repositories are stored
 
     Returns:
-            True if successful, False otherwise
+            "cloned", "updated" or "unchanged" if successful, None otherwise
     """
     repo_path = base_path / repo.name
 
     try:
         if repo_path.exists():
-            # Repository exists - pull latest changes
+            remote = get_remote_head(repo)
+            if remote is None:
+                console.print(f"  [yellow]⚠[/yellow] Failed to read the remote of {repo.name}")
+                return None
+            if get_local_head(repo_path) == remote:
+                return UNCHANGED
+
+            # Repository exists - fetch the remote branch and check it out
             console.print(f"  [dim]Pulling latest changes for[/dim] {repo.name}")
-
-            result = subprocess.run(
-                ["git", "pull"],
+            branch, _ = remote
+            result = _git(
+                [
+                    "fetch",
+                    *_fetch_options(repo, repo_path),
+                    "origin",
+                    f"+refs/heads/{branch}:refs/remotes/origin/{branch}",
+                ],
                 cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=False,
             )
+            if result.returncode == 0:
+                result = _git(["checkout", "-B", branch, f"refs/remotes/origin/{branch}"], cwd=repo_path)
 
             if result.returncode != 0:
                 console.print(f"  [yellow]⚠[/yellow] Failed to pull {repo.name}: {result.stderr.strip()}")
-                return False
-
-            # If branch is specified, checkout that branch
-            if repo.branch:
-                subprocess.run(
-                    ["git", "checkout", repo.branch],
-                    cwd=repo_path,
-                    capture_output=True,
-                    text=True,
-                    check=False,
-                )
-
-        else:
-            # Repository doesn't exist - clone it
-            console.print(f"  [dim]Cloning[/dim] {repo.name}")
-
-            cmd = ["git", "clone"]
-            if repo.branch:
-                cmd.extend(["-b", repo.branch])
-            cmd.extend([repo.url, str(repo_path)])
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=False,
-            )
+                return None
+            return UPDATED
 
-            if result.returncode != 0:
-                console.print(f"  [yellow]⚠[/yellow] Failed to clone {repo.name}: {result.stderr.strip()}")
-                return False
+        # Repository doesn't exist - clone it
+        console.print(f"  [dim]Cloning[/dim] {repo.name}")
+
+        cmd = ["clone", *_clone_options(repo)]
+        if repo.branch:
+            cmd.extend(["-b", repo.branch])
+        cmd.extend([repo.url, str(repo_path)])
+
+        result = _git(cmd)
 
-        return True
+        if result.returncode != 0:
+            console.print(f"  [yellow]⚠[/yellow] Failed to clone {repo.name}: {result.stderr.strip()}")
+            return None
+
+        return CLONED
 
     except Exception as e:
         console.print(f"  [yellow]⚠[/yellow] Error syncing {repo.name}: {e}")
-        return False
+        return None
+
+
+def _timed_sync(repo: RepoConfig, base_path: Path) -> tuple[str | None, float]:
+    started = time.perf_counter()
+    status = clone_or_pull_repo(repo, base_path)
+    return status, time.perf_counter() - started
 
 
 class RepositorySyncProvider(SyncProvider):
     """Provider for syncing git repositories."""
 
+    def __init__(self, max_workers: int = DEFAULT_REPO_WORKERS):
+        self.max_workers = max_workers
+
     @property
     def name(self) -> str:
         return "Repositories"
@@ -99,36 +171,78 @@ class RepositorySyncProvider(SyncProvider):
     def pre_sync(self, config: NaoConfig, output_path: Path) -> None:
         """
         Always run before syncing.
-        """
 
-        cleanup_stale_repos(config.repos, output_path, verbose=True)
+        Removes the repositories cloned by a previous sync that are no longer
+        configured. Folders nao did not clone are left alone.
+        """
+        manifest = OutputManifest.load(output_path)
+        if not manifest.exists:
+            # Output from before manifests were tracked: fall back to scanning the folder once
+            cleanup_stale_repos(config.repos, output_path, verbose=True)
+            return
+        manifest.remove_stale({repo.name for repo in config.repos}, verbose=True, label="repo")
+        manifest.save()
 
     def get_items(self, config: NaoConfig) -> list[RepoConfig]:
         return config.repos
 
-    def sync(self, items: list[Any], output_path: Path, project_path: Path | None = None) -> SyncResult:
-        """Sync all configured repositories.
+    def sync(
+        self,
+        items: list[Any],
+        output_path: Path,
+        project_path: Path | None = None,
+        options: SyncOptions | None = None,
+    ) -> SyncResult:
+        """Sync all configured repositories, in parallel.
 
         Args:
                 items: List of repository configurations
                 output_path: Base path where repositories are stored
                 project_path: Path to the nao project root (unused for repos)
+                options: Run-wide sync options; `repo_workers` overrides the pool size
 
         Returns:
-                SyncResult with number of successfully synced repositories
+                SyncResult with number of successfully synced repositories, and
+                the outcome and duration of each repository sync in `details["repos"]`
         """
         if not items:
             return SyncResult(provider_name=self.name, items_synced=0)
 
         output_path.mkdir(parents=True, exist_ok=True)
         success_count = 0
+        manifest = OutputManifest.load(output_path)
+        repo_details: dict[str, dict[str, Any]] = {}
 
         console.print(f"\n[bold cyan]{self.emoji} Syncing {self.name}[/bold cyan]")
         console.print(f"[dim]Location:[/dim] {output_path.absolute()}\n")
 
-        for repo in items:
-            if clone_or_pull_repo(repo, output_path):
-                success_count += 1
-                console.print(f"  [green]✓[/green] {repo.name}")
-
-        return SyncResult(provider_name=self.name, items_synced=success_count)
+        max_workers = options.repo_workers if options and options.repo_workers else self.max_workers
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_timed_sync, repo, output_path) for repo in items]
+
+            # Repositories are reported in config order, as their syncs complete
+            for repo, future in zip(items, futures):
+                status, seconds = future.result()
+                repo_details[repo.name] = {"status": status or "failed", "seconds": round(seconds, 2)}
+                if status:
+                    success_count += 1
+                    manifest.add([repo.name])
+                    console.print(f"  [green]✓[/green] {repo.name} [dim]({status}, {seconds:.1f}s)[/dim]")
+
+        manifest.save()
+
+        counts = {
+            status: sum(details["status"] == status for details in repo_details.values())
+            for status in (CLONED, UPDATED, UNCHANGED)
+        }
+        summary = f"{success_count} synced ({', '.join(f'{count} {status}' for status, count in counts.items())})"
+        if repo_details:
+            slowest = max(repo_details, key=lambda name: repo_details[name]["seconds"])
+            summary += f", slowest: {slowest} ({repo_details[slowest]['seconds']:.1f}s)"
+
+        return SyncResult(
+            provider_name=self.name,
+            items_synced=success_count,
+            details={"repos": repo_details},
+            summary=summary,
+        )
@@ -0,0 +1,214 @@
+"""Sharded database sync: split tables across invocations and merge their outputs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+
+from nao_core.config.databases.base import DigestConfig, ForeignKeyColumn
+from nao_core.fs import WriteStats
+
+from .catalog import CATALOG_FILENAME, get_catalog_path, read_catalog, write_catalog
+from .cleanup import DatabaseSyncState
+from .digest import DIGEST_FILENAME, write_digests
+from .joins import JOINS_FILENAME, JoinGraph, build_join_graph, declared_foreign_keys, get_joins_path, write_join_graph
+from .staging import get_staging_path, publish_staged_database
+
+SHARDS_DIR = ".shards"
+SHARD_STATE_SUFFIX = ".shard.json"
+
+_SHARD_DIR_PATTERN = re.compile(r"^(\d+)-of-(\d+)$")
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One of N disjoint slices of the tables to sync (1-based index)."""
+
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, value: str) -> Shard:
+        """Parse a shard spec such as "2/4" (shard 2 of 4).
+
+        Raises:
+            ValueError: If the spec is malformed or the index is out of range.
+        """
+        match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value)
+        if not match:
+            raise ValueError(f"Invalid shard '{value}', expected i/N (e.g. 1/4)")
+        index, count = int(match.group(1)), int(match.group(2))
+        if not 1 <= index <= count:
+            raise ValueError(f"Invalid shard '{value}', index must be between 1 and {count}")
+        return cls(index, count)
+
+    def owns(self, database: str, schema: str, table: str) -> bool:
+        """Check whether a table belongs to this shard.
+
+        Uses a stable hash so every invocation agrees on the split regardless
+        of the order in which tables are listed.
+        """
+        key = f"{database}\x00{schema}\x00{table}".encode()
+        bucket = int.from_bytes(hashlib.sha1(key).digest()[:8], "big") % self.count
+        return bucket == self.index - 1
+
+    @property
+    def dir_name(self) -> str:
+        return f"{self.index}-of-{self.count}"
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def get_shard_base_path(base_path: Path, shard: Shard) -> Path:
+    """Return the folder a shard writes its database output to.
+
+    e.g. databases/ → databases/.shards/2-of-4/
+    """
+    return base_path / SHARDS_DIR / shard.dir_name
+
+
+def get_shard_state_path(db_path: Path) -> Path:
+    """Return the file listing the schemas and tables synced into a shard's database folder."""
+    return db_path.with_name(f"{db_path.name}{SHARD_STATE_SUFFIX}")
+
+
+def write_shard_state(state: DatabaseSyncState) -> None:
+    """Record which schemas and tables a shard synced, for the merge step."""
+    payload = {
+        "schemas": sorted(state.synced_schemas),
+        "tables": {schema: sorted(tables) for schema, tables in sorted(state.synced_tables.items())},
+    }
+    get_shard_state_path(state.db_path).write_text(json.dumps(payload, indent=2))
+
+
+def _find_shard_counts(base_path: Path) -> set[int]:
+    """Return the shard counts of the shard output folders under `base_path`."""
+    shards_root = base_path / SHARDS_DIR
+    if not shards_root.is_dir():
+        return set()
+    return {
+        int(match.group(2))
+        for entry in shards_root.iterdir()
+        if entry.is_dir() and (match := _SHARD_DIR_PATTERN.match(entry.name))
+    }
+
+
+def merge_shards(
+    base_path: Path,
+    relative_db_path: Path,
+    digest: DigestConfig | None = None,
+    title: str | None = None,
+    verbose: bool = False,
+) -> DatabaseSyncState:
+    """Combine the shard outputs of one database into its live folder.
+
+    Every shard's files are staged next to the live tree and published in a
+    single swap, so stale schemas and tables are only removed once all shards
+    have landed. Shard outputs of the database are deleted after publishing.
+
+    Args:
+        base_path: The databases output folder (holding `.shards/`)
+        relative_db_path: e.g. `type=duckdb/database=mydb`
+        digest: Settings of the digests rebuilt from the merged catalog
+        title: Database name used in the digest headings (the folder name by default)
+        verbose: Whether to print messages about stale paths
+
+    Raises:
+        FileNotFoundError: If no shard output exists or some shards are missing.
+    """
+    counts = _find_shard_counts(base_path)
+    if not counts:
+        raise FileNotFoundError(f"No shard outputs found in {base_path / SHARDS_DIR}")
+    if len(counts) > 1:
+        raise FileNotFoundError(f"Shard outputs for different shard counts found: {sorted(counts)}")
+
+    [count] = counts
+    shard_db_paths = {
+        index: get_shard_base_path(base_path, Shard(index, count)) / relative_db_path for index in range(1, count + 1)
+    }
+    missing = [index for index, path in shard_db_paths.items() if not get_shard_state_path(path).exists()]
+    if missing:
+        raise FileNotFoundError(
+            f"Missing shard outputs for {relative_db_path}: {', '.join(f'{i}/{count}' for i in missing)}"
+        )
+
+    db_path = base_path / relative_db_path
+    state = DatabaseSyncState(db_path=db_path)
+    staging_path = get_staging_path(db_path)
+    if staging_path.exists():
+        shutil.rmtree(staging_path)
+    staging_path.mkdir(parents=True)
+
+    schemas: set[str] = set()
+    catalog_entries: list[dict] = []
+    foreign_keys: dict[str, list[ForeignKeyColumn]] = {}
+    for shard_db_path in shard_db_paths.values():
+        shard_state = json.loads(get_shard_state_path(shard_db_path).read_text())
+        schemas.update(shard_state["schemas"])
+        for schema, tables in shard_state["tables"].items():
+            for table in tables:
+                state.add_table(schema, table)
+        catalog_entries.extend(read_catalog(get_catalog_path(shard_db_path)).values())
+        if get_joins_path(shard_db_path).exists():
+            for schema, keys in declared_foreign_keys(JoinGraph.load(get_joins_path(shard_db_path))).items():
+                foreign_keys.setdefault(schema, []).extend(keys)
+        _stage_shard_files(shard_db_path, staging_path, db_path, state.writes)
+    for schema in sorted(schemas):
+        state.add_schema(schema)
+    catalog = write_catalog(
+        get_catalog_path(staging_path), catalog_entries, state.synced_tables, live_path=get_catalog_path(db_path)
+    )
+    write_digests(
+        staging_path,
+        title or db_path.name.removeprefix("database="),
+        catalog,
+        digest or DigestConfig(),
+        live_path=db_path,
+    )
+    write_join_graph(
+        get_joins_path(staging_path),
+        build_join_graph(catalog, foreign_keys, state.synced_tables),
+        live_path=get_joins_path(db_path),
+    )
+
+    state.stale_removed = publish_staged_database(state, staging_path, verbose=verbose)
+
+    for shard_db_path in shard_db_paths.values():
+        get_shard_state_path(shard_db_path).unlink()
+        if shard_db_path.exists():
+            shutil.rmtree(shard_db_path)
+    _remove_empty_dirs(base_path / SHARDS_DIR)
+    return state
+
+
+def _stage_shard_files(shard_db_path: Path, staging_path: Path, live_path: Path, writes: WriteStats) -> None:
+    """Copy a shard's files into the staging tree, reusing identical live files.
+
+    Catalogs, digests and join graphs are skipped here; the merge rebuilds them from all shards.
+    """
+    for path in sorted(shard_db_path.rglob("*")):
+        relative = path.relative_to(shard_db_path)
+        if relative in (Path(CATALOG_FILENAME), Path(JOINS_FILENAME)) or relative.name == DIGEST_FILENAME:
+            continue
+        target = staging_path / relative
+        if path.is_dir():
+            target.mkdir(parents=True, exist_ok=True)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            writes.write(target, path.read_text(), live_path=live_path / relative)
+
+
+def _remove_empty_dirs(path: Path) -> None:
+    """Remove `path` and its subfolders, bottom-up, as long as they are empty."""
+    if not path.is_dir():
+        return
+    for child in path.iterdir():
+        if child.is_dir():
+            _remove_empty_dirs(child)
+    if not any(path.iterdir()):
+        path.rmdir()
@@ -0,0 +1,80 @@
+"""Staging utilities for publishing database sync output atomically."""
+
+from pathlib import Path
+
+from rich.console import Console
+
+from nao_core.fs import link_tree, swap_directory
+
+from .cleanup import DatabaseSyncState
+
+console = Console()
+
+STAGING_SUFFIX = ".staging"
+
+
+def get_staging_path(db_path: Path) -> Path:
+    """Return the sibling staging directory for a database output path.
+
+    e.g. databases/type=duckdb/database=mydb → databases/type=duckdb/.database=mydb.staging
+    """
+    return db_path.with_name(f".{db_path.name}{STAGING_SUFFIX}")
+
+
+def _carry_over(entry: Path, target: Path) -> None:
+    """Link a file that nao does not own from the live tree into the staged tree.
+
+    The live original stays in place, so the user file is never only in the
+    staged tree if the swap fails.
+    """
+    if not target.exists():
+        link_tree(entry, target)
+
+
+def publish_staged_database(state: DatabaseSyncState, staging_path: Path, verbose: bool = False) -> int:
+    """Swap a fully staged database tree in place of the live one.
+
+    Tables and schemas that were not synced are simply absent from the staged
+    tree, so nothing has to be deleted from the live tree while readers may be
+    using it. Entries that are not `schema=`/`table=` directories are hard-linked
+    into the staged tree so user files sitting in the folders survive.
+
+    Args:
+        state: The sync state tracking what was synced
+        staging_path: The staged tree built for `state.db_path`
+        verbose: Whether to print messages about stale paths
+
+    Returns:
+        Number of stale schemas and tables dropped by the swap
+    """
+    live_path = state.db_path
+    removed_count = 0
+
+    if live_path.exists():
+        for entry in live_path.iterdir():
+            if not (entry.is_dir() and entry.name.startswith("schema=")):
+                _carry_over(entry, staging_path / entry.name)
+                continue
+
+            schema_name = entry.name.removeprefix("schema=")
+            if schema_name not in state.synced_schemas:
+                if verbose:
+                    console.print(f"  [dim red]removing stale schema:[/dim red] {schema_name}")
+                removed_count += 1
+                continue
+
+            synced_tables_for_schema = state.synced_tables.get(schema_name, set())
+            for table_entry in entry.iterdir():
+                if not (table_entry.is_dir() and table_entry.name.startswith("table=")):
+                    _carry_over(table_entry, staging_path / entry.name / table_entry.name)
+                    continue
+
+                table_name = table_entry.name.removeprefix("table=")
+                if table_name not in synced_tables_for_schema:
+                    if verbose:
+                        console.print(f"  [dim red]removing stale table:[/dim red] {schema_name}.{table_name}")
+                    removed_count += 1
+
+    staging_path.mkdir(parents=True, exist_ok=True)
+    swap_directory(staging_path, live_path)
+    return removed_count
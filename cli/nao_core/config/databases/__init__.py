@@ -2,7 +2,16 @@ from typing import Annotated, Union
 
 from pydantic import Discriminator, Tag
 
-from .base import DatabaseAccessor, DatabaseConfig, DatabaseType
+from .base import (
+    ColumnProfileConfig,
+    DatabaseAccessor,
+    DatabaseConfig,
+    DatabaseType,
+    DigestConfig,
+    ForeignKeyColumn,
+    PreviewConfig,
+    PreviewStrategy,
+)
 from .bigquery import BigQueryConfig
 from .databricks import DatabricksConfig
 from .duckdb import DuckDBConfig
@@ -66,13 +75,18 @@ __all__ = [
     "AnyDatabaseConfig",
     "BigQueryConfig",
     "DATABASE_CONFIG_CLASSES",
+    "ColumnProfileConfig",
     "DatabaseAccessor",
     "DatabaseConfig",
     "DatabaseType",
+    "DigestConfig",
     "DuckDBConfig",
     "DatabricksConfig",
+    "ForeignKeyColumn",
     "MssqlConfig",
     "SnowflakeConfig",
     "PostgresConfig",
+    "PreviewConfig",
+    "PreviewStrategy",
     "RedshiftConfig",
 ]
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-import fnmatch
 from abc import ABC, abstractmethod
 from enum import Enum
+from typing import Any, ClassVar, NamedTuple
 
+import ibis
 import pandas as pd
 import questionary
 from ibis import BaseBackend
 from pydantic import BaseModel, Field
 
+from .patterns import TableMatcher, get_table_matcher
+
 
 class DatabaseType(str, Enum):
     """Supported database types."""
@@ -33,11 +36,84 @@ class DatabaseAccessor(str, Enum):
     COLUMNS = "columns"
     DESCRIPTION = "description"
     PREVIEW = "preview"
+    PROFILE = "profile"
+
+    @classmethod
+    def defaults(cls) -> list[DatabaseAccessor]:
+        """Accessors rendered when none are configured. `profile` is opt-in."""
+        return [accessor for accessor in cls if accessor is not cls.PROFILE]
+
+
+class ColumnProfileConfig(BaseModel):
+    """Settings for the `profile` accessor (not supported on Redshift yet)."""
+
+    max_columns: int = Field(default=50, description="Maximum number of columns profiled per table")
+    sample_rows: int | None = Field(
+        default=100_000,
+        description="Profile a random sample of about this many rows on larger tables. Null profiles every row.",
+    )
+    top_k: int = Field(default=5, description="Number of most frequent values listed for low-cardinality columns")
+    low_cardinality_threshold: int = Field(
+        default=20,
+        description="Columns with at most this many distinct values get their most frequent values listed",
+    )
+
+
+class PreviewStrategy(str, Enum):
+    """How table previews pick the rows they show."""
+
+    AUTO = "auto"
+    """Use the backend's default strategy"""
+    LIMIT = "limit"
+    """First rows returned by a plain LIMIT query"""
+    SAMPLE = "sample"
+    """Rows from a block-level TABLESAMPLE, which reads only a fraction of the table"""
+    LATEST_PARTITION = "latest_partition"
+    """Rows from the most recent partition, for partitioned tables"""
+
+
+class PreviewConfig(BaseModel):
+    """Settings for the `preview` accessor."""
+
+    strategy: PreviewStrategy = Field(
+        default=PreviewStrategy.AUTO,
+        description="Preview strategy: 'auto', 'limit', 'sample' or 'latest_partition'. Falls back to 'limit'.",
+    )
+    rows: int = Field(default=10, description="Number of rows shown in previews")
+    sample_percent: float = Field(default=1.0, description="Percentage of the table read by the 'sample' strategy")
+    max_columns: int | None = Field(default=50, description="Maximum number of columns shown for wide tables")
+
+
+class DigestConfig(BaseModel):
+    """Settings for the compact per-database and per-schema digests."""
+
+    token_budget: int = Field(
+        default=4000,
+        description="Approximate token budget of each digest. Wide tables lose columns first, then tables are summarized.",
+    )
+    max_columns: int = Field(default=8, description="Maximum number of columns listed per table, key columns first")
+
+
+class ForeignKeyColumn(NamedTuple):
+    """One column pair of a declared foreign key constraint."""
+
+    constraint: str
+    table: str
+    column: str
+    ref_schema: str
+    ref_table: str
+    ref_column: str
 
 
 class DatabaseConfig(BaseModel, ABC):
     """Base configuration for all database backends."""
 
+    case_sensitive_identifiers: ClassVar[bool] = True
+    """Whether include/exclude patterns match schema and table names case-sensitively"""
+
+    default_preview_strategy: ClassVar[PreviewStrategy] = PreviewStrategy.LIMIT
+    """Preview strategy used when `preview.strategy` is 'auto'"""
+
     type: str  # Narrowed to Literal in each subclass for discriminated union
     name: str = Field(description="A friendly name for this connection")
 
@@ -50,8 +126,28 @@ class DatabaseConfig(BaseModel, ABC):
         description="Glob patterns for schemas/tables to exclude (e.g., 'temp_*.*', '*.backup_*')",
     )
     accessors: list[DatabaseAccessor] = Field(
-        default_factory=lambda: list(DatabaseAccessor),
-        description="Which default templates to render per table (e.g., ['columns', 'description']). Defaults to all.",
+        default_factory=DatabaseAccessor.defaults,
+        description="Which default templates to render per table (e.g., ['columns', 'profile']). Defaults to all but 'profile'.",
+    )
+    accessor_timeouts: dict[DatabaseAccessor, float] = Field(
+        default_factory=dict,
+        description="Time budget in seconds per accessor and table (e.g., {'preview': 30}). Overruns produce degraded output.",
+    )
+    sync_deadline: float | None = Field(
+        default=None,
+        description="Time budget in seconds for syncing the whole database. Tables not reached keep their previous output.",
+    )
+    preview: PreviewConfig = Field(
+        default_factory=PreviewConfig,
+        description="Strategy, row count and column cap for the 'preview' accessor",
+    )
+    column_profile: ColumnProfileConfig = Field(
+        default_factory=ColumnProfileConfig,
+        description="Sampling and column caps for the 'profile' accessor",
+    )
+    digest: DigestConfig = Field(
+        default_factory=DigestConfig,
+        description="Token budget and column cap of the digest.md files summarizing the database",
     )
 
     @classmethod
@@ -65,9 +161,19 @@ class DatabaseConfig(BaseModel, ABC):
         """Create an Ibis connection for this database."""
         ...
 
-    def execute_sql(self, sql: str) -> pd.DataFrame:
-        """Execute arbitrary SQL and return results as a DataFrame."""
-        conn = self.connect()
+    def interrupt(self, conn: BaseBackend) -> None:
+        """Cancel the query running on a connection. Override in subclasses whose driver supports it."""
+        return None
+
+    def execute_sql(self, sql: str, conn: BaseBackend | None = None) -> pd.DataFrame:
+        """Execute arbitrary SQL and return results as a DataFrame.
+
+        Args:
+            sql: The query to run
+            conn: An open connection to reuse; a new one is created if omitted.
+        """
+        if conn is None:
+            conn = self.connect()
         cursor = conn.raw_sql(sql)  # type: ignore[union-attr]
 
         if hasattr(cursor, "fetchdf"):
@@ -78,6 +184,11 @@ class DatabaseConfig(BaseModel, ABC):
         columns: list[str] = [desc[0] for desc in cursor.description]
         return pd.DataFrame(cursor.fetchall(), columns=columns)  # type: ignore[arg-type]
 
+    @property
+    def table_matcher(self) -> TableMatcher:
+        """The include/exclude patterns compiled into a single matcher."""
+        return get_table_matcher(tuple(self.include), tuple(self.exclude), self.case_sensitive_identifiers)
+
     def matches_pattern(self, schema: str, table: str) -> bool:
         """Check if a schema.table matches the include/exclude patterns.
 
@@ -88,21 +199,20 @@ class DatabaseConfig(BaseModel, ABC):
         Returns:
             True if the table should be included, False if excluded
         """
-        full_name = f"{schema}.{table}"
+        return self.table_matcher.matches(schema, table)
+
+    def matches_schema(self, schema: str) -> bool:
+        """Check if any table of a schema could match the include/exclude patterns.
 
-        # If include patterns exist, table must match at least one
-        if self.include:
-            included = any(fnmatch.fnmatch(full_name, pattern) for pattern in self.include)
-            if not included:
-                return False
+        Used to skip listing the tables of schemas that are excluded as a whole.
 
-        # If exclude patterns exist, table must not match any
-        if self.exclude:
-            excluded = any(fnmatch.fnmatch(full_name, pattern) for pattern in self.exclude)
-            if excluded:
-                return False
+        Args:
+            schema: The schema/dataset name
 
-        return True
+        Returns:
+            False if no table of the schema can be included, True otherwise
+        """
+        return self.table_matcher.matches_schema(schema)
 
     @abstractmethod
     def get_database_name(self) -> str:
@@ -116,6 +226,41 @@ class DatabaseConfig(BaseModel, ABC):
             return list_databases()
         return []
 
+    def find_latest_partition(self, conn: BaseBackend, schema: str, table_name: str) -> tuple[str, Any] | None:
+        """Find the partition column of a table and the lower bound of its latest partition.
+
+        Returns None for unpartitioned tables or backends without partition metadata.
+        """
+        return None
+
+    def get_preview_plan(
+        self, conn: BaseBackend, schema: str, table_name: str, table: ibis.Table, limit: int
+    ) -> list[ibis.Table]:
+        """Build the preview queries to try in order, ending with a plain LIMIT fallback."""
+        strategy = self.preview.strategy
+        if strategy == PreviewStrategy.AUTO:
+            strategy = self.default_preview_strategy
+
+        columns = table.columns
+        if self.preview.max_columns is not None:
+            columns = columns[: self.preview.max_columns]
+
+        plan: list[ibis.Table] = []
+        if strategy == PreviewStrategy.LATEST_PARTITION:
+            try:
+                partition = self.find_latest_partition(conn, schema, table_name)
+            except Exception:
+                partition = None
+            if partition is not None:
+                column, start = partition
+                plan.append(table.filter(table[column] >= start).select(*columns).limit(limit))
+        elif strategy == PreviewStrategy.SAMPLE:
+            sampled = table.sample(self.preview.sample_percent / 100, method="block")
+            plan.append(sampled.select(*columns).limit(limit))
+
+        plan.append(table.select(*columns).limit(limit))
+        return plan
+
     def fetch_table_description(self, conn: BaseBackend, schema: str, table_name: str) -> str | None:
         """Fetch the table description/comment from the warehouse metadata."""
         return None
@@ -124,6 +269,31 @@ class DatabaseConfig(BaseModel, ABC):
         """Fetch column descriptions/comments from the warehouse metadata."""
         return {}
 
+    def fetch_foreign_keys(self, conn: BaseBackend, schema: str) -> list[ForeignKeyColumn]:
+        """Fetch the declared foreign keys of the tables of a schema.
+
+        Uses the standard `information_schema` views, which most warehouses
+        implement. Returns an empty list when constraints are not available.
+        """
+        try:
+            query = f"""
+                SELECT rc.constraint_name, kcu.table_name, kcu.column_name,
+                       ref.table_schema, ref.table_name, ref.column_name
+                FROM information_schema.referential_constraints rc
+                JOIN information_schema.key_column_usage kcu
+                  ON kcu.constraint_schema = rc.constraint_schema AND kcu.constraint_name = rc.constraint_name
+                JOIN information_schema.key_column_usage ref
+                  ON ref.constraint_schema = rc.unique_constraint_schema
+                 AND ref.constraint_name = rc.unique_constraint_name
+                 AND ref.ordinal_position = kcu.position_in_unique_constraint
+                WHERE kcu.table_schema = '{schema}'
+                ORDER BY kcu.table_name, rc.constraint_name, kcu.ordinal_position
+            """
+            rows = conn.raw_sql(query).fetchall()  # type: ignore[union-attr]
+            return [ForeignKeyColumn(*(str(value) for value in row)) for row in rows]
+        except Exception:
+            return []
+
     def check_connection(self) -> tuple[bool, str]:
         """Test connectivity to the database. Override in subclasses for custom behavior."""
         try:
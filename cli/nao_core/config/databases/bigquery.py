@@ -1,5 +1,6 @@
 import json
-from typing import Literal
+from datetime import datetime
+from typing import Any, ClassVar, Literal
 
 import ibis
 from ibis import BaseBackend
@@ -7,12 +8,29 @@ from pydantic import Field, field_validator
 
 from nao_core.ui import ask_select, ask_text
 
-from .base import DatabaseConfig
+from .base import DatabaseConfig, ForeignKeyColumn, PreviewStrategy
+
+
+def _parse_partition_id(partition_id: str, data_type: str) -> Any:
+    """Convert a BigQuery partition id into the lower bound of its partition.
+
+    Time-unit partition ids are YYYY, YYYYMM, YYYYMMDD or YYYYMMDDHH; integer
+    range partition ids are the start of the range.
+    """
+    if data_type.upper() == "INT64":
+        return int(partition_id)
+
+    formats = {4: "%Y", 6: "%Y%m", 8: "%Y%m%d", 10: "%Y%m%d%H"}
+    start = datetime.strptime(partition_id, formats[len(partition_id)])
+    return start.date() if data_type.upper() == "DATE" else start
 
 
 class BigQueryConfig(DatabaseConfig):
     """BigQuery-specific configuration."""
 
+    # Plain LIMIT queries scan the whole table and fail under require_partition_filter
+    default_preview_strategy: ClassVar[PreviewStrategy] = PreviewStrategy.LATEST_PARTITION
+
     type: Literal["bigquery"] = "bigquery"
     project_id: str = Field(description="GCP project ID")
     dataset_id: str | None = Field(default=None, description="Default BigQuery dataset")
@@ -113,6 +131,20 @@ class BigQueryConfig(DatabaseConfig):
         list_databases = getattr(conn, "list_databases", None)
         return list_databases() if list_databases else []
 
+    def find_latest_partition(self, conn: BaseBackend, schema: str, table_name: str) -> tuple[str, Any] | None:
+        query = f"""
+            SELECT c.column_name, c.data_type, p.partition_id
+            FROM `{self.project_id}.{schema}.INFORMATION_SCHEMA.COLUMNS` c
+            JOIN `{self.project_id}.{schema}.INFORMATION_SCHEMA.PARTITIONS` p ON p.table_name = c.table_name
+            WHERE c.table_name = '{table_name}' AND c.is_partitioning_column = 'YES'
+              AND p.partition_id NOT IN ('__NULL__', '__UNPARTITIONED__')
+            ORDER BY SAFE_CAST(p.partition_id AS INT64) DESC
+            LIMIT 1
+        """
+        for row in conn.raw_sql(query):  # type: ignore[union-attr]
+            return row[0], _parse_partition_id(row[2], row[1])
+        return None
+
     def fetch_table_description(self, conn: BaseBackend, schema: str, table_name: str) -> str | None:
         try:
             query = f"""
@@ -139,6 +171,25 @@ class BigQueryConfig(DatabaseConfig):
         except Exception:
             return {}
 
+    def fetch_foreign_keys(self, conn: BaseBackend, schema: str) -> list[ForeignKeyColumn]:
+        # Referenced columns are paired through the primary key of the referenced table (same dataset only)
+        dataset = f"`{self.project_id}.{schema}.INFORMATION_SCHEMA"
+        try:
+            query = f"""
+                SELECT k.constraint_name, k.table_name, k.column_name, c.table_schema, c.table_name, c.column_name
+                FROM {dataset}.TABLE_CONSTRAINTS` t
+                JOIN {dataset}.KEY_COLUMN_USAGE` k ON k.constraint_name = t.constraint_name
+                JOIN {dataset}.CONSTRAINT_COLUMN_USAGE` c ON c.constraint_name = t.constraint_name
+                JOIN {dataset}.KEY_COLUMN_USAGE` pk
+                  ON pk.table_name = c.table_name AND pk.column_name = c.column_name
+                 AND pk.ordinal_position = k.position_in_unique_constraint
+                WHERE t.constraint_type = 'FOREIGN KEY'
+                ORDER BY k.table_name, k.constraint_name, k.ordinal_position
+            """
+            return [ForeignKeyColumn(*(str(value) for value in row)) for row in conn.raw_sql(query)]  # type: ignore[union-attr]
+        except Exception:
+            return []
+
     def check_connection(self) -> tuple[bool, str]:
         """Test connectivity to BigQuery."""
         try:
@@ -1,5 +1,5 @@
 import os
-from typing import Literal
+from typing import Any, ClassVar, Literal
 
 import certifi
 import ibis
@@ -8,7 +8,7 @@ from pydantic import Field
 
 from nao_core.ui import ask_text
 
-from .base import DatabaseConfig
+from .base import DatabaseConfig, PreviewStrategy
 
 # Ensure Python uses certifi's CA bundle for SSL verification.
 # This fixes "certificate verify failed" errors when Python's default CA path is empty.
@@ -19,6 +19,9 @@ os.environ.setdefault("REQUESTS_CA_BUNDLE", certifi.where())
 class DatabricksConfig(DatabaseConfig):
     """Databricks-specific configuration."""
 
+    # Previewing the latest partition avoids scanning every partition of large Delta tables
+    default_preview_strategy: ClassVar[PreviewStrategy] = PreviewStrategy.LATEST_PARTITION
+
     type: Literal["databricks"] = "databricks"
     server_hostname: str = Field(description="Databricks server hostname (e.g., 'adb-xxxx.azuredatabricks.net')")
     http_path: str = Field(description="HTTP path to the SQL warehouse or cluster")
@@ -74,6 +77,24 @@ class DatabricksConfig(DatabaseConfig):
         list_databases = getattr(conn, "list_databases", None)
         return list_databases() if list_databases else []
 
+    def find_latest_partition(self, conn: BaseBackend, schema: str, table_name: str) -> tuple[str, Any] | None:
+        query = f"""
+            SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = '{schema}' AND TABLE_NAME = '{table_name}' AND PARTITION_INDEX IS NOT NULL
+            ORDER BY PARTITION_INDEX
+            LIMIT 1
+        """
+        row = conn.raw_sql(query).fetchone()  # type: ignore[union-attr]
+        if not row:
+            return None
+
+        column = row[0]
+        # Delta answers MAX over a partition column from its metadata
+        latest = conn.raw_sql(f"SELECT MAX(`{column}`) FROM `{schema}`.`{table_name}`").fetchone()  # type: ignore[union-attr]
+        if not latest or latest[0] is None:
+            return None
+        return column, latest[0]
+
     def fetch_table_description(self, conn: BaseBackend, schema: str, table_name: str) -> str | None:
         try:
             query = f"""
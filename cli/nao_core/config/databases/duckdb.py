@@ -31,6 +31,11 @@ class DuckDBConfig(DatabaseConfig):
             read_only=False if self.path == ":memory:" else True,
         )
 
+    def interrupt(self, conn: BaseBackend) -> None:
+        """Interrupt the query running on a DuckDB connection."""
+        if (driver := getattr(conn, "con", None)) is not None:
+            driver.interrupt()
+
     def get_database_name(self) -> str:
         """Get the database name for DuckDB."""
         if self.path == ":memory:":
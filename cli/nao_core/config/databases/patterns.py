@@ -0,0 +1,105 @@
+"""Compiled include/exclude matching for `schema.table` names."""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+WILDCARDS = "*?["
+
+
+def _compile(patterns: tuple[str, ...], case_sensitive: bool) -> re.Pattern[str] | None:
+    """Combine glob patterns into a single regex, or None if there are none."""
+    if not patterns:
+        return None
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns), flags)
+
+
+def _split_schema(pattern: str) -> str | None:
+    """Return the part of a pattern before its first literal `.`, if any."""
+    in_brackets = False
+    for i, char in enumerate(pattern):
+        if char == "[":
+            in_brackets = True
+        elif char == "]":
+            in_brackets = False
+        elif char == "." and not in_brackets:
+            return pattern[:i]
+    return None
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Return the part of a pattern before its first wildcard."""
+    for i, char in enumerate(pattern):
+        if char in WILDCARDS:
+            return pattern[:i]
+    return pattern
+
+
+def _schema_may_include(schema: str, pattern: str) -> bool:
+    """Check whether some table of `schema` could match an include pattern.
+
+    Conservative: only returns False when no `schema.table` name can match.
+    """
+    if "." in schema:
+        return True
+
+    schema_pattern = _split_schema(pattern)
+    if schema_pattern is not None:
+        # Table names hold no dot, so the literal dot must separate schema and table
+        return fnmatch.fnmatchcase(schema, schema_pattern)
+
+    # The whole pattern must span the dot; compare against its literal prefix
+    prefix = _literal_prefix(pattern)
+    schema_prefix = f"{schema}."
+    return schema_prefix.startswith(prefix) or prefix.startswith(schema_prefix)
+
+
+def _schema_fully_excluded(schema: str, pattern: str) -> bool:
+    """Check whether an exclude pattern matches every table of `schema`."""
+    # A trailing `*` absorbs any table name once the pattern matches the "schema." prefix
+    return pattern.endswith("*") and fnmatch.fnmatchcase(f"{schema}.", pattern)
+
+
+@dataclass(frozen=True)
+class TableMatcher:
+    """Include/exclude patterns compiled once and reused for every table."""
+
+    include: tuple[str, ...]
+    exclude: tuple[str, ...]
+    case_sensitive: bool = True
+    _include_regex: re.Pattern[str] | None = field(init=False, repr=False, compare=False)
+    _exclude_regex: re.Pattern[str] | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_include_regex", _compile(self.include, self.case_sensitive))
+        object.__setattr__(self, "_exclude_regex", _compile(self.exclude, self.case_sensitive))
+
+    def matches(self, schema: str, table: str) -> bool:
+        """Check if a schema.table matches the include/exclude patterns."""
+        full_name = f"{schema}.{table}"
+
+        if self._include_regex is not None and not self._include_regex.match(full_name):
+            return False
+        return self._exclude_regex is None or not self._exclude_regex.match(full_name)
+
+    def matches_schema(self, schema: str) -> bool:
+        """Check if any table of a schema could match, without listing its tables."""
+        include, exclude = self.include, self.exclude
+        if not self.case_sensitive:
+            schema = schema.lower()
+            include = tuple(p.lower() for p in include)
+            exclude = tuple(p.lower() for p in exclude)
+
+        if include and not any(_schema_may_include(schema, pattern) for pattern in include):
+            return False
+        return not any(_schema_fully_excluded(schema, pattern) for pattern in exclude)
+
+
+@lru_cache(maxsize=128)
+def get_table_matcher(include: tuple[str, ...], exclude: tuple[str, ...], case_sensitive: bool = True) -> TableMatcher:
+    """Get the compiled matcher for a set of patterns, shared by all configs using them."""
+    return TableMatcher(include, exclude, case_sensitive)
@@ -64,6 +64,11 @@ class PostgresConfig(DatabaseConfig):
             **kwargs,
         )
 
+    def interrupt(self, conn: BaseBackend) -> None:
+        """Cancel the query running on a PostgreSQL connection."""
+        if (driver := getattr(conn, "con", None)) is not None:
+            driver.cancel()
+
     def get_database_name(self) -> str:
         """Get the database name for Postgres."""
         return self.database
@@ -7,13 +7,19 @@ from pydantic import BaseModel, Field
 from sshtunnel import SSHTunnelForwarder
 
 from nao_core.config.exceptions import InitError
+from nao_core.memo import MemoizedContext, memoized
 from nao_core.ui import ask_confirm, ask_text
 
 from .base import DatabaseConfig
 
 
-class RedshiftDatabaseContext:
-    """Redshift-specific context that bypasses Ibis's problematic pg_enum queries."""
+class RedshiftDatabaseContext(MemoizedContext):
+    """Redshift-specific context that bypasses Ibis's problematic pg_enum queries.
+
+    Accessors are memoized like those of `DatabaseContext`, so e.g. `preview()`
+    reuses the column list already fetched by `columns()`. The `profile`
+    accessor is not supported yet: its aggregate query is built with Ibis.
+    """
 
     def __init__(self, conn: BaseBackend, schema: str, table_name: str):
         self._conn = conn
@@ -27,6 +33,7 @@ class RedshiftDatabaseContext:
             self._table_ref = self._conn.table(self._table_name, database=self._schema)
         return self._table_ref
 
+    @memoized
     def columns(self) -> list[dict[str, Any]]:
         """Return column metadata by querying information_schema directly."""
         col_descs = self._fetch_column_descriptions()
@@ -100,6 +107,7 @@ class RedshiftDatabaseContext:
             return f"{ibis_type} NOT NULL"
         return ibis_type
 
+    @memoized
     def preview(self, limit: int = 10) -> list[dict[str, Any]]:
         """Return the first N rows as a list of dictionaries."""
         # Use raw SQL to avoid Ibis's pg_enum queries
@@ -122,6 +130,7 @@ class RedshiftDatabaseContext:
             rows.append(row_dict)
         return rows
 
+    @memoized
     def row_count(self) -> int:
         """Return the total number of rows in the table."""
         # Use raw SQL to avoid Ibis's pg_enum queries
@@ -129,10 +138,16 @@ class RedshiftDatabaseContext:
         result = self._conn.raw_sql(query).fetchone()  # type: ignore[union-attr]
         return result[0] if result else 0
 
+    @memoized
     def column_count(self) -> int:
         """Return the number of columns in the table."""
         return len(self.columns())
 
+    def profile(self) -> dict[str, Any]:
+        """Not supported on Redshift, whose profile would need raw SQL like the other accessors."""
+        raise NotImplementedError("the profile accessor is not supported on Redshift")
+
+    @memoized
     def _fetch_column_descriptions(self) -> dict[str, str]:
         """Fetch column descriptions from pg_catalog."""
         try:
@@ -149,6 +164,7 @@ class RedshiftDatabaseContext:
         except Exception:
             return {}
 
+    @memoized
     def description(self) -> str | None:
         """Return the table description from pg_catalog."""
         try:
@@ -1,5 +1,5 @@
 import os
-from typing import Literal
+from typing import ClassVar, Literal
 
 import ibis
 from cryptography.hazmat.backends import default_backend
@@ -10,12 +10,15 @@ from pydantic import Field
 from nao_core.config.exceptions import InitError
 from nao_core.ui import UI, ask_confirm, ask_text
 
-from .base import DatabaseConfig
+from .base import DatabaseConfig, ForeignKeyColumn
 
 
 class SnowflakeConfig(DatabaseConfig):
     """Snowflake-specific configuration."""
 
+    # Snowflake identifier matching is case-insensitive
+    case_sensitive_identifiers: ClassVar[bool] = False
+
     type: Literal["snowflake"] = "snowflake"
     username: str = Field(description="Snowflake username")
     account_id: str = Field(description="Snowflake account identifier (e.g., 'xy12345.us-east-1')")
@@ -119,30 +122,6 @@ class SnowflakeConfig(DatabaseConfig):
         """Get the database name for Snowflake."""
         return self.database
 
-    def matches_pattern(self, schema: str, table: str) -> bool:
-        """Check if a schema.table matches the include/exclude patterns.
-
-        Snowflake identifier matching is case-insensitive.
-        """
-        from fnmatch import fnmatch
-
-        full_name = f"{schema}.{table}"
-        full_name_lower = full_name.lower()
-
-        # If include patterns exist, table must match at least one
-        if self.include:
-            included = any(fnmatch(full_name_lower, pattern.lower()) for pattern in self.include)
-            if not included:
-                return False
-
-        # If exclude patterns exist, table must not match any
-        if self.exclude:
-            excluded = any(fnmatch(full_name_lower, pattern.lower()) for pattern in self.exclude)
-            if excluded:
-                return False
-
-        return True
-
     def get_schemas(self, conn: BaseBackend) -> list[str]:
         if self.schema_name:
             # Snowflake schema names are case-insensitive but stored as uppercase
@@ -177,6 +156,19 @@ class SnowflakeConfig(DatabaseConfig):
         except Exception:
             return {}
 
+    def fetch_foreign_keys(self, conn: BaseBackend, schema: str) -> list[ForeignKeyColumn]:
+        # Snowflake's INFORMATION_SCHEMA has no key column views, constraints are listed with SHOW
+        try:
+            rows = conn.raw_sql(f'SHOW IMPORTED KEYS IN SCHEMA "{self.database}"."{schema}"').fetchall()  # type: ignore[union-attr]
+            # Columns: created_on, pk_database_name, pk_schema_name, pk_table_name, pk_column_name,
+            # fk_database_name, fk_schema_name, fk_table_name, fk_column_name, key_sequence, ..., fk_name
+            return [
+                ForeignKeyColumn(str(row[12]), str(row[7]), str(row[8]), str(row[2]), str(row[3]), str(row[4]))
+                for row in sorted(rows, key=lambda row: (row[7], row[12], row[9]))
+            ]
+        except Exception:
+            return []
+
     def check_connection(self) -> tuple[bool, str]:
         """Test connectivity to Snowflake."""
         try:
@@ -8,6 +8,19 @@ class NotionConfig(BaseModel):
 
     api_key: str = Field(description="The API key to use")
     pages: list[str] = Field(description="The pages to sync")
+    recursive: bool = Field(
+        default=False,
+        description="Also sync the child pages, linked pages and databases of the listed pages, as a folder hierarchy",
+    )
+    max_depth: int = Field(
+        default=3,
+        ge=0,
+        description="How many levels of child pages and databases to follow below the listed pages in recursive mode",
+    )
+    databases: list[str] = Field(
+        default_factory=list,
+        description="Databases to export as tables (one JSON object per row) with a summary of their columns",
+    )
 
     @classmethod
     def promptConfig(cls) -> "NotionConfig":
@@ -11,6 +11,11 @@ class RepoConfig(BaseModel):
     name: str = Field(description="The name of the repository")
     url: str = Field(description="The URL of the repository")
     branch: Optional[str] = Field(default=None, description="The branch of the repository")
+    depth: int | None = Field(
+        default=1,
+        ge=1,
+        description="Number of commits of history to fetch (null fetches the full history, without file contents)",
+    )
 
     @classmethod
     def promptConfig(cls) -> "RepoConfig":
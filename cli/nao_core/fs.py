@@ -0,0 +1,159 @@
+"""Filesystem helpers shared by sync providers and template rendering."""
+
+import ctypes
+import os
+import shutil
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+PROJECT_STATE_DIR = ".nao"
+
+
+def get_project_state_dir(project_path: Path) -> Path:
+    """Return the folder holding nao's caches and run state inside a project."""
+    return project_path / PROJECT_STATE_DIR
+
+
+def _has_content(path: Path, data: bytes) -> bool:
+    """Check whether a file exists and holds exactly the given bytes."""
+    try:
+        # Cheap size check first so changed files are detected without reading them
+        return path.stat().st_size == len(data) and path.read_bytes() == data
+    except OSError:
+        return False
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write content to a file unless it already holds the exact same bytes.
+
+    Skipping identical writes keeps file mtimes stable, which avoids invalidating
+    downstream caches and keeps git-based context distribution diffs small.
+
+    Args:
+        path: Destination file path.
+        content: Text content to write (encoded as UTF-8).
+
+    Returns:
+        True if the file was written, False if it was left untouched.
+    """
+    data = content.encode("utf-8")
+    if _has_content(path, data):
+        return False
+
+    path.write_bytes(data)
+    return True
+
+
+def stage_file(path: Path, content: str, live_path: Path) -> bool:
+    """Write content to a staging path, reusing the live file when it is identical.
+
+    Unchanged files are hard-linked from the live tree (falling back to a copy
+    that preserves mtime) so swapping the staged tree in stays cheap.
+
+    Args:
+        path: Destination path inside the staging directory.
+        content: Text content to write (encoded as UTF-8).
+        live_path: Path of the same file in the currently published tree.
+
+    Returns:
+        True if new content was written, False if the live file was reused.
+    """
+    data = content.encode("utf-8")
+    if _has_content(live_path, data):
+        _link_or_copy(str(live_path), str(path))
+        return False
+
+    path.write_bytes(data)
+    return True
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def link_tree(src: Path, dst: Path) -> None:
+    """Recreate a file or directory tree at `dst` by hard-linking the files of `src`."""
+    if not src.is_dir():
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        _link_or_copy(str(src), str(dst))
+        return
+    shutil.copytree(src, dst, copy_function=_link_or_copy, dirs_exist_ok=True)
+
+
+def _exchange_paths(first: Path, second: Path) -> bool:
+    """Atomically exchange two paths using the OS primitive, if available."""
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        if sys.platform == "linux":
+            at_fdcwd, rename_exchange = -100, 2
+            result = libc.renameat2(at_fdcwd, bytes(first), at_fdcwd, bytes(second), rename_exchange)
+        elif sys.platform == "darwin":
+            rename_swap = 2
+            result = libc.renamex_np(bytes(first), bytes(second), rename_swap)
+        else:
+            return False
+    except (OSError, AttributeError):
+        return False
+    return result == 0
+
+
+def swap_directory(staging_path: Path, live_path: Path) -> None:
+    """Publish a staged directory in place of the live one.
+
+    Uses an atomic exchange where the platform supports it, so readers see
+    either the previous tree or the new one and never a mix of both. Falls
+    back to two renames elsewhere. The previous tree is deleted afterwards.
+    """
+    if not live_path.exists():
+        live_path.parent.mkdir(parents=True, exist_ok=True)
+        staging_path.rename(live_path)
+        return
+
+    if _exchange_paths(staging_path, live_path):
+        shutil.rmtree(staging_path)
+        return
+
+    backup_path = live_path.with_name(f".{live_path.name}.old")
+    if backup_path.exists():
+        shutil.rmtree(backup_path)
+    live_path.rename(backup_path)
+    staging_path.rename(live_path)
+    shutil.rmtree(backup_path)
+
+
+@dataclass
+class WriteStats:
+    """Counts of written vs. unchanged files during a sync or render run."""
+
+    written: int = 0
+    unchanged: int = 0
+
+    def write(self, path: Path, content: str, live_path: Path | None = None) -> bool:
+        """Write content if it changed and record the outcome.
+
+        Args:
+            path: Destination file path.
+            content: Text content to write.
+            live_path: When writing into a staging directory, the published
+                counterpart of `path` to compare against and reuse.
+
+        Returns:
+            True if the file was written, False if it was unchanged.
+        """
+        if live_path is None:
+            changed = write_if_changed(path, content)
+        else:
+            changed = stage_file(path, content, live_path)
+        if changed:
+            self.written += 1
+        else:
+            self.unchanged += 1
+        return changed
+
+    def get_summary(self) -> str:
+        """Get a human-readable summary of the write counts."""
+        return f"{self.written} files written, {self.unchanged} unchanged"
@@ -0,0 +1,61 @@
+"""`.naoignore` patterns, matched the same way as the chat agent's file tools."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePosixPath
+
+NAOIGNORE_FILENAME = ".naoignore"
+
+
+def _glob_matches(relative_path: str, pattern: str) -> bool:
+    """Match a glob against the path, its file name or any of its directories.
+
+    Equivalent to matching `pattern`, `**/pattern` and `**/pattern/**`: some
+    contiguous run of path segments has to match the pattern.
+    """
+    parts = PurePosixPath(relative_path).parts
+    return any(
+        fnmatchcase("/".join(parts[start:end]), pattern)
+        for start in range(len(parts))
+        for end in range(start + 1, len(parts) + 1)
+    )
+
+
+@dataclass(frozen=True)
+class NaoIgnore:
+    """Patterns of files that are hidden from the agent (and from nao's indexes)."""
+
+    patterns: tuple[str, ...] = ()
+
+    @classmethod
+    def load(cls, project_path: Path) -> NaoIgnore:
+        """Read the `.naoignore` file of a project, ignoring blank lines and comments."""
+        try:
+            content = (project_path / NAOIGNORE_FILENAME).read_text()
+        except OSError:
+            return cls()
+        lines = (line.strip() for line in content.splitlines())
+        return cls(tuple(line for line in lines if line and not line.startswith("#")))
+
+    def matches(self, relative_path: str) -> bool:
+        """Check whether a path relative to the project root is ignored.
+
+        Patterns ending with `/` ignore a directory wherever it appears; other
+        patterns are globs matched against the full path, the file name or any
+        directory of the path.
+        """
+        relative_path = relative_path.lstrip("/")
+        for pattern in self.patterns:
+            if pattern.endswith("/"):
+                directory = pattern[:-1]
+                if (
+                    relative_path == directory
+                    or relative_path.startswith(f"{directory}/")
+                    or directory in PurePosixPath(relative_path).parts
+                ):
+                    return True
+            elif _glob_matches(relative_path, pattern):
+                return True
+        return False
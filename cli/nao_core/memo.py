@@ -0,0 +1,68 @@
+"""Per-instance memoization for the context objects exposed to templates."""
+
+import copy
+import functools
+import inspect
+from collections.abc import Callable
+from typing import Any, TypeVar, cast
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def memoized(method: F) -> F:
+    """Cache the result of a context accessor on its instance.
+
+    Calls are keyed by their bound arguments, so `preview()`, `preview(10)` and
+    `preview(limit=10)` share one cache entry. Exceptions are not cached.
+    Each call gets its own copy of the result, so a template editing the rows
+    or columns it got doesn't change what the next one sees.
+    """
+    signature = inspect.signature(method)
+    name = cast(Any, method).__name__
+
+    @functools.wraps(method)
+    def wrapper(self: "MemoizedContext", *args: Any, **kwargs: Any) -> Any:
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (name, tuple(bound.arguments.items())[1:])
+
+        cache = self._memo
+        try:
+            result = cache[key]
+        except KeyError:
+            result = cache[key] = method(self, *args, **kwargs)
+        except TypeError:
+            # Unhashable arguments can't be used as a cache key
+            return method(self, *args, **kwargs)
+        return copy.deepcopy(result)
+
+    return cast(F, wrapper)
+
+
+class MemoizedContext:
+    """Base class for contexts whose `@memoized` accessors are fetched at most once."""
+
+    @property
+    def _memo(self) -> dict[tuple[str, tuple[tuple[str, Any], ...]], Any]:
+        # Created lazily so subclasses don't have to call super().__init__()
+        try:
+            return self.__dict__["_memo_cache"]
+        except KeyError:
+            return self.__dict__.setdefault("_memo_cache", {})
+
+    def is_memoized(self, accessor: str) -> bool:
+        """Check whether an accessor already holds a result for some arguments."""
+        return any(key[0] == accessor for key in self._memo)
+
+    def invalidate(self, accessor: str | None = None) -> None:
+        """Drop memoized results so the next call fetches fresh data.
+
+        Args:
+            accessor: Name of the accessor to invalidate (e.g. "columns").
+                Invalidates every accessor when omitted.
+        """
+        if accessor is None:
+            self._memo.clear()
+            return
+        for key in [key for key in self._memo if key[0] == accessor]:
+            del self._memo[key]
@@ -0,0 +1,61 @@
+"""Output folders of the sync providers, recorded in `.nao/` by each sync.
+
+`nao sync` can write a provider's output to another folder than its default
+one. The folders it used are recorded, so template rendering and the backend
+find the generated files where the last sync put them.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from nao_core.fs import get_project_state_dir, write_if_changed
+
+OUTPUT_DIRS_FILENAME = "output_dirs.json"
+
+
+def get_output_dirs_path(project_path: Path) -> Path:
+    """Return the file recording the output folders of the last sync."""
+    return get_project_state_dir(project_path) / OUTPUT_DIRS_FILENAME
+
+
+def load_output_dirs(project_path: Path) -> dict[str, str]:
+    """Read the recorded output folders, keyed by provider name. Returns an empty dict if there are none."""
+    try:
+        data = json.loads(get_output_dirs_path(project_path).read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {name: path for name, path in data.items() if isinstance(path, str)}
+
+
+def save_output_dirs(project_path: Path, output_dirs: dict[str, str]) -> None:
+    """Record the output folders of a sync, keeping those of the providers it did not run."""
+    recorded = {**load_output_dirs(project_path), **output_dirs}
+    path = get_output_dirs_path(project_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_if_changed(path, json.dumps(recorded, indent=2, sort_keys=True) + "\n")
+
+
+def get_output_dir(project_path: Path, provider_name: str, default: str) -> Path:
+    """Return the output folder of a provider: the one recorded by the last sync, or its default one.
+
+    Relative folders are resolved against the project, like `nao sync` does.
+    """
+    return project_path / load_output_dirs(project_path).get(provider_name, default)
+
+
+def get_generated_dirs(project_path: Path, output_dirs: dict[str, str]) -> set[str]:
+    """Return the output folders inside the project, relative to it (e.g. `docs/notion`)."""
+    root = project_path.resolve()
+    generated: set[str] = set()
+    for output_dir in output_dirs.values():
+        try:
+            relative = (project_path / output_dir).resolve().relative_to(root)
+        except ValueError:
+            continue
+        if relative.parts:
+            generated.add(relative.as_posix())
+    return generated
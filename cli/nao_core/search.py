@@ -0,0 +1,250 @@
+"""Full-text search index over the generated context (SQLite FTS5, BM25 ranking).
+
+`nao sync` keeps the index up to date incrementally: only files whose size or
+mtime changed are re-read, and files that disappeared are dropped. The chat
+backend queries it instead of scanning the context folder on every search.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+
+from nao_core.fs import get_project_state_dir
+from nao_core.ignore import NaoIgnore
+
+SEARCH_INDEX_FILENAME = "search.sqlite"
+SCHEMA_VERSION = 1
+
+INDEXED_SUFFIXES = {".md", ".mdx", ".rst", ".txt"}
+EXCLUDED_DIRS = {"node_modules", "__pycache__", "venv"}
+
+# Relative weights of the indexed columns: path, source, title, body, terms
+BM25_WEIGHTS = (0.0, 0.0, 10.0, 1.0, 4.0)
+
+_IDENTIFIER_PATTERN = re.compile(r"[A-Za-z0-9_$]+(?:\.[A-Za-z0-9_$]+)*")
+_CAMEL_CASE_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+_QUERY_TOKEN_PATTERN = re.compile(r"\w+")
+_HEADING_PATTERN = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+_FRONT_MATTER_TITLE_PATTERN = re.compile(r"\A---\n(?:.*\n)*?title:\s*(.+)\n(?:.*\n)*?---\n")
+
+
+def get_search_index_path(project_path: Path) -> Path:
+    """Return the search index of a project, stored in its `.nao/` state folder."""
+    return get_project_state_dir(project_path) / SEARCH_INDEX_FILENAME
+
+
+@dataclass
+class SearchIndexResult:
+    """Counts of files (re)indexed, left untouched and dropped by an index update."""
+
+    indexed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+    def get_summary(self) -> str:
+        summary = f"{self.indexed} files indexed, {self.unchanged} unchanged"
+        if self.removed:
+            summary += f", {self.removed} removed"
+        return summary
+
+
+@dataclass
+class SearchHit:
+    """One ranked search result."""
+
+    path: str
+    source: str
+    title: str
+    snippet: str
+    score: float
+
+
+def split_identifiers(text: str) -> list[str]:
+    """Split table and column identifiers into their words.
+
+    `orders.customer_id` and `customerId` both yield `customer` and `id`, so
+    searching for a word finds identifiers that contain it. Plain words are
+    not repeated, since the body column already holds them.
+    """
+    terms: dict[str, None] = {}
+    for identifier in _IDENTIFIER_PATTERN.findall(text):
+        for part in re.split(r"[._$]+", identifier):
+            words = _CAMEL_CASE_PATTERN.findall(part)
+            if len(words) > 1 or part != identifier:
+                terms.update(dict.fromkeys(word.lower() for word in words))
+    return list(terms)
+
+
+def _source_of(relative_path: PurePosixPath) -> str:
+    return relative_path.parts[0] if len(relative_path.parts) > 1 else "project"
+
+
+def _title_of(relative_path: PurePosixPath, content: str) -> str:
+    """Derive a title: `database.schema.table accessor` for synced tables, else the document title."""
+    keys = dict(part.split("=", 1) for part in relative_path.parts[:-1] if "=" in part)
+    if "table" in keys:
+        qualified = ".".join(keys[key] for key in ("database", "schema", "table") if key in keys)
+        return f"{qualified} {relative_path.stem}"
+    if match := _FRONT_MATTER_TITLE_PATTERN.match(content):
+        return match.group(1).strip()
+    if match := _HEADING_PATTERN.search(content):
+        return match.group(1).strip()
+    return relative_path.stem
+
+
+def _iter_documents(project_path: Path, naoignore: NaoIgnore):
+    """Yield (relative path, stat result) of every indexable file of the project."""
+    for root, dirs, files in os.walk(project_path):
+        root_path = Path(root)
+        relative_root = root_path.relative_to(project_path).as_posix()
+        relative_root = "" if relative_root == "." else f"{relative_root}/"
+        # Prune hidden folders (.git, .nao, staging trees, ...) and ignored folders before descending
+        dirs[:] = [
+            d
+            for d in dirs
+            if not d.startswith(".") and d not in EXCLUDED_DIRS and not naoignore.matches(f"{relative_root}{d}/")
+        ]
+        for name in files:
+            if Path(name).suffix not in INDEXED_SUFFIXES or name.startswith("."):
+                continue
+            relative_path = f"{relative_root}{name}"
+            if naoignore.matches(relative_path):
+                continue
+            try:
+                yield relative_path, (root_path / name).stat()
+            except OSError:
+                continue
+
+
+def _connect(index_path: Path) -> sqlite3.Connection:
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(index_path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        conn.executescript(
+            f"""
+            DROP TABLE IF EXISTS files;
+            DROP TABLE IF EXISTS documents;
+            CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, mtime_ns INTEGER, size INTEGER);
+            CREATE VIRTUAL TABLE documents USING fts5(
+                path UNINDEXED, source UNINDEXED, title, body, terms,
+                tokenize = "unicode61 tokenchars '_'"
+            );
+            PRAGMA user_version = {SCHEMA_VERSION};
+            """
+        )
+    return conn
+
+
+def update_search_index(project_path: Path, index_path: Path | None = None) -> SearchIndexResult:
+    """Bring the search index of a project up to date with its files.
+
+    Files are compared by size and mtime, so unchanged files are not read.
+    Files matching `.naoignore` are not indexed, like they are hidden from the agent.
+    """
+    index_path = index_path or get_search_index_path(project_path)
+    result = SearchIndexResult()
+    naoignore = NaoIgnore.load(project_path)
+
+    with closing(_connect(index_path)) as conn, conn:
+        known = {
+            path: (file_id, mtime_ns, size) for file_id, path, mtime_ns, size in conn.execute("SELECT * FROM files")
+        }
+        seen: set[str] = set()
+
+        for relative_path, stat in _iter_documents(project_path, naoignore):
+            seen.add(relative_path)
+            previous = known.get(relative_path)
+            if previous is not None and previous[1:] == (stat.st_mtime_ns, stat.st_size):
+                result.unchanged += 1
+                continue
+            try:
+                content = (project_path / relative_path).read_text(errors="replace")
+            except OSError:
+                continue
+
+            if previous is None:
+                file_id = conn.execute(
+                    "INSERT INTO files (path, mtime_ns, size) VALUES (?, ?, ?)",
+                    (relative_path, stat.st_mtime_ns, stat.st_size),
+                ).lastrowid
+            else:
+                file_id = previous[0]
+                conn.execute(
+                    "UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?", (stat.st_mtime_ns, stat.st_size, file_id)
+                )
+                conn.execute("DELETE FROM documents WHERE rowid = ?", (file_id,))
+
+            path = PurePosixPath(relative_path)
+            conn.execute(
+                "INSERT INTO documents (rowid, path, source, title, body, terms) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    file_id,
+                    relative_path,
+                    _source_of(path),
+                    _title_of(path, content),
+                    content,
+                    " ".join(split_identifiers(f"{relative_path}\n{content}")),
+                ),
+            )
+            result.indexed += 1
+
+        stale = [(file_id,) for path, (file_id, _, _) in known.items() if path not in seen]
+        conn.executemany("DELETE FROM documents WHERE rowid = ?", stale)
+        conn.executemany("DELETE FROM files WHERE id = ?", stale)
+        result.removed = len(stale)
+
+    return result
+
+
+def _build_match_query(query: str, operator: str) -> str | None:
+    tokens = _QUERY_TOKEN_PATTERN.findall(query)
+    if not tokens:
+        return None
+    return f" {operator} ".join(f'"{token}"*' for token in tokens)
+
+
+def search(index_path: Path, query: str, limit: int = 20, source: str | None = None) -> list[SearchHit]:
+    """Search the index and return the best hits first.
+
+    Documents containing every word of the query rank first; when there are
+    none, documents containing any of the words are returned instead. Words
+    match as prefixes, so `cust` finds `customer_id`.
+
+    Args:
+        index_path: The search index file
+        query: Free-text query (e.g. "orders customer_id")
+        limit: Maximum number of hits
+        source: Only return documents of this top-level folder (e.g. "databases")
+
+    Raises:
+        FileNotFoundError: If the index does not exist yet.
+    """
+    if not index_path.exists():
+        raise FileNotFoundError(f"No search index at {index_path}, run `nao sync` first")
+
+    weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+    sql = f"""
+        SELECT path, source, title, snippet(documents, 3, '**', '**', '…', 16), bm25(documents, {weights}) AS rank
+        FROM documents
+        WHERE documents MATCH ? {"AND source = ?" if source else ""}
+        ORDER BY rank
+        LIMIT ?
+    """
+    with closing(sqlite3.connect(index_path.resolve().as_uri() + "?mode=ro", uri=True)) as conn:
+        for operator in ("AND", "OR"):
+            match_query = _build_match_query(query, operator)
+            if match_query is None:
+                return []
+            params = (match_query, source, limit) if source else (match_query, limit)
+            rows = conn.execute(sql, params).fetchall()
+            if rows:
+                break
+    return [
+        SearchHit(path=path, source=src, title=title, snippet=snippet, score=-rank)
+        for path, src, title, snippet, rank in rows
+    ]
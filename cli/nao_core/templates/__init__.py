@@ -15,10 +15,11 @@ Example user template (docs/report.md.j2):
     {{ nao.notion.page('https://notion.so/...').content }}
 """
 
-from .context import NaoContext, NotionPage, NotionProvider, create_nao_context
+from .context import DatabaseProvider, JoinsProvider, NaoContext, NotionPage, NotionProvider, create_nao_context
 from .engine import TemplateEngine, get_template_engine
 from .render import (
     TemplateRenderResult,
+    create_template_environment,
     discover_templates,
     render_all_templates,
     render_template,
@@ -29,12 +30,15 @@ __all__ = [
     "TemplateEngine",
     "get_template_engine",
     # Context
+    "DatabaseProvider",
+    "JoinsProvider",
     "NaoContext",
     "NotionPage",
     "NotionProvider",
     "create_nao_context",
     # Render
     "TemplateRenderResult",
+    "create_template_environment",
     "discover_templates",
     "render_template",
     "render_all_templates",
@@ -6,16 +6,64 @@ allowing them to access data from various providers like Notion, databases, etc.
 Example template usage:
     {{ nao.notion.page('https://notion.so/...').content }}
     {{ nao.notion.page('abc123').title }}
+    {{ nao.joins.sql('orders', 'users') }}
+    {{ nao.database('warehouse').scalar('SELECT count(*) FROM orders') }}
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from functools import cached_property
-from typing import TYPE_CHECKING, Any
+import json
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar, cast
+
+from nao_core.fs import get_project_state_dir
+from nao_core.outputs import get_output_dir
+
+from .dependencies import fingerprint, record_dependency
 
 if TYPE_CHECKING:
+    from ibis import BaseBackend
+    from notion_client import Client
+
+    from nao_core.commands.sync.joins import JoinEdge, JoinGraph
+    from nao_core.commands.sync.providers.notion.cache import NotionPageCache
     from nao_core.config.base import NaoConfig
+    from nao_core.config.databases import DatabaseConfig
+
+T = TypeVar("T")
+
+QUERY_CACHE_DIR = "queries"
+DEFAULT_QUERY_TTL = 3600.0
+
+
+class SharedCache:
+    """Thread-safe cache where concurrent first accesses to a key share one computation.
+
+    Templates are rendered in parallel; when two of them ask for the same
+    resource, the second one waits for the first fetch instead of repeating it.
+    Failed computations are not cached.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._key_locks: dict[Any, threading.Lock] = {}
+        self._values: dict[Any, Any] = {}
+
+    def get(self, key: Any, compute: Callable[[], T]) -> T:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key not in self._values:
+                self._values[key] = compute()
+            return self._values[key]
 
 
 @dataclass
@@ -24,37 +72,35 @@ class NotionPage:
 
     page_url_or_id: str
     api_key: str
+    cache: NotionPageCache | None = field(default=None, repr=False, compare=False)
+    """Exports of previous runs, reused when the page was not edited since"""
+    client: Client | None = field(default=None, repr=False, compare=False)
+    """Rate-limited client shared by the pages of a render run"""
     _data: dict[str, Any] | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
     def _load(self) -> dict[str, Any]:
-        """Lazily load page data from Notion API."""
-        if self._data is None:
-            from notion2md.exporter.block import StringExporter
-            from notion_client import Client
-
-            from nao_core.commands.sync.providers.notion.provider import (
-                extract_page_id,
-                get_page_title,
-                strip_images,
-            )
-
-            page_id = extract_page_id(self.page_url_or_id)
-            client = Client(auth=self.api_key)
-            title = get_page_title(client, page_id)
-
-            # Export to markdown
-            md_exporter = StringExporter(block_id=page_id, token=self.api_key)
-            markdown = md_exporter.export()
-            markdown = strip_images(markdown)
-
-            self._data = {
-                "id": page_id,
-                "title": title,
-                "content": markdown,
-                "url": f"https://notion.so/{page_id}",
-            }
+        """Lazily load page data from Notion API, once even when accessed from several threads."""
+        with self._lock:
+            if self._data is None:
+                self._data = self._fetch()
+        record_dependency("notion_page", self.page_url_or_id, str(self._data.get("last_edited_time")))
         return self._data
 
+    def _fetch(self) -> dict[str, Any]:
+        from nao_core.commands.sync.providers.notion.provider import export_page, extract_page_id
+
+        page_id = extract_page_id(self.page_url_or_id)
+        page = export_page(page_id, self.api_key, self.cache, self.client)
+
+        return {
+            "id": page_id,
+            "title": page.title,
+            "content": page.markdown,
+            "url": f"https://notion.so/{page_id}",
+            "last_edited_time": page.last_edited_time,
+        }
+
     @property
     def id(self) -> str:
         """The Notion page ID."""
@@ -80,12 +126,20 @@ class NotionPage:
         return self.content
 
 
+def _notion_page_cache(project_path: Path) -> NotionPageCache:
+    from nao_core.commands.sync.providers.notion.cache import NotionPageCache
+
+    return NotionPageCache.for_project(project_path)
+
+
 class NotionProvider:
     """Provider interface for accessing Notion data in templates."""
 
-    def __init__(self, config: NaoConfig):
+    def __init__(self, config: NaoConfig, project_path: Path | None = None):
         self._config = config
-        self._page_cache: dict[str, NotionPage] = {}
+        self._page_cache = SharedCache()
+        self._clients = SharedCache()
+        self._export_cache = None if project_path is None else _notion_page_cache(project_path)
 
     def _get_api_key_for_page(self, page_url_or_id: str) -> str:
         """Find the API key that can access a given page.
@@ -114,6 +168,24 @@ class NotionProvider:
         # Fallback to the configured API key (page not in explicit list, but config exists)
         return self._config.notion.api_key
 
+    def _client(self, api_key: str) -> Client:
+        """One rate-limited client per API key, shared by every page of the run."""
+        from nao_core.commands.sync.providers.notion.client import create_client
+
+        return self._clients.get(api_key, lambda: create_client(api_key))
+
+    def last_edited_time(self, page_url_or_id: str) -> str:
+        """Fetch the last edit time of a page, without exporting its content."""
+        from nao_core.commands.sync.providers.notion.provider import extract_page_id
+
+        client = self._client(self._get_api_key_for_page(page_url_or_id))
+        page = cast(dict[str, Any], client.pages.retrieve(page_id=extract_page_id(page_url_or_id)))
+        return str(page.get("last_edited_time"))
+
+    def _create_page(self, page_url_or_id: str) -> NotionPage:
+        api_key = self._get_api_key_for_page(page_url_or_id)
+        return NotionPage(page_url_or_id, api_key, cache=self._export_cache, client=self._client(api_key))
+
     def page(self, page_url_or_id: str) -> NotionPage:
         """Get a Notion page by URL or ID.
 
@@ -127,13 +199,265 @@ class NotionProvider:
             {{ nao.notion.page('https://notion.so/My-Page-abc123').content }}
             {{ nao.notion.page('abc123def456...').title }}
         """
-        if page_url_or_id not in self._page_cache:
-            api_key = self._get_api_key_for_page(page_url_or_id)
-            self._page_cache[page_url_or_id] = NotionPage(
-                page_url_or_id=page_url_or_id,
-                api_key=api_key,
-            )
-        return self._page_cache[page_url_or_id]
+        return self._page_cache.get(
+            page_url_or_id,
+            lambda: self._create_page(page_url_or_id),
+        )
+
+
+def file_version(path: Path) -> str:
+    """Version of a file read by a template: the hash of its content, or "missing"."""
+    try:
+        return fingerprint(path.read_bytes())
+    except OSError:
+        return "missing"
+
+
+class _RecordingConfig:
+    """Read-only view of the nao config that records which sections a template reads."""
+
+    def __init__(self, config: NaoConfig):
+        self._config = config
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._config, name)
+        record_dependency("config", name, fingerprint(value))
+        return value
+
+
+def get_database_config(config: NaoConfig, database: str | None = None) -> DatabaseConfig:
+    """Find a configured database by name; the name is optional when only one is configured."""
+    databases = config.databases
+    if database is None and len(databases) == 1:
+        return databases[0]
+    db_config = next((db for db in databases if db.name == database), None)
+    if db_config is None:
+        raise ValueError(f"Unknown database '{database}', available: {', '.join(db.name for db in databases)}")
+    return db_config
+
+
+def get_database_output_path(project_path: Path, db_config: DatabaseConfig) -> Path:
+    """Return the folder `nao sync` writes a database to, in the output folder used by the last sync."""
+    from nao_core.commands.sync.providers.databases.provider import DatabaseSyncProvider, get_relative_db_path
+
+    provider = DatabaseSyncProvider()
+    output_path = get_output_dir(project_path, provider.name, provider.default_output_dir)
+    return output_path / get_relative_db_path(db_config)
+
+
+class DatabaseProvider:
+    """Provider interface for querying a configured database in templates.
+
+    One connection is opened per database for the whole render run, and
+    identical queries run once even when several templates use them. Query
+    results are also cached in `.nao/queries/` for `ttl` seconds, so the
+    following syncs don't query the warehouse again to check whether a
+    template is up to date.
+    """
+
+    def __init__(self, db_config: DatabaseConfig, project_path: Path):
+        self._db_config = db_config
+        self._project_path = project_path
+        self._connection = SharedCache()
+        self._results = SharedCache()
+        self._catalog = SharedCache()
+        # Connections are not safe to use from several threads at once
+        self._execute_lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        """The name of the database connection."""
+        return self._db_config.name
+
+    def _connect(self) -> BaseBackend:
+        return self._connection.get("connection", self._db_config.connect)
+
+    def _cache_path(self, sql: str) -> Path:
+        key = fingerprint([self._db_config, sql])
+        return get_project_state_dir(self._project_path) / QUERY_CACHE_DIR / f"{key}.json"
+
+    def _read_cached(self, path: Path, ttl: float) -> list[dict[str, Any]] | None:
+        if ttl <= 0:
+            return None
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if time.time() - data.get("fetched_at", 0) > ttl:
+            return None
+        return data.get("rows")
+
+    def _fetch(self, sql: str, ttl: float) -> list[dict[str, Any]]:
+        path = self._cache_path(sql)
+        rows = self._read_cached(path, ttl)
+        if rows is not None:
+            return rows
+
+        with self._execute_lock:
+            df = self._db_config.execute_sql(sql, self._connect())
+        # Round-trip through JSON so fresh and cached results have the same types
+        rows = json.loads(json.dumps(df.to_dict(orient="records"), default=str))
+        fetched_at = time.time()
+        data = {"sql": sql, "fetched_at": fetched_at, "expires_at": fetched_at + ttl, "rows": rows}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # One temporary file per thread, so concurrent writes of the same query don't mix
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps(data))
+            tmp_path.replace(path)
+        except OSError:
+            pass
+        return rows
+
+    def _rows(self, sql: str, ttl: float) -> list[dict[str, Any]]:
+        return self._results.get((sql, ttl), lambda: self._fetch(sql, ttl))
+
+    def query(self, sql: str, ttl: float = DEFAULT_QUERY_TTL) -> list[dict[str, Any]]:
+        """Run a query and return its rows as dicts.
+
+        Args:
+            sql: The query to run
+            ttl: How long (in seconds) a result cached by a previous run can be reused; 0 always queries.
+
+        Example:
+            {% for row in nao.database('warehouse').query('SELECT status, count(*) AS n FROM orders GROUP BY 1') %}
+            - {{ row.status }}: {{ row.n }}
+            {% endfor %}
+        """
+        rows = self._rows(sql, ttl)
+        record_dependency("query", json.dumps([self.name, sql, ttl]), fingerprint(rows))
+        return rows
+
+    def scalar(self, sql: str, ttl: float = DEFAULT_QUERY_TTL) -> Any:
+        """Run a query and return the first value of its first row (None if it returned no rows).
+
+        Example:
+            {{ nao.database('warehouse').scalar('SELECT count(*) FROM orders') }}
+        """
+        rows = self.query(sql, ttl)
+        return next(iter(rows[0].values()), None) if rows else None
+
+    def query_version(self, sql: str, ttl: float) -> str:
+        """Version of a query result, used to decide whether a template has to be rendered again."""
+        return fingerprint(self._rows(sql, ttl))
+
+    def catalog(self) -> list[dict[str, Any]]:
+        """The catalog entries of the synced tables (description, row count, columns, files).
+
+        Raises:
+            FileNotFoundError: If the database has not been synced yet.
+        """
+        from nao_core.commands.sync.catalog import get_catalog_path, read_catalog
+
+        catalog_path = get_catalog_path(get_database_output_path(self._project_path, self._db_config))
+        record_dependency("file", catalog_path.relative_to(self._project_path).as_posix(), file_version(catalog_path))
+
+        def load() -> list[dict[str, Any]]:
+            if not catalog_path.exists():
+                raise FileNotFoundError(f"No catalog for database '{self.name}', run `nao sync` first")
+            return list(read_catalog(catalog_path).values())
+
+        return self._catalog.get("catalog", load)
+
+    def table(self, schema: str, name: str) -> dict[str, Any]:
+        """Get the catalog entry of a synced table.
+
+        Example:
+            {{ nao.database('warehouse').table('sales', 'orders').description }}
+
+        Raises:
+            ValueError: If the table was not synced.
+        """
+        for entry in self.catalog():
+            if entry["schema"] == schema and entry["table"] == name:
+                return entry
+        raise ValueError(f"Table '{schema}.{name}' not found in the catalog of '{self.name}'")
+
+    def tables(self, schema: str | None = None) -> list[dict[str, Any]]:
+        """List the catalog entries of the synced tables, optionally of a single schema."""
+        return [entry for entry in self.catalog() if schema is None or entry["schema"] == schema]
+
+    def tables_with_column(self, column: str) -> list[dict[str, Any]]:
+        """List the catalog entries of the tables that have a column (case-insensitive)."""
+        column = column.lower()
+        return [
+            entry
+            for entry in self.catalog()
+            if any(col["name"].lower() == column for col in entry.get("columns") or [])
+        ]
+
+
+def prune_query_cache(project_path: Path, now: float | None = None) -> int:
+    """Delete the query results cached in `.nao/queries/` whose ttl has expired.
+
+    Returns:
+        The number of files deleted.
+    """
+    now = time.time() if now is None else now
+    removed = 0
+    for path in (get_project_state_dir(project_path) / QUERY_CACHE_DIR).glob("*"):
+        try:
+            if path.suffix == ".json":
+                expires_at = json.loads(path.read_text()).get("expires_at", 0)
+            else:
+                # Temporary file left behind by an interrupted write
+                expires_at = path.stat().st_mtime + DEFAULT_QUERY_TTL
+        except (OSError, ValueError, AttributeError):
+            expires_at = 0
+        if expires_at < now:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                continue
+            removed += 1
+    return removed
+
+
+class JoinsProvider:
+    """Provider interface for the join graphs built by `nao sync`."""
+
+    def __init__(self, config: NaoConfig, project_path: Path):
+        self._config = config
+        self._project_path = project_path
+        self._graphs = SharedCache()
+
+    def graph(self, database: str | None = None) -> JoinGraph:
+        """Get the join graph of a database.
+
+        Args:
+            database: Name of the database connection; optional when only one is configured.
+
+        Example:
+            {% for edge in nao.joins.graph().neighbors('orders') %}- {{ edge.condition }}{% endfor %}
+        """
+        from nao_core.commands.sync.joins import JoinGraph, get_joins_path
+
+        db_config = get_database_config(self._config, database)
+        joins_path = get_joins_path(get_database_output_path(self._project_path, db_config))
+        record_dependency("file", joins_path.relative_to(self._project_path).as_posix(), file_version(joins_path))
+        return self._graphs.get(db_config.name, lambda: JoinGraph.load(joins_path))
+
+    def path(self, source: str, target: str, database: str | None = None) -> list[JoinEdge]:
+        """Get the shortest join path between two tables (`schema.table`, or a unique table name).
+
+        Raises:
+            ValueError: If the tables are not connected.
+        """
+        path = self.graph(database).shortest_path(source, target)
+        if path is None:
+            raise ValueError(f"No join path between '{source}' and '{target}'")
+        return path
+
+    def sql(self, source: str, target: str, database: str | None = None) -> str:
+        """Get the FROM/JOIN clauses joining two tables along the shortest path.
+
+        Example:
+            {{ nao.joins.sql('orders', 'users') }}
+        """
+        from nao_core.commands.sync.joins import format_join_path
+
+        path = self.path(source, target, database)
+        return format_join_path(path) if path else f"FROM {self.graph(database).resolve(source)}"
 
 
 class NaoContext:
@@ -145,49 +469,92 @@ class NaoContext:
 
     Example template usage:
         {{ nao.notion.page('url').content }}
+        {{ nao.database('warehouse').query('SELECT ...') }}
         {{ nao.config.project_name }}
     """
 
-    def __init__(self, config: NaoConfig):
+    def __init__(self, config: NaoConfig, project_path: Path | None = None):
         self._config = config
+        self._project_path = project_path or Path.cwd()
+        # Providers are created once per context, even when templates render in parallel
+        self._providers = SharedCache()
+        self._versions = SharedCache()
 
-    @cached_property
+    @property
     def notion(self) -> NotionProvider:
         """Access Notion pages and databases.
 
         Example:
             {{ nao.notion.page('https://notion.so/...').content }}
         """
-        return NotionProvider(self._config)
+        return self._providers.get("notion", lambda: NotionProvider(self._config, self._project_path))
 
     @property
-    def config(self) -> NaoConfig:
-        """Access the nao configuration.
+    def joins(self) -> JoinsProvider:
+        """Access the join graphs of the synced databases.
+
+        Example:
+            {{ nao.joins.sql('orders', 'users') }}
+        """
+        return self._providers.get("joins", lambda: JoinsProvider(self._config, self._project_path))
+
+    def database(self, name: str | None = None) -> DatabaseProvider:
+        """Query a configured database and look up its synced catalog.
+
+        Args:
+            name: Name of the database connection; optional when only one is configured.
+
+        Example:
+            {{ nao.database('warehouse').scalar('SELECT count(*) FROM orders') }}
+            {{ nao.database('warehouse').table('sales', 'orders').row_count }}
+        """
+        db_config = get_database_config(self._config, name)
+        return self._providers.get(
+            ("database", db_config.name), lambda: DatabaseProvider(db_config, self._project_path)
+        )
+
+    @property
+    def config(self) -> Any:
+        """Access the nao configuration, through a read-only view with the same attributes.
 
         Example:
             {{ nao.config.project_name }}
         """
-        return self._config
+        return _RecordingConfig(self._config)
+
+    def current_version(self, kind: str, key: str) -> str | None:
+        """Return the current version of a resource recorded by a previous render.
+
+        Used to decide whether a template has to be rendered again. Versions
+        are fetched once per run, so templates sharing a Notion page cost a
+        single lookup.
+        """
+        if kind == "config":
+            return fingerprint(getattr(self._config, key))
+        if kind == "file":
+            return file_version(self._project_path / key)
+        if kind == "notion_page":
+            return self._versions.get((kind, key), lambda: self.notion.last_edited_time(key))
+        if kind == "query":
+            database, sql, ttl = json.loads(key)
+            return self.database(database).query_version(sql, ttl)
+        return None
 
     # Future providers can be added here:
-    # @cached_property
-    # def database(self) -> DatabaseProvider:
-    #     """Access database tables and schemas."""
-    #     return DatabaseProvider(self._config)
-    #
-    # @cached_property
+    # @property
     # def repo(self) -> RepoProvider:
     #     """Access git repository files."""
-    #     return RepoProvider(self._config)
+    #     return self._providers.get("repo", lambda: RepoProvider(self._config))
 
 
-def create_nao_context(config: NaoConfig) -> NaoContext:
+def create_nao_context(config: NaoConfig, project_path: Path | None = None) -> NaoContext:
     """Create a NaoContext for template rendering.
 
     Args:
         config: The nao configuration.
+        project_path: Path to the nao project root (the current directory by default).
 
     Returns:
         A NaoContext instance to be used as `nao` in templates.
     """
-    return NaoContext(config)
+    return NaoContext(config, project_path)
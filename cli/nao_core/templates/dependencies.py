@@ -0,0 +1,186 @@
+"""Inputs recorded while rendering user templates, so unchanged templates can be skipped.
+
+For every rendered template, the render state stores the hash of the template
+and of every template it includes or imports, the version of each provider
+resource it read (e.g. a Notion page's `last_edited_time`, a config section)
+and the hash of its output. On the next run the template is only rendered
+again if one of these changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from jinja2 import Environment, TemplateNotFound, meta
+
+from nao_core.fs import get_project_state_dir, write_if_changed
+
+RENDER_STATE_FILENAME = "templates.json"
+RENDER_STATE_VERSION = 1
+
+Resource = tuple[str, str, str]
+"""(kind, key, version), e.g. ("notion_page", "abc123", "2024-05-01T10:00:00.000Z")"""
+
+_recorded: ContextVar[set[Resource] | None] = ContextVar("nao_template_dependencies", default=None)
+
+
+def fingerprint(value: Any) -> str:
+    """Short, stable hash of a value (pydantic models are hashed through their JSON dump)."""
+
+    def default(obj: Any) -> Any:
+        if hasattr(obj, "model_dump"):
+            return obj.model_dump(mode="json")
+        return str(obj)
+
+    data = value if isinstance(value, bytes) else json.dumps(value, default=default, sort_keys=True).encode()
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def record_dependency(kind: str, key: str, version: str) -> None:
+    """Record that the template being rendered read a provider resource.
+
+    Does nothing outside of a render, so providers can call it unconditionally.
+    """
+    recorded = _recorded.get()
+    if recorded is not None:
+        recorded.add((kind, key, version))
+
+
+@contextmanager
+def recording() -> Generator[set[Resource], None, None]:
+    """Collect the resources read in this block (per thread, so parallel renders don't mix)."""
+    recorded: set[Resource] = set()
+    token = _recorded.set(recorded)
+    try:
+        yield recorded
+    finally:
+        _recorded.reset(token)
+
+
+def collect_template_sources(env: Environment, name: str) -> dict[str, str] | None:
+    """Hash a template and every template it includes, imports or extends.
+
+    Returns None when a reference can't be resolved statically (e.g. an
+    include whose name is computed), since changes to it can't be detected.
+    """
+    sources: dict[str, str] = {}
+    pending = [name]
+    while pending:
+        current = pending.pop()
+        if current in sources:
+            continue
+        assert env.loader is not None
+        try:
+            source, _, _ = env.loader.get_source(env, current)
+        except TemplateNotFound:
+            return None
+        sources[current] = fingerprint(source.encode())
+        for referenced in meta.find_referenced_templates(env.parse(source)):
+            if referenced is None:
+                return None
+            pending.append(referenced)
+    return sources
+
+
+@dataclass
+class TemplateDependencies:
+    """What one template's output was rendered from."""
+
+    sources: dict[str, str]
+    resources: list[Resource]
+    output: str
+
+
+@dataclass
+class RenderState:
+    """Dependencies of the templates rendered by the previous runs, stored in `.nao/`."""
+
+    path: Path
+    templates: dict[str, TemplateDependencies] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, project_path: Path) -> RenderState:
+        state = cls(get_project_state_dir(project_path) / RENDER_STATE_FILENAME)
+        try:
+            data = json.loads(state.path.read_text())
+            if data.get("version") != RENDER_STATE_VERSION:
+                return state
+            state.templates = {
+                name: TemplateDependencies(
+                    sources=entry["sources"],
+                    resources=[tuple(resource) for resource in entry["resources"]],  # type: ignore[misc]
+                    output=entry["output"],
+                )
+                for name, entry in data["templates"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return state
+
+    def is_fresh(
+        self,
+        name: str,
+        output_path: Path,
+        env: Environment,
+        current_version: Callable[[str, str], str | None],
+    ) -> bool:
+        """Check whether a template's output is still what rendering it now would produce.
+
+        Args:
+            name: The template name (its path relative to the project)
+            output_path: The rendered file
+            env: The environment loading the template and its includes
+            current_version: Returns the current version of a provider resource (kind, key)
+        """
+        recorded = self.templates.get(name)
+        if recorded is None:
+            return False
+        try:
+            if fingerprint(output_path.read_bytes()) != recorded.output:
+                return False
+        except OSError:
+            return False
+
+        assert env.loader is not None
+        for source_name, source_hash in recorded.sources.items():
+            try:
+                source, _, _ = env.loader.get_source(env, source_name)
+            except TemplateNotFound:
+                return False
+            if fingerprint(source.encode()) != source_hash:
+                return False
+
+        for kind, key, version in recorded.resources:
+            try:
+                if current_version(kind, key) != version:
+                    return False
+            except Exception:
+                return False
+        return True
+
+    def record(self, name: str, sources: dict[str, str] | None, resources: set[Resource], output: str) -> None:
+        """Store what a template was rendered from; templates with dynamic includes are never skipped."""
+        if sources is None:
+            self.templates.pop(name, None)
+            return
+        self.templates[name] = TemplateDependencies(sources, sorted(resources), fingerprint(output.encode()))
+
+    def forget(self, name: str) -> None:
+        self.templates.pop(name, None)
+
+    def save(self, keep: set[str]) -> None:
+        """Persist the state of the templates in `keep` (the ones still in the project)."""
+        templates = {
+            name: {"sources": entry.sources, "resources": [list(r) for r in entry.resources], "output": entry.output}
+            for name, entry in sorted(self.templates.items())
+            if name in keep
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(self.path, json.dumps({"version": RENDER_STATE_VERSION, "templates": templates}, indent=2))
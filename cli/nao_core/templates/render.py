@@ -9,19 +9,48 @@ For example: `docs/report.md.j2` → `docs/report.md`
 
 from __future__ import annotations
 
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from jinja2 import Environment, FileSystemLoader, TemplateError
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, TemplateError
 
-from .context import create_nao_context
+from nao_core.fs import WriteStats, get_project_state_dir, write_if_changed
+from nao_core.ignore import NaoIgnore
+from nao_core.outputs import get_generated_dirs, load_output_dirs
+
+from .context import create_nao_context, prune_query_cache
+from .dependencies import RenderState, Resource, collect_template_sources, recording
 
 if TYPE_CHECKING:
     from rich.console import Console
 
     from nao_core.config.base import NaoConfig
 
+    from .context import NaoContext
+
+JINJA_CACHE_DIR = "jinja"
+DEFAULT_RENDER_WORKERS = 8
+
+DISCOVERY_CACHE_FILENAME = "template_dirs.json"
+DISCOVERY_CACHE_VERSION = 1
+
+DEFAULT_EXCLUDED_DIRS = {
+    "templates",  # Don't process accessor template overrides
+    ".git",
+    ".venv",
+    "venv",
+    "node_modules",
+    "__pycache__",
+    ".nao",
+}
+
+# Default output folders of the sync providers, which only hold generated files
+GENERATED_DIRS = {"databases", "repos", "docs/notion"}
+
 
 @dataclass
 class TemplateRenderResult:
@@ -31,68 +60,177 @@ class TemplateRenderResult:
     templates_failed: int
     rendered_files: list[str]
     errors: list[str]
+    files_unchanged: int = 0
+    templates_skipped: int = 0
+    """Templates not rendered because none of their inputs changed"""
 
     def get_summary(self) -> str:
         """Get a human-readable summary of the render result."""
-        if self.templates_rendered == 0 and self.templates_failed == 0:
+        if self.templates_rendered == 0 and self.templates_failed == 0 and self.templates_skipped == 0:
             return "No templates found"
 
         parts = []
         if self.templates_rendered > 0:
             parts.append(f"{self.templates_rendered} rendered")
+        if self.templates_skipped > 0:
+            parts.append(f"{self.templates_skipped} up to date")
+        if self.files_unchanged > 0:
+            parts.append(f"{self.files_unchanged} unchanged")
         if self.templates_failed > 0:
             parts.append(f"{self.templates_failed} failed")
         return ", ".join(parts)
 
 
+def generated_output_dirs(project_path: Path) -> set[str]:
+    """Output folders of the sync providers as recorded by the last sync, or their defaults."""
+    output_dirs = load_output_dirs(project_path)
+    return get_generated_dirs(project_path, output_dirs) if output_dirs else GENERATED_DIRS
+
+
 def discover_templates(
     project_path: Path,
     exclude_dirs: set[str] | None = None,
+    exclude_paths: set[str] | None = None,
+    use_cache: bool = True,
 ) -> list[Path]:
     """Discover all `.j2` template files in the project.
 
+    The walk never enters excluded directories, generated output folders or
+    folders ignored by `.naoignore`. Directories whose mtime did not change
+    since the previous run reuse their cached listing instead of being read
+    again (adding, removing or renaming an entry updates the mtime of its
+    directory).
+
     Args:
         project_path: Path to the nao project root.
         exclude_dirs: Directory names to exclude (default: templates, .git, node_modules, etc.)
+        exclude_paths: Directories to exclude, relative to the project root (default: the
+            output folders recorded by the last sync, see `generated_output_dirs`)
+        use_cache: Whether to reuse and update the directory listing cached in `.nao/`.
 
     Returns:
         List of paths to `.j2` files relative to project_path.
     """
     if exclude_dirs is None:
-        exclude_dirs = {
-            "templates",  # Don't process accessor template overrides
-            ".git",
-            ".venv",
-            "venv",
-            "node_modules",
-            "__pycache__",
-            ".nao",
-        }
+        exclude_dirs = DEFAULT_EXCLUDED_DIRS
+    if exclude_paths is None:
+        exclude_paths = generated_output_dirs(project_path)
+    naoignore = NaoIgnore.load(project_path)
 
-    templates: list[Path] = []
+    cache_path = get_project_state_dir(project_path) / DISCOVERY_CACHE_FILENAME
+    previous = _load_listing_cache(cache_path) if use_cache else {}
+    listing: dict[str, dict[str, Any]] = {}
 
-    for path in project_path.rglob("*.j2"):
-        # Skip excluded directories
-        if any(excluded in path.parts for excluded in exclude_dirs):
+    templates: list[Path] = []
+    pending = [""]
+    while pending:
+        relative_dir = pending.pop()
+        entry = _list_directory(project_path / relative_dir, previous.get(relative_dir))
+        if entry is None:
             continue
+        listing[relative_dir] = entry
 
-        # Store relative path
-        templates.append(path.relative_to(project_path))
+        prefix = f"{relative_dir}/" if relative_dir else ""
+        templates.extend(
+            Path(f"{prefix}{name}") for name in entry["templates"] if not naoignore.matches(f"{prefix}{name}")
+        )
+        for name in entry["dirs"]:
+            relative_path = f"{prefix}{name}"
+            if name in exclude_dirs or relative_path in exclude_paths or naoignore.matches(f"{relative_path}/"):
+                continue
+            pending.append(relative_path)
+
+    if use_cache and listing != previous:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            write_if_changed(cache_path, json.dumps({"version": DISCOVERY_CACHE_VERSION, "dirs": listing}))
+        except OSError:
+            pass
 
     return sorted(templates)
 
 
+def _load_listing_cache(cache_path: Path) -> dict[str, dict[str, Any]]:
+    try:
+        data = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != DISCOVERY_CACHE_VERSION:
+        return {}
+    return data.get("dirs", {})
+
+
+def _list_directory(path: Path, cached: dict[str, Any] | None) -> dict[str, Any] | None:
+    """List the subdirectories and templates of a directory, reusing the cached listing if its mtime is unchanged."""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    if cached is not None and cached.get("mtime_ns") == mtime_ns:
+        return cached
+
+    dirs: list[str] = []
+    names: list[str] = []
+    try:
+        with os.scandir(path) as entries:
+            for dir_entry in entries:
+                if dir_entry.is_dir(follow_symlinks=False):
+                    dirs.append(dir_entry.name)
+                elif dir_entry.name.endswith(".j2") and dir_entry.is_file():
+                    names.append(dir_entry.name)
+    except OSError:
+        return None
+    return {"mtime_ns": mtime_ns, "dirs": sorted(dirs), "templates": sorted(names)}
+
+
+def create_template_environment(project_path: Path, cache_dir: Path | None = None) -> Environment:
+    """Create the Jinja environment shared by all user templates of a render run.
+
+    Compiled templates are cached in memory for the run and as bytecode in
+    `cache_dir` (`.nao/jinja/` by default), so unchanged templates, includes
+    and macros are not recompiled on the next sync.
+
+    Args:
+        project_path: Path to the nao project root, used as the loader path.
+        cache_dir: Folder of the on-disk bytecode cache.
+    """
+    cache_dir = cache_dir or get_project_state_dir(project_path) / JINJA_CACHE_DIR
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    env = Environment(
+        loader=FileSystemLoader(str(project_path)),
+        autoescape=False,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        keep_trailing_newline=True,
+        bytecode_cache=FileSystemBytecodeCache(str(cache_dir)),
+    )
+
+    # Register custom filters
+    env.filters["to_json"] = lambda v, indent=None: json.dumps(v, indent=indent, default=str)
+    return env
+
+
 def render_template(
     template_path: Path,
     project_path: Path,
     config: NaoConfig,
+    writes: WriteStats | None = None,
+    env: Environment | None = None,
+    nao: NaoContext | None = None,
 ) -> Path:
     """Render a single template file.
 
+    The output file is only rewritten when the rendered content differs from
+    what is already on disk.
+
     Args:
         template_path: Path to the template file (relative to project_path).
         project_path: Path to the nao project root.
         config: The nao configuration.
+        writes: Optional write counters updated with the outcome of the write.
+        env: Jinja environment shared across templates (created if not provided).
+        nao: The `nao` context shared across templates (created if not provided).
 
     Returns:
         Path to the rendered output file.
@@ -100,35 +238,52 @@ def render_template(
     Raises:
         TemplateError: If template rendering fails.
     """
-    # Create Jinja environment with project as the loader path
-    env = Environment(
-        loader=FileSystemLoader(str(project_path)),
-        autoescape=False,
-        trim_blocks=True,
-        lstrip_blocks=True,
-        keep_trailing_newline=True,
-    )
+    if env is None:
+        env = create_template_environment(project_path)
+    if nao is None:
+        nao = create_nao_context(config, project_path)
 
-    # Register custom filters
-    import json
+    rendered = _render_source(template_path, env, nao)
+    return _write_output(template_path, project_path, rendered, writes)
+
+
+@dataclass
+class _Rendered:
+    content: str
+    sources: dict[str, str] | None
+    resources: set[Resource]
 
-    env.filters["to_json"] = lambda v, indent=None: json.dumps(v, indent=indent, default=str)
 
-    # Create the nao context
-    nao = create_nao_context(config)
+def _render_if_stale(
+    template_path: Path, project_path: Path, env: Environment, nao: NaoContext, state: RenderState, force: bool
+) -> _Rendered | None:
+    """Render a template and record its inputs, or return None if its output is up to date."""
+    name = template_path.as_posix()
+    if not force and state.is_fresh(name, project_path / name[:-3], env, nao.current_version):
+        return None
+    with recording() as resources:
+        content = _render_source(template_path, env, nao)
+    return _Rendered(content, collect_template_sources(env, name), resources)
 
-    # Load and render the template
-    template = env.get_template(str(template_path))
-    rendered = template.render(nao=nao)
 
+def _render_source(template_path: Path, env: Environment, nao: NaoContext) -> str:
+    """Load and render a template to a string. Safe to call from several threads."""
+    template = env.get_template(template_path.as_posix())
+    return template.render(nao=nao)
+
+
+def _write_output(template_path: Path, project_path: Path, rendered: str, writes: WriteStats | None) -> Path:
+    """Write a rendered template next to its source and return the output path."""
     # Determine output path (remove .j2 extension)
     output_path = project_path / str(template_path)[:-3]  # Remove .j2
 
     # Ensure parent directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Write rendered content
-    output_path.write_text(rendered)
+    # Write rendered content (skipped if identical to the existing file)
+    if writes is None:
+        writes = WriteStats()
+    writes.write(output_path, rendered)
 
     return output_path
 
@@ -137,13 +292,29 @@ def render_all_templates(
     project_path: Path,
     config: NaoConfig,
     console: "Console | None" = None,
+    max_workers: int = DEFAULT_RENDER_WORKERS,
+    force: bool = False,
+    generated_dirs: set[str] | None = None,
 ) -> TemplateRenderResult:
     """Discover and render all user templates in the project.
 
+    Templates are rendered concurrently by a bounded thread pool, so templates
+    waiting on provider I/O (e.g. Notion pages) don't wait for each other.
+    Providers fetch each resource once, even when several templates ask for
+    it at the same time. Outputs are written and reported in discovery order.
+
+    Templates whose source, includes and provider resources are unchanged
+    since their last render (see `RenderState`) are skipped unless `force` is set.
+    Expired query results cached in `.nao/queries/` are deleted at the end.
+
     Args:
         project_path: Path to the nao project root.
         config: The nao configuration.
         console: Optional Rich console for output.
+        max_workers: Maximum number of templates rendered at the same time.
+        force: Render every template, even the ones that are up to date.
+        generated_dirs: Output folders of the sync providers, relative to the project,
+            which are not searched for templates (default: those recorded by the last sync).
 
     Returns:
         TemplateRenderResult with statistics about what was rendered.
@@ -153,7 +324,7 @@ def render_all_templates(
     if console is None:
         console = Console()
 
-    templates = discover_templates(project_path)
+    templates = discover_templates(project_path, exclude_paths=generated_dirs)
 
     if not templates:
         return TemplateRenderResult(
@@ -165,31 +336,62 @@ def render_all_templates(
 
     rendered_files: list[str] = []
     errors: list[str] = []
-
-    for template_path in templates:
-        try:
-            output_path = render_template(template_path, project_path, config)
-            rendered_files.append(str(output_path.relative_to(project_path)))
-            console.print(f"  [dim]→[/dim] {template_path} [dim]→[/dim] {output_path.name}")
-        except TemplateError as e:
-            error_msg = f"{template_path}: {e}"
-            errors.append(error_msg)
-            console.print(f"  [red]✗[/red] {template_path}: {e}")
-        except Exception as e:
-            error_msg = f"{template_path}: {type(e).__name__}: {e}"
-            errors.append(error_msg)
-            console.print(f"  [red]✗[/red] {template_path}: {e}")
+    skipped = 0
+    writes = WriteStats()
+    state = RenderState.load(project_path)
+
+    # One environment and one `nao` context for the whole run, so compiled templates
+    # and provider data (e.g. Notion pages) are shared between templates
+    env = create_template_environment(project_path)
+    nao = create_nao_context(config, project_path)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(templates)))) as pool:
+        futures = [
+            pool.submit(_render_if_stale, template_path, project_path, env, nao, state, force)
+            for template_path in templates
+        ]
+
+        # Outputs are written and reported in discovery order as renders complete
+        for template_path, future in zip(templates, futures, strict=True):
+            try:
+                rendered = future.result()
+                if rendered is None:
+                    skipped += 1
+                    continue
+                output_path = _write_output(template_path, project_path, rendered.content, writes)
+                state.record(template_path.as_posix(), rendered.sources, rendered.resources, rendered.content)
+                rendered_files.append(str(output_path.relative_to(project_path)))
+                console.print(f"  [dim]→[/dim] {template_path} [dim]→[/dim] {output_path.name}")
+            except TemplateError as e:
+                state.forget(template_path.as_posix())
+                error_msg = f"{template_path}: {e}"
+                errors.append(error_msg)
+                console.print(f"  [red]✗[/red] {template_path}: {e}")
+            except Exception as e:
+                state.forget(template_path.as_posix())
+                error_msg = f"{template_path}: {type(e).__name__}: {e}"
+                errors.append(error_msg)
+                console.print(f"  [red]✗[/red] {template_path}: {e}")
+
+    state.save(keep={template_path.as_posix() for template_path in templates})
+    prune_query_cache(project_path)
+
+    if skipped:
+        console.print(f"  [dim]{skipped} templates up to date[/dim]")
 
     return TemplateRenderResult(
         templates_rendered=len(rendered_files),
         templates_failed=len(errors),
         rendered_files=rendered_files,
         errors=errors,
+        files_unchanged=writes.unchanged,
+        templates_skipped=skipped,
     )
 
 
 __all__ = [
     "TemplateRenderResult",
+    "create_template_environment",
     "discover_templates",
     "render_template",
     "render_all_templates",
@@ -0,0 +1,258 @@
+"""Local HTTP stand-in for the Notion API, for tests of the Notion sync.
+
+Serves the endpoints used to export pages (`GET /v1/pages/{id}` and
+`GET /v1/blocks/{id}/children`) and list databases (`GET /v1/databases/{id}`
+`GET /v1/data_sources/{id}` and `POST /v1/data_sources/{id}/query`, with
+`last_edited_time` filters and `filter_properties`) from in-memory pages, and can answer
+`429 Too Many Requests` to exercise rate limiting. Point a client at it with
+`create_client(api_key, base_url=server.url)` or `$NOTION_API_URL`.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+_PAGE_PATH = re.compile(r"/v1/pages/([0-9a-f-]+)")
+_CHILDREN_PATH = re.compile(r"/v1/blocks/([0-9a-f-]+)/children")
+_DATABASE_PATH = re.compile(r"/v1/databases/([0-9a-f-]+)")
+_QUERY_PATH = re.compile(r"/v1/data_sources/([0-9a-f-]+)/query")
+_DATA_SOURCE_PATH = re.compile(r"/v1/data_sources/([0-9a-f-]+)")
+
+
+def _rich_text(text: str) -> list[dict]:
+    annotations = {
+        "bold": False,
+        "italic": False,
+        "strikethrough": False,
+        "underline": False,
+        "code": False,
+        "color": "default",
+    }
+    return [
+        {
+            "type": "text",
+            "text": {"content": text, "link": None},
+            "plain_text": text,
+            "href": None,
+            "annotations": annotations,
+        }
+    ]
+
+
+def _plain(rich_text: list[dict]) -> str:
+    return "".join(text["plain_text"] for text in rich_text)
+
+
+@dataclass
+class FakePage:
+    title: str
+    paragraphs: list[str]
+    last_edited_time: str = "2024-05-01T10:00:00.000Z"
+    child_pages: list[str] = field(default_factory=list)
+    child_databases: list[str] = field(default_factory=list)
+    links: list[str] = field(default_factory=list)
+    """Ids of pages linked with `link_to_page` blocks"""
+    toggles: dict[str, list[str]] = field(default_factory=dict)
+    """Toggle blocks: text of the toggle → paragraphs nested in it"""
+    properties: dict[str, dict] = field(default_factory=dict)
+    """Property values besides the title, as returned by the API"""
+    created_time: str = "2024-01-01T10:00:00.000Z"
+
+
+@dataclass
+class FakeDatabase:
+    title: str
+    rows: list[str]
+    """Ids of the pages in the database"""
+
+
+@dataclass
+class FakeNotionServer:
+    pages: dict[str, FakePage] = field(default_factory=dict)
+    databases: dict[str, FakeDatabase] = field(default_factory=dict)
+    rate_limited: int = 0
+    """Number of upcoming requests answered with 429"""
+    retry_after: str | None = "0"
+    delay: float = 0.0
+    """Seconds taken to answer each request"""
+    requests: list[tuple[float, str]] = field(default_factory=list)
+    """(time, path) of every request received"""
+    failing: set[str] = field(default_factory=set)
+    """Paths answered with 500"""
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, pattern: str) -> int:
+        return sum(re.fullmatch(pattern, path) is not None for _, path in self.requests)
+
+    def __enter__(self) -> FakeNotionServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _page(self, page_id: str) -> dict:
+        page = self.pages[page_id]
+        return {
+            "object": "page",
+            "id": page_id,
+            "url": f"https://www.notion.so/{page_id}",
+            "created_time": page.created_time,
+            "last_edited_time": page.last_edited_time,
+            "properties": {"Name": {"id": "title", "type": "title", "title": _rich_text(page.title)}} | page.properties,
+        }
+
+    def _data_source(self, database_id: str) -> dict:
+        """The data source of a database, with the properties of its rows as schema."""
+        properties: dict[str, dict] = {}
+        for row in self.databases[database_id].rows:
+            for name, prop in self._page(row)["properties"].items():
+                properties.setdefault(name, {"id": prop.get("id", name), "name": name, "type": prop["type"]})
+        return {"object": "data_source", "id": database_id, "properties": properties}
+
+    def _query(self, database_id: str, query: dict[str, list[str]], body: dict) -> list[dict]:
+        rows = [self._page(row) for row in self.databases[database_id].rows]
+        since = body.get("filter", {}).get("last_edited_time", {}).get("on_or_after")
+        if since:
+            rows = [row for row in rows if row["last_edited_time"] >= since]
+        if "filter_properties" in query:
+            for row in rows:
+                row["properties"] = {
+                    name: prop
+                    for name, prop in row["properties"].items()
+                    if prop.get("id") in query["filter_properties"]
+                }
+        return rows
+
+    def _blocks(self, page_id: str) -> list[dict]:
+        page = self.pages[page_id]
+        blocks: list[dict[str, Any]] = [
+            {"type": "paragraph", "paragraph": {"rich_text": _rich_text(text)}} for text in page.paragraphs
+        ]
+        blocks += [
+            {"type": "child_page", "id": child, "child_page": {"title": self.pages[child].title}}
+            for child in page.child_pages
+        ]
+        blocks += [
+            {"type": "child_database", "id": child, "child_database": {"title": self.databases[child].title}}
+            for child in page.child_databases
+        ]
+        blocks += [
+            {"type": "link_to_page", "link_to_page": {"type": "page_id", "page_id": link}} for link in page.links
+        ]
+        blocks += [
+            {"type": "toggle", "has_children": True, "toggle": {"rich_text": _rich_text(text), "color": "default"}}
+            for text in page.toggles
+        ]
+        return [
+            {"object": "block", "id": f"{page_id}-{i}", "has_children": False} | block for i, block in enumerate(blocks)
+        ]
+
+    def _nested_blocks(self, block_id: str) -> list[dict] | None:
+        """Paragraphs nested in a toggle block, or None if there is no such block."""
+        for page_id, page in self.pages.items():
+            for block in self._blocks(page_id):
+                if block["id"] == block_id and block["type"] == "toggle":
+                    text = _plain(block["toggle"]["rich_text"])
+                    return [
+                        {"object": "block", "id": f"{block_id}-{i}", "has_children": False, "type": "paragraph"}
+                        | {"paragraph": {"rich_text": _rich_text(paragraph)}}
+                        for i, paragraph in enumerate(page.toggles[text])
+                    ]
+        return None
+
+    def _respond(self, path: str, query: dict[str, list[str]], body: dict) -> tuple[int, dict, dict[str, str]]:
+        with self._lock:
+            self.requests.append((time.monotonic(), path))
+            if self.rate_limited > 0:
+                self.rate_limited -= 1
+                headers = {"Retry-After": self.retry_after} if self.retry_after is not None else {}
+                return 429, {"object": "error", "status": 429, "code": "rate_limited", "message": "Slow down"}, headers
+            if path in self.failing:
+                return 500, {"object": "error", "status": 500, "code": "internal_server_error", "message": "Oops"}, {}
+
+        results: list[dict] | None = None
+        page_size = int(query.get("page_size", [body.get("page_size", 100)])[0])
+        start = int(query.get("start_cursor", [body.get("start_cursor") or 0])[0])
+        if (match := _PAGE_PATH.fullmatch(path)) and match.group(1) in self.pages:
+            return 200, self._page(match.group(1)), {}
+        if (match := _CHILDREN_PATH.fullmatch(path)) and match.group(1) in self.pages:
+            results = self._blocks(match.group(1))
+        elif match := _CHILDREN_PATH.fullmatch(path):
+            results = self._nested_blocks(match.group(1))
+        elif (match := _DATABASE_PATH.fullmatch(path)) and match.group(1) in self.databases:
+            database = self.databases[match.group(1)]
+            return (
+                200,
+                {
+                    "object": "database",
+                    "id": match.group(1),
+                    "title": _rich_text(database.title),
+                    "data_sources": [{"id": match.group(1), "name": database.title}],
+                },
+                {},
+            )
+        elif (match := _DATA_SOURCE_PATH.fullmatch(path)) and match.group(1) in self.databases:
+            return 200, self._data_source(match.group(1)), {}
+        elif (match := _QUERY_PATH.fullmatch(path)) and match.group(1) in self.databases:
+            results = self._query(match.group(1), query, body)
+
+        if results is None:
+            return 404, {"object": "error", "status": 404, "code": "object_not_found", "message": "Not found"}, {}
+        has_more = start + page_size < len(results)
+        return (
+            200,
+            {
+                "object": "list",
+                "results": results[start : start + page_size],
+                "has_more": has_more,
+                "next_cursor": str(start + page_size) if has_more else None,
+            },
+            {},
+        )
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                self._handle({})
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                self._handle(json.loads(self.rfile.read(length) or b"{}"))
+
+            def _handle(self, request_body: dict) -> None:
+                url = urlparse(self.path)
+                time.sleep(server.delay)
+                status, body, headers = server._respond(url.path, parse_qs(url.query), request_body)
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return Handler
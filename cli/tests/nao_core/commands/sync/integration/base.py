@@ -13,6 +13,7 @@ from pathlib import Path
 import pytest
 from rich.progress import Progress
 
+from nao_core.commands.sync.joins import JoinGraph
 from nao_core.commands.sync.providers.databases.provider import sync_database
 
 
@@ -170,6 +171,38 @@ class BaseSyncIntegrationTests:
 
         assert rows == spec.orders_preview_rows
 
+    # ── catalog.jsonl ────────────────────────────────────────────────
+
+    def test_catalog_lists_synced_tables(self, synced, spec):
+        _, output, config = synced
+        db_path = output / f"type={spec.db_type}" / f"database={config.get_database_name()}"
+        entries = {
+            entry["table"]: entry for entry in map(json.loads, (db_path / "catalog.jsonl").read_text().splitlines())
+        }
+
+        assert set(entries) == {spec.users_table, spec.orders_table}
+        users = entries[spec.users_table]
+        assert users["schema"] == spec.primary_schema
+        assert users["row_count"] == 3
+        assert len(users["columns"]) == 4
+        assert users["files"] == [
+            f"schema={spec.primary_schema}/table={spec.users_table}/{name}"
+            for name in ("columns.md", "description.md", "preview.md")
+        ]
+
+    def test_join_graph_links_orders_to_users(self, synced, spec):
+        _, output, config = synced
+        db_path = output / f"type={spec.db_type}" / f"database={config.get_database_name()}"
+        graph = JoinGraph.load(db_path / "joins.json")
+
+        path = graph.shortest_path(spec.orders_table, spec.users_table)
+
+        assert path is not None
+        [edge] = path
+
+        assert edge.target == f"{spec.primary_schema}.{spec.users_table}"
+        assert [(a.lower(), b.lower()) for a, b in edge.on] == [("user_id", "id")]
+
     # ── sync state ───────────────────────────────────────────────────
 
     def test_sync_state_tracks_schemas_and_tables(self, synced, spec):
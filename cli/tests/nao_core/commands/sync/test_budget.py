@@ -0,0 +1,171 @@
+"""Unit tests for database sync time budgets."""
+
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from nao_core.commands.sync.providers.databases.budget import SyncBudget, run_with_timeout
+from nao_core.commands.sync.providers.databases.provider import sync_database
+from nao_core.config.databases.base import DatabaseAccessor, DigestConfig
+
+
+class TestRunWithTimeout:
+    def test_returns_result(self):
+        assert run_with_timeout(lambda: 42, 1.0) == 42
+
+    def test_without_timeout_runs_inline(self):
+        assert run_with_timeout(lambda: "inline", None) == "inline"
+
+    def test_raises_on_timeout(self):
+        with pytest.raises(TimeoutError, match="timed out after 0.05s"):
+            run_with_timeout(lambda: time.sleep(1), 0.05)
+
+    def test_calls_on_abandoned_once_the_call_returns(self):
+        returned = threading.Event()
+        abandoned = MagicMock(side_effect=lambda: returned.set())
+
+        assert run_with_timeout(lambda: 42, 1.0, on_abandoned=abandoned) == 42
+        with pytest.raises(TimeoutError):
+            run_with_timeout(lambda: time.sleep(0.2), 0.05, on_abandoned=abandoned)
+
+        assert returned.wait(2)
+        abandoned.assert_called_once_with()
+
+    def test_propagates_errors(self):
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            run_with_timeout(fail, 1.0)
+
+
+class TestSyncBudget:
+    def test_no_limits(self):
+        budget = SyncBudget()
+
+        assert budget.timeout_for("preview") is None
+        assert not budget.expired
+
+    def test_accessor_timeout_is_capped_by_deadline(self):
+        budget = SyncBudget({"preview": 30.0}, deadline=5.0)
+
+        preview, columns = budget.timeout_for("preview"), budget.timeout_for("columns")
+        assert preview is not None and preview <= 5.0
+        assert columns is not None and columns <= 5.0
+
+    def test_accessor_timeout_without_deadline(self):
+        budget = SyncBudget({"preview": 30.0})
+
+        assert budget.timeout_for("preview") == 30.0
+        assert budget.timeout_for("columns") is None
+
+    def test_expired_deadline(self):
+        assert SyncBudget(deadline=0).expired
+
+
+class TestSyncDatabaseBudget:
+    def _make_db_config(self, accessor_timeouts=None, sync_deadline=None):
+        db_config = MagicMock()
+        db_config.name = "test_db"
+        db_config.type = "duckdb"
+        db_config.include = []
+        db_config.exclude = []
+        db_config.accessors = list(DatabaseAccessor)
+        db_config.accessor_timeouts = accessor_timeouts or {}
+        db_config.sync_deadline = sync_deadline
+        db_config.digest = DigestConfig()
+        db_config.get_database_name.return_value = "test"
+        db_config.get_schemas.return_value = ["public"]
+        db_config.matches_pattern.return_value = True
+        db_config.connect.return_value.list_tables.return_value = ["users", "orders"]
+        return db_config
+
+    def _run(self, db_config, engine, tmp_path: Path):
+        with patch("nao_core.commands.sync.providers.databases.provider.console"):
+            with patch("nao_core.commands.sync.providers.databases.provider.get_template_engine", return_value=engine):
+                return sync_database(db_config, tmp_path, MagicMock(), None)
+
+    def test_slow_accessor_produces_degraded_output(self, tmp_path: Path):
+        def render(template_name, db, table_name, dataset):
+            if template_name.endswith("preview.md.j2") and table_name == "orders":
+                time.sleep(1)
+            return f"# {table_name}"
+
+        engine = MagicMock()
+        engine.list_templates.return_value = ["databases/columns.md.j2", "databases/preview.md.j2"]
+        engine.render.side_effect = render
+        db_config = self._make_db_config(accessor_timeouts={DatabaseAccessor.PREVIEW: 0.05})
+
+        state = self._run(db_config, engine, tmp_path)
+
+        table_path = tmp_path / "type=duckdb" / "database=test" / "schema=public" / "table=orders"
+        assert state.files_timed_out == 1
+        assert "Preview unavailable: timed out after 0.05s" in (table_path / "preview.md").read_text()
+        assert (table_path / "columns.md").read_text() == "# orders"
+
+    def test_tables_past_deadline_keep_previous_output(self, tmp_path: Path):
+        engine = MagicMock()
+        engine.list_templates.return_value = ["databases/columns.md.j2"]
+        engine.render.side_effect = lambda template_name, db, table_name, dataset: f"# {table_name} v1"
+        self._run(self._make_db_config(), engine, tmp_path)
+
+        engine.render.side_effect = lambda template_name, db, table_name, dataset: f"# {table_name} v2"
+        state = self._run(self._make_db_config(sync_deadline=0), engine, tmp_path)
+
+        schema_path = tmp_path / "type=duckdb" / "database=test" / "schema=public"
+        assert state.tables_deferred == 2
+        assert state.stale_removed == 0
+        assert (schema_path / "table=users" / "columns.md").read_text() == "# users v1"
+        assert (schema_path / "table=orders" / "columns.md").read_text() == "# orders v1"
+
+    def test_timed_out_render_leaves_its_connection_behind(self, tmp_path: Path):
+        connections = []
+        used: dict[str, list] = {}
+
+        def connect():
+            conn = MagicMock()
+            conn.list_tables.return_value = ["users", "orders"]
+            connections.append(conn)
+            return conn
+
+        def render(template_name, db, table_name, dataset):
+            used.setdefault(table_name, []).append(db._conn)
+            if template_name.endswith("preview.md.j2") and table_name == "users":
+                time.sleep(1)
+            return f"# {table_name}"
+
+        engine = MagicMock()
+        engine.list_templates.return_value = ["databases/preview.md.j2", "databases/columns.md.j2"]
+        engine.render.side_effect = render
+        db_config = self._make_db_config(accessor_timeouts={DatabaseAccessor.PREVIEW: 0.05})
+        db_config.connect.side_effect = connect
+        db_config.create_context = None
+
+        self._run(db_config, engine, tmp_path)
+
+        first, second = connections
+        db_config.interrupt.assert_called_once_with(first)
+        assert used == {"users": [first, second], "orders": [second, second]}
+        # The abandoned connection is closed once the timed out render returns
+        deadline = time.monotonic() + 3
+        while not first.disconnect.called and time.monotonic() < deadline:
+            time.sleep(0.05)
+        first.disconnect.assert_called_once_with()
+        second.disconnect.assert_not_called()
+
+    def test_foreign_keys_are_bounded_by_the_deadline(self, tmp_path: Path):
+        engine = MagicMock()
+        engine.list_templates.return_value = ["databases/columns.md.j2"]
+        engine.render.side_effect = lambda template_name, db, table_name, dataset: f"# {table_name}"
+        db_config = self._make_db_config(sync_deadline=0.5)
+        db_config.fetch_foreign_keys.side_effect = lambda conn, schema: time.sleep(3) or []
+
+        started = time.monotonic()
+        state = self._run(db_config, engine, tmp_path)
+
+        assert time.monotonic() - started < 2
+        assert state.tables_synced == 2
+        db_config.interrupt.assert_called_once()
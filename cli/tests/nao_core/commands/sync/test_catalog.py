@@ -0,0 +1,93 @@
+"""Unit tests for the per-database catalog index."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from nao_core.commands.sync.catalog import (
+    append_catalog_entry,
+    build_catalog_entry,
+    get_catalog_path,
+    read_catalog,
+    write_catalog,
+)
+from nao_core.memo import MemoizedContext, memoized
+
+
+class _Context(MemoizedContext):
+    def __init__(self):
+        self.calls: list[str] = []
+
+    @memoized
+    def columns(self):
+        self.calls.append("columns")
+        return [{"name": "id", "type": "int64", "nullable": False, "description": None, "extra": 1}]
+
+    @memoized
+    def row_count(self):
+        self.calls.append("row_count")
+        return 42
+
+    @memoized
+    def description(self):
+        raise RuntimeError("no comments")
+
+
+class TestBuildCatalogEntry:
+    def test_reads_metadata_from_context(self):
+        ctx = _Context()
+        ctx.row_count()
+
+        entry = build_catalog_entry("public", "users", ["schema=public/table=users/columns.md"], ctx)
+
+        assert entry == {
+            "schema": "public",
+            "table": "users",
+            "description": None,
+            "row_count": 42,
+            "columns": [{"name": "id", "type": "int64", "nullable": False, "description": None}],
+            "files": ["schema=public/table=users/columns.md"],
+        }
+
+    def test_does_not_count_rows_itself(self):
+        ctx = _Context()
+
+        entry = build_catalog_entry("public", "users", [], ctx)
+
+        assert entry["row_count"] is None
+        assert ctx.calls == ["columns"]
+
+    def test_reports_missing_metadata_when_verbose(self):
+        with patch("nao_core.commands.sync.catalog.console") as console:
+            build_catalog_entry("public", "users", [], _Context())
+            assert not console.print.called
+
+            build_catalog_entry("public", "users", [], _Context(), verbose=True)
+
+        [message] = [call.args[0] for call in console.print.call_args_list]
+        assert "description" in message and "public.users" in message and "no comments" in message
+
+
+class TestCatalogFile:
+    def test_write_keeps_latest_entry_of_synced_tables_sorted(self, tmp_path: Path):
+        path = get_catalog_path(tmp_path)
+        append_catalog_entry(path, build_catalog_entry("public", "users", ["old.md"]))
+        append_catalog_entry(path, build_catalog_entry("public", "dropped", []))
+        append_catalog_entry(path, build_catalog_entry("public", "orders", []))
+        append_catalog_entry(path, build_catalog_entry("public", "users", ["new.md"]))
+
+        write_catalog(path, read_catalog(path).values(), {"public": {"users", "orders"}})
+
+        entries = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [(e["table"], e["files"]) for e in entries] == [("orders", []), ("users", ["new.md"])]
+
+    def test_read_ignores_truncated_line(self, tmp_path: Path):
+        path = get_catalog_path(tmp_path)
+        append_catalog_entry(path, build_catalog_entry("public", "users", []))
+        with path.open("a") as f:
+            f.write('{"schema": "pub')
+
+        assert list(read_catalog(path)) == [("public", "users")]
+
+    def test_read_missing_catalog(self, tmp_path: Path):
+        assert read_catalog(get_catalog_path(tmp_path)) == {}
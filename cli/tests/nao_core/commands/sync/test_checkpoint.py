@@ -0,0 +1,122 @@
+"""Unit tests for resumable database sync checkpoints."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from nao_core.commands.sync.checkpoint import SyncCheckpoint, get_checkpoint_path
+from nao_core.commands.sync.providers.databases.provider import sync_database
+from nao_core.commands.sync.staging import get_staging_path
+from nao_core.config.databases.base import DatabaseAccessor, DigestConfig
+
+
+class TestSyncCheckpoint:
+    def test_round_trip(self, tmp_path: Path):
+        path = tmp_path / ".database=test.checkpoint.jsonl"
+        checkpoint = SyncCheckpoint.start(path, "abc")
+        checkpoint.record_schemas(["public"])
+        checkpoint.record_schema("public", ["users", "orders", "events"])
+        checkpoint.record_table("public", "users", "started")
+        checkpoint.record_table("public", "users", "done")
+        checkpoint.record_table("public", "orders", "started")
+
+        loaded = SyncCheckpoint.load(path, "abc")
+
+        assert loaded is not None
+        assert loaded.schemas == ["public"]
+        assert loaded.schema_tables == {"public": ["users", "orders", "events"]}
+        assert loaded.is_done("public", "users")
+        assert not loaded.is_done("public", "orders")
+        assert loaded.unfinished_tables() == [("public", "orders")]
+        assert loaded.completed_count == 1
+
+    def test_load_ignores_checkpoint_with_other_settings(self, tmp_path: Path):
+        path = tmp_path / ".database=test.checkpoint.jsonl"
+        SyncCheckpoint.start(path, "abc")
+
+        assert SyncCheckpoint.load(path, "other") is None
+
+    def test_load_tolerates_truncated_last_line(self, tmp_path: Path):
+        path = tmp_path / ".database=test.checkpoint.jsonl"
+        checkpoint = SyncCheckpoint.start(path, "abc")
+        checkpoint.record_table("public", "users", "done")
+        with path.open("a") as f:
+            f.write('{"event": "table", "sch')
+
+        loaded = SyncCheckpoint.load(path, "abc")
+
+        assert loaded is not None
+        assert loaded.is_done("public", "users")
+
+
+class TestResumeSyncDatabase:
+    def _make_db_config(self):
+        db_config = MagicMock()
+        db_config.name = "test_db"
+        db_config.type = "duckdb"
+        db_config.include = []
+        db_config.exclude = []
+        db_config.accessors = list(DatabaseAccessor)
+        db_config.accessor_timeouts = {}
+        db_config.sync_deadline = None
+        db_config.digest = DigestConfig()
+        db_config.get_database_name.return_value = "test"
+        db_config.get_schemas.return_value = ["public"]
+        db_config.matches_pattern.return_value = True
+        db_config.connect.return_value.list_tables.return_value = ["users", "orders", "events"]
+        return db_config
+
+    def _run(self, db_config, engine, tmp_path: Path, resume: bool = False):
+        with patch("nao_core.commands.sync.providers.databases.provider.console"):
+            with patch("nao_core.commands.sync.providers.databases.provider.get_template_engine", return_value=engine):
+                return sync_database(db_config, tmp_path, MagicMock(), None, resume=resume)
+
+    def test_resume_continues_from_last_completed_table(self, tmp_path: Path):
+        db_config = self._make_db_config()
+        rendered: list[str] = []
+
+        def die_on_orders(template_name, db, table_name, dataset):
+            if table_name == "orders":
+                raise KeyboardInterrupt()
+            rendered.append(table_name)
+            return f"# {table_name}"
+
+        engine = MagicMock()
+        engine.list_templates.return_value = ["databases/columns.md.j2"]
+        engine.render.side_effect = die_on_orders
+
+        with pytest.raises(KeyboardInterrupt):
+            self._run(db_config, engine, tmp_path)
+
+        db_path = tmp_path / "type=duckdb" / "database=test"
+        assert not db_path.exists()
+        assert get_staging_path(db_path).exists()
+        assert get_checkpoint_path(db_path).exists()
+
+        rendered.clear()
+        engine.render.side_effect = lambda template_name, db, table_name, dataset: rendered.append(table_name) or ""
+        state = self._run(db_config, engine, tmp_path, resume=True)
+
+        # The unfinished table is retried first and completed tables are not re-rendered
+        assert rendered == ["orders", "events"]
+        assert state.tables_synced == 3
+        assert (db_path / "schema=public" / "table=users" / "columns.md").read_text() == "# users"
+        assert not get_staging_path(db_path).exists()
+        assert not get_checkpoint_path(db_path).exists()
+
+    def test_without_resume_starts_over(self, tmp_path: Path):
+        db_config = self._make_db_config()
+        engine = MagicMock()
+        engine.list_templates.return_value = ["databases/columns.md.j2"]
+        engine.render.side_effect = KeyboardInterrupt()
+
+        with pytest.raises(KeyboardInterrupt):
+            self._run(db_config, engine, tmp_path)
+
+        engine.render.side_effect = None
+        engine.render.return_value = ""
+        state = self._run(db_config, engine, tmp_path)
+
+        assert engine.render.call_count == 4
+        assert state.tables_synced == 3
@@ -1,10 +1,20 @@
 """Unit tests for DatabaseContext."""
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
+import ibis
 import pandas as pd
+import pytest
 
 from nao_core.commands.sync.providers.databases.context import DatabaseContext
+from nao_core.config.databases.base import ColumnProfileConfig, DatabaseAccessor
+from nao_core.config.databases.redshift import RedshiftDatabaseContext
+from nao_core.memo import MemoizedContext, memoized
+
+
+class _Uncopyable:
+    def __deepcopy__(self, memo):
+        raise TypeError("cannot copy")
 
 
 class TestDatabaseContext:
@@ -43,6 +53,24 @@ class TestDatabaseContext:
         assert rows[0]["name"] == "Alice"
         mock_table.limit.assert_called_once_with(2)
 
+    def test_preview_falls_through_empty_plan_steps(self):
+        ctx, mock_table = self._make_context()
+        empty, limited = MagicMock(), MagicMock()
+        empty.execute.return_value = pd.DataFrame({"id": []})
+        limited.execute.return_value = pd.DataFrame({"id": [1]})
+        ctx = DatabaseContext(ctx._conn, "my_schema", "my_table", preview_plan=lambda table, limit: [empty, limited])
+
+        assert ctx.preview() == [{"id": 1}]
+
+    def test_preview_falls_through_failing_plan_steps(self):
+        ctx, _ = self._make_context()
+        failing, limited = MagicMock(), MagicMock()
+        failing.execute.side_effect = RuntimeError("partition filter required")
+        limited.execute.return_value = pd.DataFrame({"id": [1]})
+        ctx = DatabaseContext(ctx._conn, "my_schema", "my_table", preview_plan=lambda table, limit: [failing, limited])
+
+        assert ctx.preview() == [{"id": 1}]
+
     def test_row_count(self):
         ctx, mock_table = self._make_context()
         mock_table.count.return_value.execute.return_value = 42
@@ -72,3 +100,166 @@ class TestDatabaseContext:
         _ = ctx.table
         _ = ctx.table
         mock_conn.table.assert_called_once()
+
+    def test_accessors_are_memoized(self):
+        ctx, mock_table = self._make_context()
+        mock_table.count.return_value.execute.return_value = 42
+        mock_table.limit.return_value.execute.return_value = pd.DataFrame({"id": [1]})
+
+        ctx.columns()
+        ctx.columns()
+        ctx.row_count()
+        ctx.row_count()
+        ctx.preview()
+        ctx.preview(limit=None)
+
+        mock_table.schema.assert_called_once()
+        mock_table.count.assert_called_once()
+        mock_table.limit.assert_called_once_with(10)
+
+    def test_memoized_results_are_copies(self):
+        ctx, _ = self._make_context()
+
+        ctx.columns()[0]["name"] = "changed"
+        ctx.columns().pop()
+
+        assert [column["name"] for column in ctx.columns()] == ["id", "name"]
+
+    def test_uncopyable_results_are_not_fetched_again(self):
+        class _Context(MemoizedContext):
+            calls = 0
+
+            @memoized
+            def handle(self):
+                self.calls += 1
+                return _Uncopyable()
+
+        ctx = _Context()
+
+        with pytest.raises(TypeError):
+            ctx.handle()
+        with pytest.raises(TypeError):
+            ctx.handle()
+        assert ctx.calls == 1
+
+    def test_preview_is_memoized_per_limit(self):
+        ctx, mock_table = self._make_context()
+        mock_table.limit.return_value.execute.return_value = pd.DataFrame({"id": [1]})
+
+        ctx.preview(limit=5)
+        ctx.preview(limit=10)
+
+        assert mock_table.limit.call_count == 2
+
+    def test_invalidate_accessor(self):
+        ctx, mock_table = self._make_context()
+        mock_table.count.return_value.execute.return_value = 42
+
+        ctx.row_count()
+        ctx.columns()
+        ctx.invalidate("row_count")
+        ctx.row_count()
+        ctx.columns()
+
+        assert mock_table.count.call_count == 2
+        mock_table.schema.assert_called_once()
+
+    def test_invalidate_all_refetches_table(self):
+        mock_conn = MagicMock()
+        ctx = DatabaseContext(mock_conn, "schema", "table")
+
+        ctx.columns()
+        ctx.invalidate()
+        ctx.columns()
+
+        assert mock_conn.table.call_count == 2
+
+
+class TestDatabaseContextProfile:
+    def _make_context(self, **settings):
+        conn = ibis.duckdb.connect()
+        conn.raw_sql(
+            "CREATE TABLE events AS SELECT range AS id, "
+            "CASE WHEN range % 4 = 0 THEN NULL ELSE 'kind_' || (range % 2)::VARCHAR END AS kind "
+            "FROM range(100)"
+        )
+        return DatabaseContext(conn, "main", "events", column_profile=ColumnProfileConfig(**settings))
+
+    def test_profile_columns(self):
+        profile = self._make_context().profile()
+
+        assert profile["row_count"] == 100
+        assert profile["rows_profiled"] == 100
+        assert not profile["sampled"]
+        id_col, kind_col = profile["columns"]
+        assert id_col["null_pct"] == 0
+        assert (id_col["min"], id_col["max"]) == (0, 99)
+        assert id_col["top_values"] == []
+        assert kind_col["null_pct"] == 25
+        assert kind_col["distinct"] == 2
+        assert kind_col["top_values"] == [{"value": "kind_1", "count": 50}, {"value": "kind_0", "count": 25}]
+
+    def test_profile_caps_columns(self):
+        profile = self._make_context(max_columns=1).profile()
+
+        assert profile["column_count"] == 2
+        assert [col["name"] for col in profile["columns"]] == ["id"]
+
+    def test_profile_samples_large_tables(self):
+        profile = self._make_context(sample_rows=10).profile()
+
+        assert profile["sampled"]
+        assert profile["row_count"] == 100
+        assert profile["rows_profiled"] < 100
+
+    def test_profile_counts_rows_in_the_aggregate_without_sampling(self):
+        ctx = self._make_context(sample_rows=None)
+
+        profile = ctx.profile()
+
+        assert profile["row_count"] == profile["rows_profiled"] == 100
+        assert not ctx.is_memoized("row_count")
+
+    def test_profile_skips_top_values_without_low_cardinality_columns(self):
+        ctx = self._make_context(low_cardinality_threshold=1)
+
+        with patch.object(DatabaseContext, "_top_values") as top_values:
+            profile = ctx.profile()
+
+        top_values.assert_not_called()
+        assert all(col["top_values"] == [] for col in profile["columns"])
+
+    def test_profile_accessor_is_opt_in(self):
+        assert DatabaseAccessor.PROFILE in list(DatabaseAccessor)
+        assert DatabaseAccessor.PROFILE not in DatabaseAccessor.defaults()
+
+
+class TestRedshiftDatabaseContext:
+    def test_preview_reuses_memoized_columns(self):
+        mock_conn = MagicMock()
+        mock_conn.raw_sql.return_value.fetchall.return_value = [("id", "integer", "NO", None, 32, 0)]
+        ctx = RedshiftDatabaseContext(mock_conn, "public", "users")
+
+        ctx.columns()
+        queries_after_columns = mock_conn.raw_sql.call_count
+        ctx.preview()
+        ctx.column_count()
+        ctx.columns()
+
+        # Only the preview query itself is issued after the columns were fetched
+        assert mock_conn.raw_sql.call_count == queries_after_columns + 1
+
+    def test_description_is_fetched_once(self):
+        mock_conn = MagicMock()
+        mock_conn.raw_sql.return_value.fetchone.return_value = ("Users table",)
+        ctx = RedshiftDatabaseContext(mock_conn, "public", "users")
+
+        assert ctx.description() == "Users table"
+        assert ctx.description() == "Users table"
+        mock_conn.raw_sql.assert_called_once()
+
+    def test_profile_is_not_supported(self):
+        ctx = RedshiftDatabaseContext(MagicMock(), "public", "users")
+
+        with pytest.raises(NotImplementedError, match="Redshift"):
+            ctx.profile()
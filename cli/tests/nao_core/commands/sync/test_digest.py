@@ -0,0 +1,78 @@
+"""Unit tests for the token-budgeted database digests."""
+
+from pathlib import Path
+
+from nao_core.commands.sync.catalog import build_catalog_entry
+from nao_core.commands.sync.digest import (
+    DIGEST_FILENAME,
+    build_digest,
+    estimate_tokens,
+    format_table_line,
+    write_digests,
+)
+from nao_core.config.databases.base import DigestConfig
+
+
+def _entry(schema: str, table: str, columns: int = 3, row_count: int | None = 1200) -> dict:
+    entry = build_catalog_entry(schema, table, [])
+    entry["row_count"] = row_count
+    entry["columns"] = [{"name": f"col_{i}", "type": "string"} for i in range(columns)]
+    entry["columns"].insert(1, {"name": "user_id", "type": "int64 NOT NULL"})
+    return entry
+
+
+class TestFormatTableLine:
+    def test_lists_key_columns_first(self):
+        line = format_table_line(_entry("public", "orders"), max_columns=8)
+
+        assert line == "- orders (1,200 rows): user_id int64, col_0 string, col_1 string, col_2 string"
+
+    def test_caps_columns(self):
+        line = format_table_line(_entry("public", "orders", columns=10), max_columns=2)
+
+        assert line == "- orders (1,200 rows): user_id int64, col_0 string, +9 more"
+
+    def test_without_metadata(self):
+        assert format_table_line(build_catalog_entry("public", "orders", []), max_columns=8) == "- orders"
+
+
+class TestBuildDigest:
+    def test_groups_tables_by_schema(self):
+        entries = [_entry("sales", "orders"), _entry("crm", "users"), _entry("crm", "accounts")]
+
+        digest = build_digest("warehouse", entries, DigestConfig())
+
+        assert digest.startswith("# warehouse\n\n3 tables across 2 schemas.")
+        assert digest.index("## crm (2 tables)") < digest.index("- accounts") < digest.index("- users")
+        assert digest.index("## sales (1 tables)") < digest.index("- orders")
+
+    def test_drops_columns_before_tables_to_fit_budget(self):
+        entries = [_entry("public", f"table_{i}", columns=30) for i in range(20)]
+        full = build_digest("db", entries, DigestConfig(token_budget=100_000))
+
+        digest = build_digest("db", entries, DigestConfig(token_budget=estimate_tokens(full) // 2))
+
+        assert estimate_tokens(digest) <= estimate_tokens(full) // 2
+        assert digest.count("\n- table_") == 20
+        assert "+" in digest
+
+    def test_summarizes_tables_when_columns_are_not_enough(self):
+        entries = [_entry("public", f"table_{i:03}") for i in range(200)]
+
+        digest = build_digest("db", entries, DigestConfig(token_budget=300), link_schemas=True)
+
+        assert estimate_tokens(digest) <= 300
+        assert "- table_000 (1,200 rows, 4 columns)\n" in digest
+        assert "more tables, see `schema=public/digest.md`" in digest
+
+
+class TestWriteDigests:
+    def test_writes_database_and_schema_digests(self, tmp_path: Path):
+        entries = [_entry("sales", "orders"), _entry("crm", "users")]
+
+        write_digests(tmp_path, "warehouse", entries, DigestConfig())
+
+        assert "## sales" in (tmp_path / DIGEST_FILENAME).read_text()
+        schema_digest = (tmp_path / "schema=crm" / DIGEST_FILENAME).read_text()
+        assert schema_digest.startswith("# warehouse.crm\n\n1 tables.")
+        assert "orders" not in schema_digest
@@ -0,0 +1,165 @@
+"""Unit tests for the join graph built at sync time."""
+
+import time
+from pathlib import Path
+
+import duckdb
+import ibis
+import pytest
+
+from nao_core.commands.sync.joins import (
+    FOREIGN_KEY,
+    INFERRED,
+    JoinEdge,
+    JoinGraph,
+    build_join_graph,
+    declared_foreign_keys,
+    format_join_path,
+    get_joins_path,
+    write_join_graph,
+)
+from nao_core.config.databases.base import ForeignKeyColumn
+from nao_core.config.databases.duckdb import DuckDBConfig
+
+
+def _entry(schema: str, table: str, *columns: str) -> dict:
+    return {
+        "schema": schema,
+        "table": table,
+        "columns": [{"name": name, "type": "int64 NOT NULL" if "id" in name else "string"} for name in columns],
+    }
+
+
+ENTRIES = [
+    _entry("sales", "orders", "id", "customer_id", "currency_id", "note"),
+    _entry("sales", "customers", "id", "country_id"),
+    _entry("ref", "countries", "id", "name"),
+    _entry("ref", "dim_currencies", "currency_id", "code"),
+]
+
+
+class TestBuildJoinGraph:
+    def test_infers_joins_from_column_names(self):
+        graph = build_join_graph(ENTRIES, {})
+
+        assert set(graph.edges) == {
+            JoinEdge("sales.orders", "sales.customers", (("customer_id", "id"),), INFERRED),
+            JoinEdge("sales.customers", "ref.countries", (("country_id", "id"),), INFERRED),
+            JoinEdge("sales.orders", "ref.dim_currencies", (("currency_id", "currency_id"),), INFERRED),
+        }
+
+    def test_scales_to_many_tables(self):
+        entries = [_entry("s", f"table_{i}", "id", f"table_{i - 1}_id", "customer_id") for i in range(20_000)]
+        entries.append(_entry("s", "customers", "id"))
+
+        started = time.monotonic()
+        graph = build_join_graph(entries, {})
+
+        assert time.monotonic() - started < 10
+        assert len(graph.edges) == 2 * 20_000 - 1
+
+    def test_skips_incompatible_types(self):
+        entries = [_entry("s", "orders", "customer_id"), _entry("s", "customers", "name")]
+        entries[1]["columns"] = [{"name": "id", "type": "string"}]
+
+        assert build_join_graph(entries, {}).edges == []
+
+    def test_declared_foreign_keys_replace_inferred_joins(self):
+        foreign_keys = {
+            "sales": [
+                ForeignKeyColumn("fk_buyer", "orders", "customer_id", "sales", "customers", "id"),
+                ForeignKeyColumn("fk_gone", "orders", "note", "sales", "unsynced", "id"),
+            ]
+        }
+
+        graph = build_join_graph(ENTRIES, foreign_keys, {"sales": {"orders", "customers"}, "ref": {"countries"}})
+
+        orders_edges = [edge for edge in graph.edges if edge.source == "sales.orders"]
+        assert JoinEdge("sales.orders", "sales.customers", (("customer_id", "id"),), FOREIGN_KEY) in orders_edges
+        assert not any(edge.target == "sales.unsynced" for edge in graph.edges)
+        assert sum(edge.target == "sales.customers" for edge in orders_edges) == 1
+
+    def test_groups_multi_column_foreign_keys(self):
+        foreign_keys = {
+            "s": [
+                ForeignKeyColumn("fk", "lines", "order_id", "s", "orders", "id"),
+                ForeignKeyColumn("fk", "lines", "order_version", "s", "orders", "version"),
+            ]
+        }
+
+        [edge] = build_join_graph([], foreign_keys, None).edges
+
+        assert edge.on == (("order_id", "id"), ("order_version", "version"))
+        assert declared_foreign_keys(JoinGraph(edges=[edge])) == {
+            "s": [
+                ForeignKeyColumn("fk_0", "lines", "order_id", "s", "orders", "id"),
+                ForeignKeyColumn("fk_0", "lines", "order_version", "s", "orders", "version"),
+            ]
+        }
+
+
+class TestJoinGraph:
+    def test_shortest_path_follows_edges_in_both_directions(self):
+        graph = build_join_graph(ENTRIES, {})
+
+        path = graph.shortest_path("countries", "orders")
+
+        assert path is not None
+        assert [edge.target for edge in path] == ["sales.customers", "sales.orders"]
+        assert format_join_path(path) == (
+            "FROM ref.countries\n"
+            "JOIN sales.customers ON ref.countries.id = sales.customers.country_id\n"
+            "JOIN sales.orders ON sales.customers.id = sales.orders.customer_id"
+        )
+
+    def test_shortest_path_prefers_declared_joins(self):
+        graph = JoinGraph(
+            tables={"s.a", "s.b", "s.c"},
+            edges=[
+                JoinEdge("s.a", "s.c", (("c_id", "id"),), INFERRED),
+                JoinEdge("s.a", "s.c", (("other_c", "id"),), FOREIGN_KEY),
+            ],
+        )
+
+        path = graph.shortest_path("s.a", "s.c")
+        assert path is not None
+        assert path[0].kind == FOREIGN_KEY
+        assert graph.shortest_path("s.a", "s.a") == []
+        assert graph.shortest_path("s.a", "s.b") is None
+
+    def test_resolve_requires_unique_table_names(self):
+        graph = JoinGraph(tables={"a.users", "b.users", "a.orders"})
+
+        assert graph.resolve("orders") == "a.orders"
+        with pytest.raises(KeyError, match="ambiguous"):
+            graph.resolve("users")
+        with pytest.raises(KeyError, match="not found"):
+            graph.resolve("missing")
+
+    def test_round_trips_through_file(self, tmp_path: Path):
+        graph = build_join_graph(ENTRIES, {})
+
+        write_join_graph(get_joins_path(tmp_path), graph)
+        loaded = JoinGraph.load(get_joins_path(tmp_path))
+
+        assert loaded.tables == graph.tables
+        assert set(loaded.edges) == set(graph.edges)
+
+
+class TestFetchForeignKeys:
+    def test_reads_information_schema(self, tmp_path: Path):
+        path = tmp_path / "shop.duckdb"
+        with duckdb.connect(str(path)) as conn:
+            conn.execute("CREATE TABLE customers (id INTEGER PRIMARY KEY)")
+            conn.execute("CREATE TABLE orders (id INTEGER, customer_id INTEGER REFERENCES customers (id))")
+        config = DuckDBConfig(name="shop", path=str(path))
+
+        [key] = config.fetch_foreign_keys(ibis.duckdb.connect(str(path), read_only=True), "main")
+
+        assert (key.table, key.column, key.ref_schema, key.ref_table, key.ref_column) == (
+            "orders",
+            "customer_id",
+            "main",
+            "customers",
+            "id",
+        )
@@ -0,0 +1,108 @@
+"""Unit tests for manifest-driven stale cleanup."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from nao_core.commands.sync.manifest import MANIFEST_FILENAME, OutputManifest
+from nao_core.commands.sync.providers.databases.provider import DatabaseSyncProvider
+from nao_core.commands.sync.providers.repositories.provider import RepositorySyncProvider
+from nao_core.config.repos import RepoConfig
+
+
+class TestOutputManifest:
+    def test_load_without_manifest(self, tmp_path: Path):
+        manifest = OutputManifest.load(tmp_path)
+
+        assert manifest.paths == set()
+        assert not manifest.exists
+
+    def test_save_and_load(self, tmp_path: Path):
+        manifest = OutputManifest(tmp_path)
+        manifest.add(["b.md", "a.md"])
+        manifest.save()
+
+        loaded = OutputManifest.load(tmp_path)
+        assert loaded.exists
+        assert loaded.paths == {"a.md", "b.md"}
+
+    def test_ignores_paths_outside_output_folder(self, tmp_path: Path):
+        (tmp_path / MANIFEST_FILENAME).write_text('{"paths": ["../secret", "/etc/passwd", "ok.md"]}')
+
+        assert OutputManifest.load(tmp_path).paths == {"ok.md"}
+
+    def test_remove_stale_only_deletes_owned_paths(self, tmp_path: Path):
+        (tmp_path / "type=postgres" / "database=old" / "schema=public").mkdir(parents=True)
+        (tmp_path / "type=duckdb" / "database=kept").mkdir(parents=True)
+        (tmp_path / "type=duckdb" / "notes").mkdir(parents=True)
+        (tmp_path / "stale.md").write_text("old page")
+        manifest = OutputManifest(tmp_path, {"type=postgres/database=old", "type=duckdb/database=kept", "stale.md"})
+
+        removed = manifest.remove_stale({"type=duckdb/database=kept"})
+
+        assert removed == 2
+        assert manifest.paths == {"type=duckdb/database=kept"}
+        assert not (tmp_path / "type=postgres").exists()
+        assert not (tmp_path / "stale.md").exists()
+        assert (tmp_path / "type=duckdb" / "database=kept").is_dir()
+        assert (tmp_path / "type=duckdb" / "notes").is_dir()
+
+    def test_remove_stale_skips_missing_paths(self, tmp_path: Path):
+        manifest = OutputManifest(tmp_path, {"gone.md"})
+
+        assert manifest.remove_stale(set()) == 0
+        assert manifest.paths == set()
+
+
+class TestProviderCleanup:
+    def test_repositories_keep_folders_they_did_not_clone(self, tmp_path: Path):
+        for name in ("repo1", "old_repo", "user_checkout"):
+            (tmp_path / name).mkdir()
+        OutputManifest(tmp_path, {"repo1", "old_repo"}).save()
+        config = MagicMock()
+        config.repos = [RepoConfig(name="repo1", url="https://example.com/repo1.git")]
+
+        with patch("nao_core.commands.sync.manifest.console"):
+            RepositorySyncProvider().pre_sync(config, tmp_path)
+
+        assert sorted(p.name for p in tmp_path.iterdir() if p.is_dir()) == ["repo1", "user_checkout"]
+        assert OutputManifest.load(tmp_path).paths == {"repo1"}
+
+    def test_repositories_record_synced_repos(self, tmp_path: Path):
+        repos = [RepoConfig(name="repo1", url="https://example.com/repo1.git")]
+
+        with patch("nao_core.commands.sync.providers.repositories.provider.clone_or_pull_repo", return_value=True):
+            with patch("nao_core.commands.sync.providers.repositories.provider.console"):
+                RepositorySyncProvider().sync(repos, tmp_path)
+
+        assert OutputManifest.load(tmp_path).paths == {"repo1"}
+
+    def test_databases_remove_only_unconfigured_databases_from_manifest(self, tmp_path: Path):
+        (tmp_path / "type=duckdb" / "database=kept").mkdir(parents=True)
+        (tmp_path / "type=duckdb" / "database=old").mkdir(parents=True)
+        (tmp_path / "type=postgres" / "database=manual").mkdir(parents=True)
+        OutputManifest(tmp_path, {"type=duckdb/database=kept", "type=duckdb/database=old"}).save()
+        db = MagicMock()
+        db.type = "duckdb"
+        db.get_database_name.return_value = "kept"
+        config = MagicMock()
+        config.databases = [db]
+
+        with patch("nao_core.commands.sync.manifest.console"):
+            DatabaseSyncProvider().pre_sync(config, tmp_path)
+
+        assert (tmp_path / "type=duckdb" / "database=kept").is_dir()
+        assert not (tmp_path / "type=duckdb" / "database=old").exists()
+        assert (tmp_path / "type=postgres" / "database=manual").is_dir()
+
+    def test_databases_remove_staging_and_checkpoint_of_removed_databases(self, tmp_path: Path):
+        (tmp_path / "type=duckdb" / "database=old").mkdir(parents=True)
+        (tmp_path / "type=duckdb" / ".database=old.staging" / "schema=main").mkdir(parents=True)
+        (tmp_path / "type=duckdb" / ".database=old.checkpoint.jsonl").write_text("{}\n")
+        OutputManifest(tmp_path, {"type=duckdb/database=old"}).save()
+        config = MagicMock()
+        config.databases = []
+
+        with patch("nao_core.commands.sync.manifest.console"):
+            DatabaseSyncProvider().pre_sync(config, tmp_path)
+
+        assert not (tmp_path / "type=duckdb").exists()
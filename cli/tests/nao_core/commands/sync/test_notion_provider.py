@@ -0,0 +1,422 @@
+"""Unit tests for the Notion sync provider."""
+
+import json
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from nao_core.commands.sync.providers.notion import tables
+from nao_core.commands.sync.providers.notion.cache import CachedPage, NotionPageCache
+from nao_core.commands.sync.providers.notion.client import (
+    NOTION_API_URL_ENV,
+    RateLimitedTransport,
+    TokenBucket,
+    create_client,
+    parse_retry_after,
+)
+from nao_core.commands.sync.providers.notion.provider import NotionSyncProvider, export_page
+from nao_core.config.notion import NotionConfig
+from nao_core.templates.context import NotionProvider
+
+from .fake_notion import FakeDatabase, FakeNotionServer, FakePage
+
+PAGE_ID = "2bfc7a70bc0680978900d1e85ece83a0"
+EDITED = "2024-05-01T10:00:00.000Z"
+CHILDREN = f"/v1/blocks/{PAGE_ID}/children"
+
+
+def _page_id(i: int) -> str:
+    return f"{i:032x}"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def notion(monkeypatch):
+    with FakeNotionServer({PAGE_ID: FakePage("Road Map", ["Hello", "![logo](https://img)"])}) as server:
+        monkeypatch.setenv(NOTION_API_URL_ENV, server.url)
+        yield server
+
+
+class TestExportPage:
+    def test_reuses_export_of_unedited_page(self, tmp_path: Path, notion):
+        cache = NotionPageCache(tmp_path)
+
+        first = export_page(PAGE_ID, "key", cache)
+        second = export_page(PAGE_ID, "key", cache)
+
+        assert notion.count(CHILDREN) == 1
+        assert first == second
+        assert (first.title, first.markdown) == ("Road Map", "Hello\n\n[image]\n\n")
+
+    def test_exports_again_when_page_was_edited(self, tmp_path: Path, notion):
+        cache = NotionPageCache(tmp_path)
+        export_page(PAGE_ID, "key", cache)
+        notion.pages[PAGE_ID] = FakePage("Road Map", ["Updated"], "2024-06-01T10:00:00.000Z")
+
+        assert export_page(PAGE_ID, "key", cache).markdown == "Updated\n\n"
+        assert notion.count(CHILDREN) == 2
+
+    def test_lists_every_block_of_long_pages(self, notion):
+        notion.pages[PAGE_ID] = FakePage("Long", [f"line {i}" for i in range(150)])
+
+        markdown = export_page(PAGE_ID, "key").markdown
+
+        assert markdown.count("line ") == 150
+        assert notion.count(CHILDREN) == 2
+
+    def test_does_not_cache_export_missing_blocks(self, tmp_path: Path, notion):
+        cache = NotionPageCache(tmp_path)
+        notion.pages[PAGE_ID] = FakePage("Road Map", ["Hello"], toggles={"Details": ["Nested"]})
+        notion.failing = {f"/v1/blocks/{PAGE_ID}-1/children"}
+        client = create_client("key", TokenBucket(1000))
+
+        assert "Nested" not in export_page(PAGE_ID, "key", cache, client).markdown
+        assert cache.get(PAGE_ID, EDITED) is None
+
+        notion.failing = set()
+        assert "Nested" in export_page(PAGE_ID, "key", cache, client).markdown
+        assert cache.get(PAGE_ID, EDITED) is not None
+
+    def test_ignores_export_made_in_the_minute_of_the_edit(self, tmp_path: Path):
+        cache = NotionPageCache(tmp_path)
+        cache.put(PAGE_ID, CachedPage("Road Map", "old", EDITED, "2024-05-01T10:00:30+00:00"))
+
+        # The page may have been edited again after the export without changing its last_edited_time
+        assert cache.get(PAGE_ID, EDITED) is None
+        assert cache.get(PAGE_ID, None) is None
+
+        cache.put(PAGE_ID, CachedPage("Road Map", "old", EDITED, "2024-05-01T10:01:00+00:00"))
+        assert cache.get(PAGE_ID, EDITED) is not None
+
+
+class TestTokenBucket:
+    def test_allows_bursts_then_paces_requests(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=3, clock=clock, sleep=clock.sleep)
+
+        for _ in range(6):
+            bucket.acquire()
+
+        assert clock.now == pytest.approx(1.0)
+
+    def test_pause_holds_back_requests(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=3, clock=clock, sleep=clock.sleep)
+
+        bucket.pause(5)
+        bucket.acquire()
+
+        assert clock.now >= 5
+
+
+class TestRateLimitedTransport:
+    def _client(self, responses: list[httpx.Response]) -> tuple[httpx.Client, FakeClock]:
+        clock = FakeClock()
+        transport = RateLimitedTransport(
+            TokenBucket(rate=100, clock=clock, sleep=clock.sleep),
+            httpx.MockTransport(lambda request: responses.pop(0)),
+            max_retries=2,
+        )
+        return httpx.Client(transport=transport), clock
+
+    def test_retries_after_the_delay_asked_by_the_api(self):
+        client, clock = self._client([httpx.Response(429, headers={"Retry-After": "7"}), httpx.Response(200)])
+
+        assert client.get("https://notion.test/v1/pages/x").status_code == 200
+        assert clock.now >= 7
+
+    def test_backs_off_without_retry_after_and_gives_up(self):
+        client, clock = self._client([httpx.Response(429)] * 3)
+
+        assert client.get("https://notion.test/v1/pages/x").status_code == 429
+        assert clock.now >= 1 + 2
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("2") == 2
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+
+class TestNotionSyncProvider:
+    def _sync(self, server: FakeNotionServer, tmp_path: Path, **kwargs):
+        config = NotionConfig(
+            api_key="key", pages=[f"https://www.notion.so/Page-{page_id}" for page_id in server.pages]
+        )
+        provider = NotionSyncProvider(**kwargs)
+        return provider.sync([config], tmp_path / provider.default_output_dir, project_path=tmp_path)
+
+    def test_sync_and_templates_share_the_cache(self, tmp_path: Path, notion):
+        config = NotionConfig(api_key="key", pages=[f"https://www.notion.so/Road-Map-{PAGE_ID}"])
+
+        result = self._sync(notion, tmp_path)
+        self._sync(notion, tmp_path)
+        page = NotionProvider(MagicMock(notion=config), tmp_path).page(PAGE_ID)
+
+        assert result.items_synced == 1
+        assert (tmp_path / "docs" / "notion" / "road-map.md").read_text().endswith("Hello\n\n[image]\n\n\n")
+        assert page.content == "Hello\n\n[image]\n\n"
+        assert notion.count(CHILDREN) == 1
+
+    def test_exports_pages_concurrently(self, tmp_path: Path, notion):
+        notion.pages = {_page_id(i): FakePage(f"Page {i}", [f"Content {i}"]) for i in range(16)}
+        notion.delay = 0.05
+
+        started = time.monotonic()
+        result = self._sync(notion, tmp_path, requests_per_second=1000)
+
+        # 32 requests of 50ms each would take 1.6s one at a time
+        assert time.monotonic() - started < 1.0
+        assert result.details["pages"] == [f"Page {i}" for i in range(16)]
+        assert (tmp_path / "docs" / "notion" / "page-3.md").read_text().endswith("Content 3\n\n\n")
+
+    def test_stays_within_the_rate_limit(self, tmp_path: Path, notion):
+        notion.pages = {_page_id(i): FakePage(f"Page {i}", ["x"]) for i in range(10)}
+
+        result = self._sync(notion, tmp_path, requests_per_second=10)
+
+        # 20 requests with a burst of 10 then 10 per second
+        times = [t for t, _ in notion.requests]
+        assert result.items_synced == 10
+        assert max(times) - min(times) >= 0.9
+
+    def test_retries_rate_limited_requests(self, tmp_path: Path, notion):
+        notion.pages[_page_id(1)] = FakePage("Other", ["x"])
+        notion.rate_limited = 3
+
+        result = self._sync(notion, tmp_path, requests_per_second=1000)
+
+        assert result.items_synced == 2
+        assert len(notion.requests) == 4 + 3
+
+    def test_reports_failed_pages(self, tmp_path: Path, notion):
+        config = NotionConfig(api_key="key", pages=[PAGE_ID, _page_id(404)])
+
+        result = NotionSyncProvider().sync([config], tmp_path / "docs" / "notion", project_path=tmp_path)
+
+        assert result.details is not None
+        assert result.details["pages"] == ["Road Map"]
+
+    def test_closes_the_client_when_the_sync_fails(self, tmp_path: Path, monkeypatch):
+        client = MagicMock()
+        monkeypatch.setattr(sys.modules[NotionSyncProvider.__module__], "create_client", lambda *args: client)
+        monkeypatch.setattr(NotionSyncProvider, "_export_pages", MagicMock(side_effect=RuntimeError("boom")))
+
+        with pytest.raises(RuntimeError, match="boom"):
+            NotionSyncProvider().sync([NotionConfig(api_key="key", pages=[PAGE_ID])], tmp_path / "docs" / "notion")
+
+        client.close.assert_called_once()
+
+
+class TestRecursiveCrawl:
+    @pytest.fixture
+    def workspace(self, notion):
+        root, onboarding, setup, deep, launch, hiring = (_page_id(i) for i in range(1, 7))
+        projects = _page_id(100)
+        notion.pages = {
+            root: FakePage("Handbook", ["Welcome"], child_pages=[onboarding], child_databases=[projects]),
+            onboarding: FakePage("Onboarding", ["Start here"], child_pages=[setup], links=[root]),
+            setup: FakePage("Setup", ["Install"], child_pages=[deep]),
+            deep: FakePage("Deep", ["Too far"]),
+            launch: FakePage("Launch", ["Q3"]),
+            hiring: FakePage("Hiring", ["Open roles"]),
+        }
+        notion.databases = {projects: FakeDatabase("Projects", [launch, hiring])}
+        return notion
+
+    def _sync(self, tmp_path: Path, max_depth: int = 2):
+        config = NotionConfig(api_key="key", pages=[_page_id(1)], recursive=True, max_depth=max_depth)
+        provider = NotionSyncProvider(requests_per_second=1000)
+        return provider.sync([config], tmp_path / "docs" / "notion", project_path=tmp_path)
+
+    def _files(self, tmp_path: Path) -> list[str]:
+        output_path = tmp_path / "docs" / "notion"
+        return sorted(path.relative_to(output_path).as_posix() for path in output_path.rglob("*.md"))
+
+    def test_mirrors_the_hierarchy_up_to_max_depth(self, tmp_path: Path, workspace):
+        result = self._sync(tmp_path)
+
+        assert result.details["pages"] == ["Handbook", "Onboarding", "Setup", "Launch", "Hiring"]
+        assert self._files(tmp_path) == [
+            "handbook.md",
+            "handbook/onboarding.md",
+            "handbook/onboarding/setup.md",
+            "handbook/projects/hiring.md",
+            "handbook/projects/launch.md",
+        ]
+        assert "Open roles" in (tmp_path / "docs/notion/handbook/projects/hiring.md").read_text()
+        # Pages linked from several places are exported once
+        assert workspace.count(f"/v1/pages/{_page_id(1)}") == 1
+
+    def test_reuses_cached_exports_and_their_children(self, tmp_path: Path, workspace):
+        self._sync(tmp_path)
+        exports = workspace.count(r"/v1/blocks/.*/children")
+
+        result = self._sync(tmp_path)
+
+        assert result.items_synced == 5
+        assert workspace.count(r"/v1/blocks/.*/children") == exports
+        assert result.files_unchanged == 5
+
+    def test_removes_pages_no_longer_reached(self, tmp_path: Path, workspace):
+        self._sync(tmp_path)
+        workspace.databases[_page_id(100)].rows.remove(_page_id(6))
+
+        result = self._sync(tmp_path)
+
+        assert result.details["removed"] == 1
+        assert "handbook/projects/hiring.md" not in self._files(tmp_path)
+
+    def test_names_siblings_with_the_same_title_apart(self, tmp_path: Path, workspace):
+        workspace.pages[_page_id(6)].title = "Launch"
+
+        self._sync(tmp_path)
+
+        assert self._files(tmp_path) == [
+            "handbook.md",
+            "handbook/onboarding.md",
+            "handbook/onboarding/setup.md",
+            "handbook/projects/launch-00000000.md",
+            "handbook/projects/launch.md",
+        ]
+
+
+def _select(name: str) -> dict:
+    return {"type": "select", "select": {"name": name}}
+
+
+class TestDatabaseTables:
+    @pytest.fixture
+    def tracker(self, notion):
+        launch, hiring, audit = (_page_id(i) for i in range(1, 4))
+        notion.pages = {
+            launch: FakePage(
+                "Launch",
+                [],
+                properties={
+                    "Status": _select("Done"),
+                    "Points": {"type": "number", "number": 5},
+                    "Tags": {"type": "multi_select", "multi_select": [{"name": "q3"}, {"name": "web"}]},
+                    "Due": {"type": "date", "date": {"start": "2024-07-01"}},
+                },
+            ),
+            hiring: FakePage(
+                "Hiring",
+                [],
+                created_time="2024-02-01T10:00:00.000Z",
+                properties={"Status": _select("Open"), "Points": {"type": "number", "number": None}},
+            ),
+            audit: FakePage(
+                "Audit", [], created_time="2024-03-01T10:00:00.000Z", properties={"Status": _select("Open")}
+            ),
+        }
+        notion.databases = {_page_id(100): FakeDatabase("Project Tracker", [launch, hiring, audit])}
+        return notion
+
+    def _sync(self, tmp_path: Path):
+        config = NotionConfig(api_key="key", pages=[], databases=[f"https://www.notion.so/{_page_id(100)}?v=1"])
+        provider = NotionSyncProvider(requests_per_second=1000)
+        return provider.sync([config], tmp_path / "docs" / "notion", project_path=tmp_path)
+
+    def _rows(self, tmp_path: Path) -> list[dict]:
+        path = tmp_path / "docs" / "notion" / "databases" / "project-tracker" / "rows.jsonl"
+        return [json.loads(line) for line in path.read_text().splitlines()]
+
+    def test_exports_rows_with_flattened_properties(self, tmp_path: Path, tracker):
+        result = self._sync(tmp_path)
+
+        rows = self._rows(tmp_path)
+        assert result.details["databases"] == ["Project Tracker"]
+        assert [row["Name"] for row in rows] == ["Launch", "Hiring", "Audit"]
+        assert rows[0] | {"url": None} == {
+            "id": _page_id(1),
+            "url": None,
+            "created_time": "2024-01-01T10:00:00.000Z",
+            "last_edited_time": EDITED,
+            "Name": "Launch",
+            "Status": "Done",
+            "Points": 5,
+            "Tags": ["q3", "web"],
+            "Due": "2024-07-01",
+        }
+        summary = (tmp_path / "docs/notion/databases/project-tracker/summary.md").read_text()
+        assert "| Status | select | 3/3 | Done, Open |" in summary
+        assert "| Points | number | 1/3 | 5 |" in summary
+        assert "read_json_auto('docs/notion/databases/project-tracker/rows.jsonl')" in summary
+
+    def test_rows_can_be_queried_with_duckdb(self, tmp_path: Path, tracker):
+        duckdb = pytest.importorskip("duckdb")
+        self._sync(tmp_path)
+
+        rows_path = tmp_path / "docs/notion/databases/project-tracker/rows.jsonl"
+        counts = duckdb.sql(f"SELECT Status, count(*) FROM read_json_auto('{rows_path}') GROUP BY 1 ORDER BY 1")
+
+        assert counts.fetchall() == [("Done", 1), ("Open", 2)]
+
+    def test_only_fetches_rows_edited_since_the_previous_export(self, tmp_path: Path, tracker):
+        self._sync(tmp_path)
+        tracker.pages[_page_id(2)].properties["Status"] = _select("Filled")
+        tracker.pages[_page_id(2)].last_edited_time = "2024-06-01T10:00:00.000Z"
+        tracker.databases[_page_id(100)].rows.remove(_page_id(3))
+        tracker.requests.clear()
+
+        result = self._sync(tmp_path)
+
+        # Deleted rows are only dropped by a full refresh
+        rows = self._rows(tmp_path)
+        assert [(row["Name"], row["Status"]) for row in rows] == [
+            ("Launch", "Done"),
+            ("Hiring", "Filled"),
+            ("Audit", "Open"),
+        ]
+        assert len(tracker.requests) == 3
+        assert tracker.count(r"/v1/data_sources/.*/query") == 1
+        assert result.files_written == 2
+
+    def test_fetches_every_row_when_the_schema_changed(self, tmp_path: Path, tracker):
+        self._sync(tmp_path)
+        tracker.pages[_page_id(1)].properties.pop("Tags")
+        tracker.pages[_page_id(3)].properties["Owner"] = {"type": "rich_text", "rich_text": []}
+
+        self._sync(tmp_path)
+
+        rows = self._rows(tmp_path)
+        summary = (tmp_path / "docs/notion/databases/project-tracker/summary.md").read_text()
+        assert all("Tags" not in row and "Owner" in row for row in rows)
+        assert "| Tags |" not in summary
+        assert "| Owner | rich_text | 0/3 |  |" in summary
+
+    def test_full_refresh_drops_deleted_rows(self, tmp_path: Path, tracker, monkeypatch):
+        self._sync(tmp_path)
+        tracker.databases[_page_id(100)].rows.remove(_page_id(3))
+        monkeypatch.setattr(tables, "FULL_REFRESH_INTERVAL", timedelta(0))
+
+        self._sync(tmp_path)
+
+        assert [row["Name"] for row in self._rows(tmp_path)] == ["Launch", "Hiring"]
+
+    def test_keeps_previous_export_when_database_fails(self, tmp_path: Path, tracker):
+        self._sync(tmp_path)
+        del tracker.databases[_page_id(100)]
+
+        result = self._sync(tmp_path)
+
+        assert result.details["databases"] == []
+        assert len(self._rows(tmp_path)) == 3
@@ -0,0 +1,136 @@
+"""Unit tests for database sync timing profiles."""
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from nao_core.commands.sync.providers.databases.profile import QueryCounter, SyncProfile, Timing
+from nao_core.commands.sync.providers.databases.provider import DatabaseSyncProvider, sync_database
+from nao_core.config.databases.base import DatabaseAccessor, DigestConfig
+
+
+class TestQueryCounter:
+    def test_counts_queries_and_time(self):
+        conn = MagicMock()
+        counter = QueryCounter()
+        counter.instrument(conn)
+        timing = Timing()
+
+        with counter.measure(timing):
+            conn.raw_sql("SELECT 1")
+            conn.list_tables(database="public")
+
+        assert timing.queries == 2
+        assert timing.seconds >= timing.query_seconds >= 0
+
+    def test_nested_calls_are_counted_once(self):
+        conn = MagicMock()
+        counter = QueryCounter()
+        counter.instrument(conn)
+        conn.execute.side_effect = lambda expr: conn.raw_sql("SELECT 1")
+
+        conn.execute("expr")
+
+        assert counter.queries == 1
+
+    def test_detached_connection_is_no_longer_counted(self):
+        conn, other = MagicMock(), MagicMock()
+        counter = QueryCounter()
+        conn.raw_sql.side_effect = lambda sql: counter.detach(conn)
+        counter.instrument(conn)
+        counter.instrument(other)
+
+        # A query still running when its connection is detached isn't counted either
+        conn.raw_sql("SELECT 1")
+        conn.raw_sql("SELECT 2")
+        other.raw_sql("SELECT 3")
+
+        assert counter.queries == 1
+
+
+class TestSyncProfile:
+    def test_slowest_tables_and_accessors(self):
+        profile = SyncProfile()
+        db = profile.add_database("warehouse", "duckdb")
+        fast = db.add_table("public", "fast")
+        fast.total.seconds = 0.1
+        fast.accessors["columns"] = Timing(seconds=0.1)
+        slow = db.add_table("public", "slow")
+        slow.total.seconds = 2.0
+        slow.accessors["preview"] = Timing(seconds=1.5, queries=1, query_seconds=1.4)
+
+        assert [table.name for _, table in profile.slowest_tables()] == ["slow", "fast"]
+        assert [(table.name, accessor) for table, accessor, _ in profile.slowest_accessors(1)] == [("slow", "preview")]
+
+    def test_to_dict_groups_tables_by_schema(self):
+        profile = SyncProfile()
+        db = profile.add_database("warehouse", "duckdb")
+        db.list_tables["public"] = Timing(seconds=0.5, queries=1)
+        db.add_table("public", "users")
+
+        data = profile.to_dict()
+
+        schema = data["databases"][0]["schemas"][0]
+        assert schema["name"] == "public"
+        assert schema["list_tables"]["queries"] == 1
+        assert schema["tables"][0]["name"] == "users"
+
+
+def _make_db_config():
+    db_config = MagicMock()
+    db_config.name = "test_db"
+    db_config.type = "duckdb"
+    db_config.include = []
+    db_config.exclude = []
+    db_config.accessors = list(DatabaseAccessor)
+    db_config.accessor_timeouts = {}
+    db_config.sync_deadline = None
+    db_config.digest = DigestConfig()
+    db_config.create_context = None
+    db_config.get_database_name.return_value = "test"
+    db_config.get_schemas.return_value = ["public"]
+    db_config.matches_pattern.return_value = True
+    db_config.connect.return_value.list_tables.return_value = ["users"]
+    return db_config
+
+
+def _render_with_query(template_name, db, table_name, dataset):
+    db._conn.raw_sql("SELECT count(*)")
+    return f"# {table_name}"
+
+
+class TestSyncDatabaseProfile:
+    def test_records_phases_tables_and_accessors(self, tmp_path: Path):
+        engine = MagicMock()
+        engine.list_templates.return_value = ["databases/columns.md.j2", "databases/preview.md.j2"]
+        engine.render.side_effect = _render_with_query
+        profile = SyncProfile()
+
+        with patch("nao_core.commands.sync.providers.databases.provider.console"):
+            with patch("nao_core.commands.sync.providers.databases.provider.get_template_engine", return_value=engine):
+                sync_database(_make_db_config(), tmp_path, MagicMock(), None, profile=profile.add_database("db", "x"))
+
+        db = profile.databases[0]
+        assert set(db.phases) == {"connect", "list_schemas", "joins", "publish"}
+        assert db.list_tables["public"].queries == 1
+        [table] = db.tables
+        assert (table.schema, table.name) == ("public", "users")
+        assert set(table.accessors) == {"columns", "preview"}
+        assert table.accessors["preview"].queries == 1
+        # The mocked templates never read the columns, so the catalog looks up the table schema itself
+        assert table.phases["catalog"].queries == 1
+        assert db.total.queries == 4
+
+    def test_provider_writes_profile_to_project(self, tmp_path: Path):
+        engine = MagicMock()
+        engine.list_templates.return_value = ["databases/columns.md.j2"]
+        engine.render.side_effect = _render_with_query
+
+        with patch("nao_core.commands.sync.providers.databases.provider.console"):
+            with patch("nao_core.commands.sync.providers.databases.provider.get_template_engine", return_value=engine):
+                DatabaseSyncProvider().sync([_make_db_config()], tmp_path / "databases", project_path=tmp_path)
+
+        data = json.loads((tmp_path / ".nao" / "sync_profile.json").read_text())
+        [db] = data["databases"]
+        assert db["name"] == "test_db"
+        assert db["schemas"][0]["tables"][0]["accessors"]["columns"]["queries"] == 1
@@ -5,7 +5,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from nao_core.commands.sync.providers.databases.provider import sync_database
-from nao_core.config.databases.base import DatabaseAccessor
+from nao_core.config.databases.base import DatabaseAccessor, DigestConfig
 
 
 @pytest.fixture
@@ -31,6 +31,9 @@ def create_mock_db_config(
     mock_config.name = name
     mock_config.type = db_type
     mock_config.accessors = list(DatabaseAccessor)
+    mock_config.accessor_timeouts = {}
+    mock_config.sync_deadline = None
+    mock_config.digest = DigestConfig()
     mock_conn = MagicMock()
     mock_config.connect.return_value = mock_conn
     mock_config.get_database_name.return_value = database_name
@@ -1,9 +1,15 @@
 """Unit tests for the repository sync provider."""
 
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
+from nao_core.commands.sync.providers.base import SyncOptions
 from nao_core.commands.sync.providers.repositories.provider import (
+    DEFAULT_REPO_WORKERS,
     RepositorySyncProvider,
     clone_or_pull_repo,
 )
@@ -58,11 +64,25 @@ class TestRepositorySyncProvider:
             RepoConfig(name="repo2", url="https://github.com/test/repo2"),
             RepoConfig(name="repo3", url="https://github.com/test/repo3"),
         ]
-        mock_clone.side_effect = [True, False, True]  # 2 successes, 1 failure
+        # 2 successes, 1 failure
+        mock_clone.side_effect = lambda repo, base_path: None if repo.name == "repo2" else "cloned"
 
         result = provider.sync(repos, tmp_path)
 
         assert result.items_synced == 2
+        assert result.details is not None
+        assert [details["status"] for details in result.details["repos"].values()] == ["cloned", "failed", "cloned"]
+
+    @patch("nao_core.commands.sync.providers.repositories.provider.ThreadPoolExecutor", wraps=ThreadPoolExecutor)
+    @patch("nao_core.commands.sync.providers.repositories.provider.clone_or_pull_repo", return_value="cloned")
+    @patch("nao_core.commands.sync.providers.repositories.provider.console")
+    def test_sync_uses_configured_workers(self, mock_console, mock_clone, mock_executor, tmp_path: Path):
+        repos = [RepoConfig(name="repo1", url="https://github.com/test/repo1")]
+
+        RepositorySyncProvider().sync(repos, tmp_path, options=SyncOptions(repo_workers=2))
+        RepositorySyncProvider().sync(repos, tmp_path)
+
+        assert [c.kwargs["max_workers"] for c in mock_executor.call_args_list] == [2, DEFAULT_REPO_WORKERS]
 
     def test_should_sync_returns_true_when_repos_exist(self):
         provider = RepositorySyncProvider()
@@ -90,10 +110,11 @@ class TestCloneOrPullRepo:
 
         result = clone_or_pull_repo(repo, tmp_path)
 
-        assert result is True
+        assert result == "cloned"
         mock_run.assert_called_once()
         call_args = mock_run.call_args
         assert "clone" in call_args[0][0]
+        assert "--depth=1" in call_args[0][0]
 
     @patch("nao_core.commands.sync.providers.repositories.provider.subprocess.run")
     @patch("nao_core.commands.sync.providers.repositories.provider.console")
@@ -107,67 +128,142 @@ class TestCloneOrPullRepo:
 
         result = clone_or_pull_repo(repo, tmp_path)
 
-        assert result is True
+        assert result == "cloned"
         call_args = mock_run.call_args[0][0]
         assert "-b" in call_args
         assert "develop" in call_args
 
     @patch("nao_core.commands.sync.providers.repositories.provider.subprocess.run")
     @patch("nao_core.commands.sync.providers.repositories.provider.console")
-    def test_pulls_existing_repo(self, mock_console, mock_run, tmp_path: Path):
-        # Create existing repo directory
-        repo_path = tmp_path / "existing-repo"
-        repo_path.mkdir()
-
-        repo = RepoConfig(name="existing-repo", url="https://github.com/test/existing-repo")
-        mock_run.return_value = MagicMock(returncode=0)
+    def test_returns_none_on_clone_failure(self, mock_console, mock_run, tmp_path: Path):
+        repo = RepoConfig(name="new-repo", url="https://github.com/test/new-repo")
+        mock_run.return_value = MagicMock(returncode=1, stderr="Error cloning")
 
         result = clone_or_pull_repo(repo, tmp_path)
 
-        assert result is True
-        call_args = mock_run.call_args[0][0]
-        assert "pull" in call_args
+        assert result is None
 
     @patch("nao_core.commands.sync.providers.repositories.provider.subprocess.run")
     @patch("nao_core.commands.sync.providers.repositories.provider.console")
-    def test_pulls_and_checkouts_branch(self, mock_console, mock_run, tmp_path: Path):
+    def test_returns_none_on_pull_failure(self, mock_console, mock_run, tmp_path: Path):
         # Create existing repo directory
         repo_path = tmp_path / "existing-repo"
         repo_path.mkdir()
 
-        repo = RepoConfig(
-            name="existing-repo",
-            url="https://github.com/test/existing-repo",
-            branch="feature",
-        )
-        mock_run.return_value = MagicMock(returncode=0)
+        repo = RepoConfig(name="existing-repo", url="https://github.com/test/existing-repo")
+        mock_run.return_value = MagicMock(returncode=1, stderr="Error pulling")
 
         result = clone_or_pull_repo(repo, tmp_path)
 
-        assert result is True
-        # Should have called git pull and git checkout
-        assert mock_run.call_count == 2
+        assert result is None
 
-    @patch("nao_core.commands.sync.providers.repositories.provider.subprocess.run")
-    @patch("nao_core.commands.sync.providers.repositories.provider.console")
-    def test_returns_false_on_clone_failure(self, mock_console, mock_run, tmp_path: Path):
-        repo = RepoConfig(name="new-repo", url="https://github.com/test/new-repo")
-        mock_run.return_value = MagicMock(returncode=1, stderr="Error cloning")
 
-        result = clone_or_pull_repo(repo, tmp_path)
+def _git(*args: str, cwd: Path) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
 
-        assert result is False
 
-    @patch("nao_core.commands.sync.providers.repositories.provider.subprocess.run")
-    @patch("nao_core.commands.sync.providers.repositories.provider.console")
-    def test_returns_false_on_pull_failure(self, mock_console, mock_run, tmp_path: Path):
-        # Create existing repo directory
-        repo_path = tmp_path / "existing-repo"
-        repo_path.mkdir()
+class FakeRemote:
+    """A local repository served over file://, so clones can be shallow."""
 
-        repo = RepoConfig(name="existing-repo", url="https://github.com/test/existing-repo")
-        mock_run.return_value = MagicMock(returncode=1, stderr="Error pulling")
+    def __init__(self, path: Path):
+        self.path = path
+        path.mkdir()
+        _git("init", "-q", "-b", "main", cwd=path)
+        _git("config", "uploadpack.allowFilter", "true", cwd=path)
 
-        result = clone_or_pull_repo(repo, tmp_path)
+    @property
+    def url(self) -> str:
+        return self.path.as_uri()
+
+    def commit(self, content: str, branch: str = "main") -> None:
+        _git("checkout", "-q", "-B", branch, cwd=self.path)
+        (self.path / "README.md").write_text(content)
+        _git("add", "README.md", cwd=self.path)
+        _git("commit", "-q", "-m", content, cwd=self.path)
+        _git("checkout", "-q", "main", cwd=self.path)
+
+
+@pytest.fixture
+def remote(tmp_path: Path, monkeypatch) -> FakeRemote:
+    for variable in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(variable, "nao")
+    for variable in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(variable, "nao@example.com")
+    remote = FakeRemote(tmp_path / "remote")
+    remote.commit("first")
+    remote.commit("second")
+    return remote
+
+
+class TestSyncFromRemote:
+    def test_clones_shallow(self, tmp_path: Path, remote: FakeRemote):
+        repo = RepoConfig(name="app", url=remote.url)
+
+        assert clone_or_pull_repo(repo, tmp_path / "repos") == "cloned"
+
+        assert _git("rev-list", "--count", "HEAD", cwd=tmp_path / "repos" / "app") == "1"
+        assert (tmp_path / "repos" / "app" / "README.md").read_text() == "second"
+
+    def test_clones_full_history_without_contents(self, tmp_path: Path, remote: FakeRemote):
+        repo = RepoConfig(name="app", url=remote.url, depth=None)
+
+        assert clone_or_pull_repo(repo, tmp_path / "repos") == "cloned"
+
+        repo_path = tmp_path / "repos" / "app"
+        assert _git("rev-list", "--count", "HEAD", cwd=repo_path) == "2"
+        assert _git("config", "remote.origin.partialclonefilter", cwd=repo_path) == "blob:none"
+
+    def test_skips_fetch_when_remote_is_unchanged(self, tmp_path: Path, remote: FakeRemote):
+        repo = RepoConfig(name="app", url=remote.url)
+        clone_or_pull_repo(repo, tmp_path)
+
+        with patch(
+            "nao_core.commands.sync.providers.repositories.provider.subprocess.run", wraps=subprocess.run
+        ) as run:
+            assert clone_or_pull_repo(repo, tmp_path) == "unchanged"
+
+        assert [call.args[0][1] for call in run.call_args_list] == ["ls-remote", "rev-parse"]
+
+    def test_updates_when_remote_moved(self, tmp_path: Path, remote: FakeRemote):
+        repo = RepoConfig(name="app", url=remote.url)
+        clone_or_pull_repo(repo, tmp_path)
+        remote.commit("third")
+
+        assert clone_or_pull_repo(repo, tmp_path) == "updated"
+
+        assert (tmp_path / "app" / "README.md").read_text() == "third"
+        assert _git("rev-list", "--count", "HEAD", cwd=tmp_path / "app") == "1"
+
+    def test_keeps_the_history_of_a_full_clone(self, tmp_path: Path, remote: FakeRemote):
+        _git("clone", "-q", remote.url, str(tmp_path / "app"), cwd=tmp_path)
+        remote.commit("third")
+
+        assert clone_or_pull_repo(RepoConfig(name="app", url=remote.url), tmp_path) == "updated"
+
+        assert _git("rev-list", "--count", "HEAD", cwd=tmp_path / "app") == "3"
+        assert not (tmp_path / "app" / ".git" / "shallow").exists()
+
+    def test_switches_to_configured_branch(self, tmp_path: Path, remote: FakeRemote):
+        clone_or_pull_repo(RepoConfig(name="app", url=remote.url), tmp_path)
+        remote.commit("feature work", branch="feature")
+
+        assert clone_or_pull_repo(RepoConfig(name="app", url=remote.url, branch="feature"), tmp_path) == "updated"
+
+        assert _git("rev-parse", "--abbrev-ref", "HEAD", cwd=tmp_path / "app") == "feature"
+        assert (tmp_path / "app" / "README.md").read_text() == "feature work"
+
+    def test_sync_reports_each_repo_with_its_duration(self, tmp_path: Path, remote: FakeRemote):
+        provider = RepositorySyncProvider(max_workers=2)
+        repos = [RepoConfig(name=name, url=remote.url) for name in ("app", "dbt")]
+        provider.sync(repos[:1], tmp_path)
+
+        result = provider.sync([*repos, RepoConfig(name="gone", url=(tmp_path / "missing").as_uri())], tmp_path)
 
-        assert result is False
+        assert result.details is not None
+        assert {name: details["status"] for name, details in result.details["repos"].items()} == {
+            "app": "unchanged",
+            "dbt": "cloned",
+            "gone": "failed",
+        }
+        assert all(details["seconds"] >= 0 for details in result.details["repos"].values())
+        assert result.get_summary().startswith("2 synced (1 cloned, 0 updated, 1 unchanged), slowest: ")
@@ -0,0 +1,128 @@
+"""Unit tests for sharded database sync and the shard merge step."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from nao_core.commands.sync.catalog import get_catalog_path, read_catalog
+from nao_core.commands.sync.cleanup import cleanup_stale_databases
+from nao_core.commands.sync.providers.databases.provider import sync_database
+from nao_core.commands.sync.sharding import SHARDS_DIR, Shard, get_shard_base_path, merge_shards
+from nao_core.config.databases.base import DatabaseAccessor, DigestConfig
+
+TABLES = [f"table_{i}" for i in range(20)]
+RELATIVE_DB_PATH = Path("type=duckdb") / "database=test"
+
+
+class TestShard:
+    def test_parse(self):
+        assert Shard.parse("2/4") == Shard(2, 4)
+        assert Shard.parse(" 1 / 1 ") == Shard(1, 1)
+
+    @pytest.mark.parametrize("value", ["", "2", "0/4", "5/4", "a/b", "1/0"])
+    def test_parse_rejects_invalid_specs(self, value: str):
+        with pytest.raises(ValueError):
+            Shard.parse(value)
+
+    def test_every_table_is_owned_by_exactly_one_shard(self):
+        shards = [Shard(i, 3) for i in range(1, 4)]
+
+        for table in TABLES:
+            owners = [shard for shard in shards if shard.owns("duckdb/test", "public", table)]
+            assert len(owners) == 1
+
+    def test_ownership_is_stable(self):
+        shard = Shard(1, 3)
+
+        first = [table for table in TABLES if shard.owns("duckdb/test", "public", table)]
+        second = [table for table in reversed(TABLES) if shard.owns("duckdb/test", "public", table)]
+
+        assert first == list(reversed(second))
+        assert 0 < len(first) < len(TABLES)
+
+    def test_shard_base_path(self, tmp_path: Path):
+        assert get_shard_base_path(tmp_path, Shard(2, 4)) == tmp_path / SHARDS_DIR / "2-of-4"
+
+
+class TestShardedSync:
+    def _make_db_config(self, tables: list[str] = TABLES):
+        db_config = MagicMock()
+        db_config.name = "test_db"
+        db_config.type = "duckdb"
+        db_config.accessors = list(DatabaseAccessor)
+        db_config.accessor_timeouts = {}
+        db_config.sync_deadline = None
+        db_config.digest = DigestConfig()
+        db_config.get_database_name.return_value = "test"
+        db_config.get_schemas.return_value = ["public"]
+        db_config.matches_pattern.return_value = True
+        db_config.connect.return_value.list_tables.return_value = tables
+        return db_config
+
+    def _run(self, db_config, tmp_path: Path, shard: Shard | None = None):
+        engine = MagicMock()
+        engine.list_templates.return_value = ["databases/columns.md.j2"]
+        engine.render.side_effect = lambda template, table_name, **kwargs: f"# {table_name}"
+        with patch("nao_core.commands.sync.providers.databases.provider.console"):
+            with patch("nao_core.commands.sync.providers.databases.provider.get_template_engine", return_value=engine):
+                return sync_database(db_config, tmp_path, MagicMock(), None, shard=shard)
+
+    def _synced_tables(self, db_path: Path) -> set[str]:
+        return {path.name.removeprefix("table=") for path in (db_path / "schema=public").glob("table=*")}
+
+    def test_shard_syncs_only_its_tables_into_its_own_folder(self, tmp_path: Path):
+        shard = Shard(1, 2)
+
+        state = self._run(self._make_db_config(), tmp_path, shard)
+
+        shard_db_path = get_shard_base_path(tmp_path, shard) / RELATIVE_DB_PATH
+        expected = {table for table in TABLES if shard.owns("duckdb/test", "public", table)}
+        assert self._synced_tables(shard_db_path) == expected
+        assert state.tables_synced == len(expected)
+        assert not (tmp_path / RELATIVE_DB_PATH).exists()
+
+    def test_merge_combines_all_shards_and_removes_stale_tables(self, tmp_path: Path):
+        stale_path = tmp_path / RELATIVE_DB_PATH / "schema=public" / "table=dropped"
+        stale_path.mkdir(parents=True)
+        db_config = self._make_db_config()
+
+        for index in (1, 2, 3):
+            self._run(db_config, tmp_path, Shard(index, 3))
+        with patch("nao_core.commands.sync.staging.console"):
+            state = merge_shards(tmp_path, RELATIVE_DB_PATH)
+
+        db_path = tmp_path / RELATIVE_DB_PATH
+        assert self._synced_tables(db_path) == set(TABLES)
+        assert (db_path / "schema=public" / "table=table_3" / "columns.md").read_text() == "# table_3"
+        assert state.tables_synced == len(TABLES)
+        assert state.schemas_synced == 1
+        assert state.stale_removed == 1
+        assert not (tmp_path / SHARDS_DIR).exists()
+
+        catalog = read_catalog(get_catalog_path(db_path))
+        assert sorted(table for _, table in catalog) == sorted(TABLES)
+
+    def test_merge_fails_without_touching_live_tree_when_a_shard_is_missing(self, tmp_path: Path):
+        stale_path = tmp_path / RELATIVE_DB_PATH / "schema=public" / "table=dropped"
+        stale_path.mkdir(parents=True)
+        db_config = self._make_db_config()
+        self._run(db_config, tmp_path, Shard(1, 2))
+
+        with pytest.raises(FileNotFoundError, match="2/2"):
+            merge_shards(tmp_path, RELATIVE_DB_PATH)
+
+        assert stale_path.exists()
+        assert (get_shard_base_path(tmp_path, Shard(1, 2)) / RELATIVE_DB_PATH).exists()
+
+    def test_merge_fails_without_shard_outputs(self, tmp_path: Path):
+        with pytest.raises(FileNotFoundError, match="No shard outputs"):
+            merge_shards(tmp_path, RELATIVE_DB_PATH)
+
+    def test_cleanup_keeps_shard_outputs(self, tmp_path: Path):
+        db_config = self._make_db_config()
+        self._run(db_config, tmp_path, Shard(1, 2))
+
+        cleanup_stale_databases([db_config], tmp_path)
+
+        assert (tmp_path / SHARDS_DIR).is_dir()
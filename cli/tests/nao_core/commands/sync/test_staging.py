@@ -0,0 +1,146 @@
+"""Unit tests for staged, atomically published database sync output."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from nao_core.commands.sync.cleanup import DatabaseSyncState
+from nao_core.commands.sync.providers.databases.provider import sync_database
+from nao_core.commands.sync.staging import get_staging_path, publish_staged_database
+from nao_core.config.databases.base import DatabaseAccessor, DigestConfig
+
+
+def _stage_table(staging_path: Path, schema: str, table: str, content: str = "# table") -> None:
+    table_path = staging_path / f"schema={schema}" / f"table={table}"
+    table_path.mkdir(parents=True)
+    (table_path / "columns.md").write_text(content)
+
+
+class TestPublishStagedDatabase:
+    def test_get_staging_path_is_hidden_sibling(self, tmp_path: Path):
+        db_path = tmp_path / "type=duckdb" / "database=test"
+
+        assert get_staging_path(db_path) == tmp_path / "type=duckdb" / ".database=test.staging"
+
+    def test_publishes_when_live_tree_missing(self, tmp_path: Path):
+        db_path = tmp_path / "type=duckdb" / "database=test"
+        staging_path = get_staging_path(db_path)
+        _stage_table(staging_path, "public", "users")
+
+        state = DatabaseSyncState(db_path=db_path)
+        state.add_table("public", "users")
+
+        removed = publish_staged_database(state, staging_path)
+
+        assert removed == 0
+        assert (db_path / "schema=public" / "table=users" / "columns.md").read_text() == "# table"
+        assert not staging_path.exists()
+
+    def test_swap_drops_stale_tables_and_schemas(self, tmp_path: Path):
+        db_path = tmp_path / "type=duckdb" / "database=test"
+        (db_path / "schema=public" / "table=users").mkdir(parents=True)
+        (db_path / "schema=public" / "table=stale").mkdir(parents=True)
+        (db_path / "schema=old" / "table=events").mkdir(parents=True)
+
+        staging_path = get_staging_path(db_path)
+        _stage_table(staging_path, "public", "users", "new content")
+
+        state = DatabaseSyncState(db_path=db_path)
+        state.add_schema("public")
+        state.add_table("public", "users")
+
+        removed = publish_staged_database(state, staging_path)
+
+        assert removed == 2
+        assert (db_path / "schema=public" / "table=users" / "columns.md").read_text() == "new content"
+        assert not (db_path / "schema=public" / "table=stale").exists()
+        assert not (db_path / "schema=old").exists()
+        assert not staging_path.exists()
+
+    def test_keeps_files_not_owned_by_nao(self, tmp_path: Path):
+        db_path = tmp_path / "type=duckdb" / "database=test"
+        (db_path / "schema=public" / "notes").mkdir(parents=True)
+        (db_path / "README.md").write_text("user notes")
+
+        staging_path = get_staging_path(db_path)
+        _stage_table(staging_path, "public", "users")
+
+        state = DatabaseSyncState(db_path=db_path)
+        state.add_table("public", "users")
+
+        publish_staged_database(state, staging_path)
+
+        assert (db_path / "README.md").read_text() == "user notes"
+        assert (db_path / "schema=public" / "notes").is_dir()
+
+    def test_failed_swap_keeps_user_files_in_live_tree(self, tmp_path: Path):
+        db_path = tmp_path / "type=duckdb" / "database=test"
+        (db_path / "schema=public" / "table=users").mkdir(parents=True)
+        (db_path / "schema=public" / "notes.md").write_text("table notes")
+        (db_path / "README.md").write_text("user notes")
+
+        staging_path = get_staging_path(db_path)
+        _stage_table(staging_path, "public", "users")
+
+        state = DatabaseSyncState(db_path=db_path)
+        state.add_table("public", "users")
+
+        with patch("nao_core.commands.sync.staging.swap_directory", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                publish_staged_database(state, staging_path)
+
+        assert (db_path / "README.md").read_text() == "user notes"
+        assert (db_path / "schema=public" / "notes.md").read_text() == "table notes"
+
+
+class TestSyncDatabaseStaging:
+    def _make_db_config(self):
+        db_config = MagicMock()
+        db_config.name = "test_db"
+        db_config.type = "duckdb"
+        db_config.accessors = list(DatabaseAccessor)
+        db_config.accessor_timeouts = {}
+        db_config.sync_deadline = None
+        db_config.digest = DigestConfig()
+        db_config.get_database_name.return_value = "test"
+        db_config.get_schemas.return_value = ["public"]
+        db_config.matches_pattern.return_value = True
+        db_config.connect.return_value.list_tables.return_value = ["users"]
+        return db_config
+
+    def _run(self, db_config, engine, tmp_path: Path):
+        with patch("nao_core.commands.sync.providers.databases.provider.console"):
+            with patch("nao_core.commands.sync.providers.databases.provider.get_template_engine", return_value=engine):
+                return sync_database(db_config, tmp_path, MagicMock(), None)
+
+    def test_unchanged_files_are_hard_linked_from_live_tree(self, tmp_path: Path):
+        engine = MagicMock()
+        engine.list_templates.return_value = ["databases/columns.md.j2"]
+        engine.render.return_value = "# users"
+        db_config = self._make_db_config()
+
+        self._run(db_config, engine, tmp_path)
+        output_file = tmp_path / "type=duckdb" / "database=test" / "schema=public" / "table=users" / "columns.md"
+        inode = output_file.stat().st_ino
+
+        state = self._run(db_config, engine, tmp_path)
+
+        assert output_file.stat().st_ino == inode
+        assert state.writes.unchanged == 1
+        assert state.writes.written == 0
+
+    def test_failed_sync_leaves_live_tree_untouched(self, tmp_path: Path):
+        engine = MagicMock()
+        engine.list_templates.return_value = ["databases/columns.md.j2"]
+        engine.render.return_value = "# users"
+        db_config = self._make_db_config()
+        self._run(db_config, engine, tmp_path)
+
+        db_path = tmp_path / "type=duckdb" / "database=test"
+        db_config.get_schemas.side_effect = KeyboardInterrupt()
+
+        with pytest.raises(KeyboardInterrupt):
+            self._run(db_config, engine, tmp_path)
+
+        assert (db_path / "schema=public" / "table=users" / "columns.md").read_text() == "# users"
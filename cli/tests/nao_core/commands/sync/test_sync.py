@@ -7,6 +7,7 @@ import pytest
 
 from nao_core.commands.sync import sync
 from nao_core.commands.sync.providers import ProviderSelection, SyncProvider, SyncResult
+from nao_core.outputs import load_output_dirs
 
 
 def _make_provider(
@@ -70,6 +71,18 @@ class TestSyncCommand:
         call_args = selection.provider.sync.call_args
         assert str(call_args[0][1]) == custom_output
 
+    def test_sync_does_not_render_templates_in_custom_output_dirs(self, tmp_path: Path, create_config):
+        create_config()
+        selection = _make_provider(name="Repositories", output_dir="repos", items=["repo"], items_synced=1)
+        (tmp_path / "vendor" / "dbt").mkdir(parents=True)
+        (tmp_path / "vendor" / "dbt" / "model.sql.j2").write_text("select 1")
+
+        with patch("nao_core.commands.sync.console"):
+            sync(output_dirs={"Repositories": "vendor"}, _providers=[selection])
+
+        assert load_output_dirs(tmp_path)["Repositories"] == "vendor"
+        assert not (tmp_path / "vendor" / "dbt" / "model.sql").exists()
+
     def test_sync_skips_provider_when_should_sync_false(self, create_config):
         create_config()
         selection = _make_provider(should_sync=False)
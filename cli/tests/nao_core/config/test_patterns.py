@@ -0,0 +1,91 @@
+"""Tests for compiled include/exclude pattern matching."""
+
+import pytest
+
+from nao_core.config.databases.duckdb import DuckDBConfig
+from nao_core.config.databases.patterns import TableMatcher, get_table_matcher
+from nao_core.config.databases.snowflake import SnowflakeConfig
+
+
+@pytest.mark.parametrize(
+    ("include", "exclude", "schema", "table", "expected"),
+    [
+        ((), (), "public", "users", True),
+        (("prod_*.*",), (), "prod_sales", "orders", True),
+        (("prod_*.*",), (), "dev_sales", "orders", False),
+        (("analytics.dim_*",), (), "analytics", "dim_users", True),
+        (("analytics.dim_*",), (), "analytics", "fact_orders", False),
+        ((), ("temp_*.*",), "temp_load", "orders", False),
+        ((), ("*.backup_*",), "public", "backup_users", False),
+        (("public.*",), ("*.backup_*",), "public", "users", True),
+    ],
+)
+def test_matches(include, exclude, schema, table, expected):
+    assert TableMatcher(include, exclude).matches(schema, table) is expected
+
+
+@pytest.mark.parametrize(
+    ("include", "exclude", "schema", "expected"),
+    [
+        ((), (), "public", True),
+        (("prod_*.*",), (), "prod_sales", True),
+        (("prod_*.*",), (), "dev_sales", False),
+        (("analytics.dim_*", "public.*"), (), "public", True),
+        (("analytics.dim_*",), (), "staging", False),
+        # Patterns without a dot must span it with a wildcard
+        (("*_stg",), (), "anything", True),
+        (("raw*",), (), "raw_events", True),
+        (("raw*",), (), "clean", False),
+        ((), ("temp_*.*",), "temp_load", False),
+        ((), ("temp_*",), "temp_load", False),
+        ((), ("temp_*.*",), "public", True),
+        # Excluding some tables of a schema keeps the schema
+        ((), ("*.backup_*",), "public", True),
+        ((), ("public.tmp_*",), "public", True),
+    ],
+)
+def test_matches_schema(include, exclude, schema, expected):
+    assert TableMatcher(include, exclude).matches_schema(schema) is expected
+
+
+def test_schema_prefilter_agrees_with_table_matching():
+    """A schema is only pruned when none of its tables can match."""
+    matcher = TableMatcher(("sales.*", "*.dim_*"), ("tmp*",))
+    schemas = ["sales", "marketing", "tmp_work", "SALES"]
+    tables = ["orders", "dim_users", "tmp"]
+
+    for schema in schemas:
+        if not matcher.matches_schema(schema):
+            assert not any(matcher.matches(schema, table) for table in tables)
+
+
+def test_matchers_are_shared_between_configs():
+    first = DuckDBConfig(name="a", include=["public.*"])
+    second = DuckDBConfig(name="b", include=["public.*"])
+
+    assert first.table_matcher is second.table_matcher
+    assert get_table_matcher(("public.*",), (), True) is first.table_matcher
+
+
+def test_default_matching_is_case_sensitive():
+    config = DuckDBConfig(name="db", include=["public.*"])
+
+    assert config.matches_pattern("public", "users")
+    assert not config.matches_pattern("PUBLIC", "users")
+    assert not config.matches_schema("PUBLIC")
+
+
+def test_snowflake_matching_is_case_insensitive():
+    config = SnowflakeConfig(
+        name="sf",
+        username="user",
+        account_id="account",
+        database="DB",
+        include=["analytics.*"],
+        exclude=["*.TMP_*"],
+    )
+
+    assert config.matches_pattern("ANALYTICS", "ORDERS")
+    assert not config.matches_pattern("ANALYTICS", "tmp_orders")
+    assert config.matches_schema("Analytics")
+    assert not config.matches_schema("RAW")
@@ -0,0 +1,87 @@
+"""Tests for per-backend preview strategies."""
+
+from datetime import date, datetime
+from unittest.mock import patch
+
+import ibis
+import pytest
+
+from nao_core.config.databases import BigQueryConfig, DatabricksConfig, DuckDBConfig, PreviewConfig, PreviewStrategy
+from nao_core.config.databases.bigquery import _parse_partition_id
+
+
+@pytest.fixture
+def events_table():
+    conn = ibis.duckdb.connect()
+    conn.raw_sql(
+        "CREATE TABLE events AS SELECT range AS id, DATE '2024-01-01' + (range % 3)::INTEGER AS day, "
+        "'x' AS c1, 'y' AS c2 FROM range(30)"
+    )
+    return conn, conn.table("events")
+
+
+def test_default_strategy_is_limit(events_table):
+    conn, table = events_table
+    config = DuckDBConfig(name="db")
+
+    [expr] = config.get_preview_plan(conn, "main", "events", table, 5)
+
+    assert len(expr.execute()) == 5
+
+
+def test_sample_strategy_falls_back_to_limit(events_table):
+    conn, table = events_table
+    config = DuckDBConfig(name="db", preview=PreviewConfig(strategy=PreviewStrategy.SAMPLE, sample_percent=50))
+
+    plan = config.get_preview_plan(conn, "main", "events", table, 5)
+
+    assert len(plan) == 2
+    assert "TABLESAMPLE" in ibis.to_sql(plan[0]).upper()
+
+
+def test_latest_partition_strategy_filters_on_partition(events_table):
+    conn, table = events_table
+    config = DuckDBConfig(name="db", preview=PreviewConfig(strategy=PreviewStrategy.LATEST_PARTITION))
+
+    with patch.object(DuckDBConfig, "find_latest_partition", return_value=("day", date(2024, 1, 3))):
+        plan = config.get_preview_plan(conn, "main", "events", table, 100)
+
+    rows = plan[0].execute()
+    assert len(plan) == 2
+    assert {str(day)[:10] for day in rows["day"]} == {"2024-01-03"}
+
+
+def test_latest_partition_without_partitions_uses_limit(events_table):
+    conn, table = events_table
+    config = DuckDBConfig(name="db", preview=PreviewConfig(strategy=PreviewStrategy.LATEST_PARTITION))
+
+    assert len(config.get_preview_plan(conn, "main", "events", table, 5)) == 1
+
+
+def test_wide_tables_are_capped(events_table):
+    conn, table = events_table
+    config = DuckDBConfig(name="db", preview=PreviewConfig(max_columns=2))
+
+    [expr] = config.get_preview_plan(conn, "main", "events", table, 5)
+
+    assert expr.columns == ("id", "day")
+
+
+def test_partitioned_backends_default_to_latest_partition():
+    assert BigQueryConfig.default_preview_strategy == PreviewStrategy.LATEST_PARTITION
+    assert DatabricksConfig.default_preview_strategy == PreviewStrategy.LATEST_PARTITION
+    assert DuckDBConfig.default_preview_strategy == PreviewStrategy.LIMIT
+
+
+@pytest.mark.parametrize(
+    ("partition_id", "data_type", "expected"),
+    [
+        ("20240105", "DATE", date(2024, 1, 5)),
+        ("202401", "DATE", date(2024, 1, 1)),
+        ("2024010513", "TIMESTAMP", datetime(2024, 1, 5, 13)),
+        ("2024", "DATETIME", datetime(2024, 1, 1)),
+        ("1000", "INT64", 1000),
+    ],
+)
+def test_parse_bigquery_partition_id(partition_id, data_type, expected):
+    assert _parse_partition_id(partition_id, data_type) == expected
@@ -0,0 +1,336 @@
+"""Unit tests for rendering user templates."""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import duckdb
+import pytest
+
+from nao_core.config.base import NaoConfig
+from nao_core.config.databases.duckdb import DuckDBConfig
+from nao_core.outputs import save_output_dirs
+from nao_core.templates.context import NotionPage, NotionProvider, create_nao_context
+from nao_core.templates.render import (
+    JINJA_CACHE_DIR,
+    create_template_environment,
+    discover_templates,
+    render_all_templates,
+)
+
+
+def _write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+class TestDiscoverTemplates:
+    def test_skips_excluded_generated_and_ignored_dirs(self, tmp_path: Path):
+        for path in (
+            "report.md.j2",
+            "docs/guide.md.j2",
+            "docs/notion/page.md.j2",
+            "databases/type=duckdb/db=shop/notes.md.j2",
+            "repos/dbt/model.sql.j2",
+            "node_modules/pkg/readme.md.j2",
+            "sub/templates/override.md.j2",
+            "scratch/draft.md.j2",
+            "docs/private.md.j2",
+        ):
+            _write(tmp_path / path, "")
+        _write(tmp_path / ".naoignore", "scratch/\ndocs/private.md.j2\n")
+
+        assert discover_templates(tmp_path) == [Path("docs/guide.md.j2"), Path("report.md.j2")]
+
+    def test_skips_output_dirs_recorded_by_sync(self, tmp_path: Path):
+        _write(tmp_path / "vendor" / "code" / "dbt" / "model.sql.j2", "")
+        _write(tmp_path / "repos" / "notes.md.j2", "")
+        save_output_dirs(tmp_path, {"Repositories": "vendor/code", "Databases": str(tmp_path / "databases")})
+
+        assert discover_templates(tmp_path) == [Path("repos/notes.md.j2")]
+
+    def test_reuses_listing_of_unchanged_dirs(self, tmp_path: Path):
+        _write(tmp_path / "docs" / "a.md.j2", "")
+        assert discover_templates(tmp_path) == [Path("docs/a.md.j2")]
+        # Creating `.nao/` for the cache changed the project root once
+        discover_templates(tmp_path)
+
+        with patch("nao_core.templates.render.os.scandir", side_effect=AssertionError("listed again")):
+            assert discover_templates(tmp_path) == [Path("docs/a.md.j2")]
+
+    def test_picks_up_new_templates(self, tmp_path: Path):
+        _write(tmp_path / "docs" / "a.md.j2", "")
+        discover_templates(tmp_path)
+        _write(tmp_path / "docs" / "b.md.j2", "")
+        # Make sure the mtime moves even on filesystems with a coarse resolution
+        mtime = (tmp_path / "docs").stat().st_mtime_ns + 1_000_000_000
+        os.utime(tmp_path / "docs", ns=(mtime, mtime))
+
+        assert discover_templates(tmp_path) == [Path("docs/a.md.j2"), Path("docs/b.md.j2")]
+
+    def test_without_cache_writes_nothing(self, tmp_path: Path):
+        _write(tmp_path / "a.md.j2", "")
+
+        assert discover_templates(tmp_path, use_cache=False) == [Path("a.md.j2")]
+        assert not (tmp_path / ".nao").exists()
+
+
+class TestRenderAllTemplates:
+    def test_renders_templates_next_to_their_source(self, tmp_path: Path):
+        _write(tmp_path / "docs" / "report.md.j2", "# {{ nao.config.project_name }}\n")
+        config = MagicMock()
+        config.project_name = "shop"
+
+        result = render_all_templates(tmp_path, config, MagicMock())
+
+        assert result.templates_rendered == 1
+        assert (tmp_path / "docs" / "report.md").read_text() == "# shop\n"
+
+    def test_shares_one_environment_and_context(self, tmp_path: Path):
+        _write(tmp_path / "a.md.j2", "{% include 'shared.txt' %}")
+        _write(tmp_path / "b.md.j2", "{% include 'shared.txt' %}")
+        _write(tmp_path / "shared.txt", "shared")
+        contexts = []
+
+        def create_context(config, project_path):
+            contexts.append(MagicMock())
+            return contexts[-1]
+
+        with patch("nao_core.templates.render.create_nao_context", side_effect=create_context):
+            with patch(
+                "nao_core.templates.render.create_template_environment", wraps=create_template_environment
+            ) as create_env:
+                result = render_all_templates(tmp_path, MagicMock(), MagicMock())
+
+        assert result.templates_rendered == 2
+        assert len(contexts) == 1
+        assert create_env.call_count == 1
+
+    def test_caches_compiled_templates_on_disk(self, tmp_path: Path):
+        _write(tmp_path / "a.md.j2", "{{ 1 + 1 }}")
+
+        render_all_templates(tmp_path, MagicMock(), MagicMock())
+
+        assert (tmp_path / "a.md").read_text() == "2"
+        assert list((tmp_path / ".nao" / JINJA_CACHE_DIR).iterdir())
+
+    def test_without_templates_creates_no_cache(self, tmp_path: Path):
+        result = render_all_templates(tmp_path, MagicMock(), MagicMock())
+
+        assert result.templates_rendered == 0
+        assert not (tmp_path / ".nao" / JINJA_CACHE_DIR).exists()
+
+    def test_renders_concurrently_and_reports_in_order(self, tmp_path: Path):
+        for name in ("c", "a", "b"):
+            _write(tmp_path / f"{name}.md.j2", f"{{{{ nao.notion.page('{name}').title }}}}")
+        _write(tmp_path / "broken.md.j2", "{{ nao.notion.page('broken').title }}")
+        started = threading.Barrier(3, timeout=5)
+
+        def fetch(page):
+            if page.page_url_or_id == "broken":
+                raise RuntimeError("page not shared")
+            # Every healthy page waits for the others: only passes if they are fetched concurrently
+            started.wait()
+            return {"title": page.page_url_or_id.upper()}
+
+        console = MagicMock()
+        with patch.object(NotionPage, "_fetch", autospec=True, side_effect=fetch):
+            result = render_all_templates(tmp_path, MagicMock(), console)
+
+        assert result.rendered_files == ["a.md", "b.md", "c.md"]
+        assert result.errors == ["broken.md.j2: RuntimeError: page not shared"]
+        assert (tmp_path / "c.md").read_text() == "C"
+        printed = [str(call.args[0]).split()[1] for call in console.print.call_args_list]
+        assert printed == ["a.md.j2", "b.md.j2", "broken.md.j2:", "c.md.j2"]
+
+    def test_fetches_a_shared_resource_once(self, tmp_path: Path):
+        for name in ("a", "b", "c"):
+            _write(tmp_path / f"{name}.md.j2", "{{ nao.notion.page('shared').title }}")
+        calls = []
+
+        def fetch(page):
+            calls.append(page.page_url_or_id)
+            time.sleep(0.05)
+            return {"title": "Shared"}
+
+        with patch.object(NotionPage, "_fetch", autospec=True, side_effect=fetch):
+            result = render_all_templates(tmp_path, MagicMock(), MagicMock())
+
+        assert result.templates_rendered == 3
+        assert calls == ["shared"]
+
+
+class TestIncrementalRendering:
+    def _render(self, project: Path, config=None, **kwargs):
+        return render_all_templates(project, config or NaoConfig(project_name="shop"), MagicMock(), **kwargs)
+
+    def test_skips_unchanged_templates(self, tmp_path: Path):
+        _write(tmp_path / "a.md.j2", "# {{ nao.config.project_name }}")
+        _write(tmp_path / "b.md.j2", "static")
+        self._render(tmp_path)
+
+        result = self._render(tmp_path)
+
+        assert (result.templates_rendered, result.templates_skipped) == (0, 2)
+        assert result.get_summary() == "2 up to date"
+
+    def test_rerenders_when_source_include_or_output_changes(self, tmp_path: Path):
+        _write(tmp_path / "a.md.j2", "{% include 'parts/header.txt' %}")
+        _write(tmp_path / "parts" / "header.txt", "v1")
+        _write(tmp_path / "b.md.j2", "b")
+        _write(tmp_path / "c.md.j2", "c")
+        self._render(tmp_path)
+        _write(tmp_path / "parts" / "header.txt", "v2")
+        _write(tmp_path / "b.md.j2", "b2")
+        (tmp_path / "c.md").write_text("edited by hand")
+
+        result = self._render(tmp_path)
+
+        assert result.rendered_files == ["a.md", "b.md", "c.md"]
+        assert (tmp_path / "a.md").read_text() == "v2"
+        assert (tmp_path / "c.md").read_text() == "c"
+
+    def test_rerenders_when_config_section_changes(self, tmp_path: Path):
+        _write(tmp_path / "a.md.j2", "# {{ nao.config.project_name }}")
+        _write(tmp_path / "b.md.j2", "static")
+        self._render(tmp_path)
+
+        result = self._render(tmp_path, NaoConfig(project_name="renamed"))
+
+        assert result.rendered_files == ["a.md"]
+        assert (tmp_path / "a.md").read_text() == "# renamed"
+
+    def test_rerenders_when_notion_page_was_edited(self, tmp_path: Path):
+        _write(tmp_path / "a.md.j2", "{{ nao.notion.page('abc').title }}")
+        page = {"title": "Roadmap", "last_edited_time": "2024-01-01T00:00:00.000Z"}
+
+        config = MagicMock()
+
+        with patch.object(NotionPage, "_fetch", autospec=True, return_value=page) as fetch:
+            assert self._render(tmp_path, config).templates_rendered == 1
+            with patch.object(NotionProvider, "last_edited_time", return_value="2024-01-01T00:00:00.000Z"):
+                assert self._render(tmp_path, config).templates_skipped == 1
+            with patch.object(NotionProvider, "last_edited_time", return_value="2024-02-01T00:00:00.000Z"):
+                assert self._render(tmp_path, config).templates_rendered == 1
+
+        assert fetch.call_count == 2
+
+    def test_dynamic_includes_are_always_rendered(self, tmp_path: Path):
+        _write(tmp_path / "a.md.j2", "{% set name = 'part.txt' %}{% include name %}")
+        _write(tmp_path / "part.txt", "part")
+        self._render(tmp_path)
+
+        assert self._render(tmp_path).templates_rendered == 1
+
+    def test_force_renders_everything(self, tmp_path: Path):
+        _write(tmp_path / "a.md.j2", "a")
+        self._render(tmp_path)
+
+        assert self._render(tmp_path, force=True).templates_rendered == 1
+
+
+class TestDatabaseProvider:
+    @pytest.fixture
+    def config(self, tmp_path: Path):
+        path = tmp_path / "shop.duckdb"
+        with duckdb.connect(str(path)) as conn:
+            conn.execute(
+                "CREATE TABLE orders AS SELECT * FROM (VALUES (1, 'paid'), (2, 'paid'), (3, 'open')) t(id, status)"
+            )
+        return NaoConfig(project_name="shop", databases=[DuckDBConfig(name="shop", path=str(path))])
+
+    def _render(self, project: Path, config, **kwargs):
+        with (
+            patch.object(DuckDBConfig, "connect", autospec=True, side_effect=DuckDBConfig.connect) as connect,
+            patch.object(DuckDBConfig, "execute_sql", autospec=True, side_effect=DuckDBConfig.execute_sql) as execute,
+        ):
+            result = render_all_templates(project, config, MagicMock(), **kwargs)
+        assert result.errors == []
+        return result, connect.call_count, execute.call_count
+
+    def test_shares_connection_and_memoizes_queries(self, tmp_path: Path, config):
+        _write(tmp_path / "a.md.j2", "{{ nao.database('shop').scalar('SELECT count(*) FROM orders') }}")
+        _write(tmp_path / "b.md.j2", "{{ nao.database().scalar('SELECT count(*) FROM orders') }}")
+        _write(
+            tmp_path / "c.md.j2",
+            "{% for row in nao.database('shop').query('SELECT status, count(*) AS n FROM orders GROUP BY 1 ORDER BY 1')"
+            " %}{{ row.status }}={{ row.n }} {% endfor %}",
+        )
+
+        result, connects, executes = self._render(tmp_path, config)
+
+        assert result.templates_rendered == 3
+        assert (connects, executes) == (1, 2)
+        assert (tmp_path / "a.md").read_text() == "3"
+        assert (tmp_path / "c.md").read_text() == "open=1 paid=2 "
+
+    def test_reuses_cached_results_across_runs(self, tmp_path: Path, config):
+        _write(tmp_path / "a.md.j2", "{{ nao.database('shop').scalar('SELECT count(*) FROM orders') }}")
+        _write(tmp_path / "b.md.j2", "{{ nao.database('shop').scalar('SELECT max(id) FROM orders', ttl=0) }}")
+        self._render(tmp_path, config)
+
+        result, connects, executes = self._render(tmp_path, config)
+
+        # The cached count is still fresh; the query with ttl=0 is run again to check its template
+        assert (result.templates_skipped, connects, executes) == (2, 1, 1)
+
+        result, _, executes = self._render(tmp_path, config, force=True)
+
+        assert (result.templates_rendered, executes) == (2, 1)
+
+    def test_expired_results_are_queried_again(self, tmp_path: Path, config):
+        _write(tmp_path / "a.md.j2", "{{ nao.database('shop').scalar('SELECT count(*) FROM orders', ttl=60) }}")
+        self._render(tmp_path, config)
+        [cache_file] = (tmp_path / ".nao" / "queries").iterdir()
+        cached = json.loads(cache_file.read_text())
+        cache_file.write_text(json.dumps({**cached, "fetched_at": cached["fetched_at"] - 120}))
+
+        _, _, executes = self._render(tmp_path, config)
+
+        assert executes == 1
+
+    def test_deletes_expired_results(self, tmp_path: Path, config):
+        _write(tmp_path / "a.md.j2", "{{ nao.database('shop').scalar('SELECT count(*) FROM orders') }}")
+        queries = tmp_path / ".nao" / "queries"
+        _write(queries / "gone.json", json.dumps({"sql": "SELECT 1", "fetched_at": 0, "expires_at": 60, "rows": []}))
+        _write(queries / "gone.123.tmp", "{")
+        os.utime(queries / "gone.123.tmp", (0, 0))
+
+        self._render(tmp_path, config)
+
+        [cache_file] = queries.iterdir()
+        assert json.loads(cache_file.read_text())["rows"] == [{"count_star()": 3}]
+
+    def test_catalog_lookups(self, tmp_path: Path, config):
+        catalog = tmp_path / "databases" / "type=duckdb" / "database=shop" / "catalog.jsonl"
+        _write(
+            catalog,
+            "\n".join(
+                json.dumps({"schema": "main", "table": table, "description": None, "columns": columns})
+                for table, columns in (
+                    ("orders", [{"name": "id"}, {"name": "customer_id"}]),
+                    ("customers", [{"name": "ID"}]),
+                )
+            ),
+        )
+        database = create_nao_context(config, tmp_path).database("shop")
+
+        assert database.table("main", "orders")["columns"][1]["name"] == "customer_id"
+        assert [entry["table"] for entry in database.tables_with_column("id")] == ["orders", "customers"]
+        assert database.tables(schema="other") == []
+        with pytest.raises(ValueError, match="not found"):
+            database.table("main", "missing")
+
+    def test_catalog_in_the_output_dir_of_the_last_sync(self, tmp_path: Path, config):
+        save_output_dirs(tmp_path, {"Databases": "context/databases"})
+        catalog = tmp_path / "context" / "databases" / "type=duckdb" / "database=shop" / "catalog.jsonl"
+        _write(catalog, json.dumps({"schema": "main", "table": "orders", "description": None, "columns": []}))
+
+        assert create_nao_context(config, tmp_path).database("shop").table("main", "orders")["table"] == "orders"
+
+    def test_unknown_database(self, tmp_path: Path, config):
+        with pytest.raises(ValueError, match="Unknown database 'other'"):
+            create_nao_context(config, tmp_path).database("other")
@@ -0,0 +1,50 @@
+"""Unit tests for the filesystem helpers."""
+
+import os
+from pathlib import Path
+
+from nao_core.fs import WriteStats, write_if_changed
+
+
+class TestWriteIfChanged:
+    """Tests for write_if_changed."""
+
+    def test_writes_new_file(self, tmp_path: Path):
+        """A missing file is always written."""
+        path = tmp_path / "out.md"
+
+        assert write_if_changed(path, "hello") is True
+        assert path.read_text() == "hello"
+
+    def test_skips_identical_content(self, tmp_path: Path):
+        """Identical content leaves the file and its mtime untouched."""
+        path = tmp_path / "out.md"
+        path.write_text("hello")
+        os.utime(path, (1_000_000, 1_000_000))
+
+        assert write_if_changed(path, "hello") is False
+        assert path.stat().st_mtime == 1_000_000
+
+    def test_rewrites_changed_content_of_same_size(self, tmp_path: Path):
+        """Content of the same length but different bytes is rewritten."""
+        path = tmp_path / "out.md"
+        path.write_text("hello")
+
+        assert write_if_changed(path, "world") is True
+        assert path.read_text() == "world"
+
+
+class TestWriteStats:
+    """Tests for the WriteStats counters."""
+
+    def test_counts_written_and_unchanged(self, tmp_path: Path):
+        """Each write is counted as written or unchanged."""
+        stats = WriteStats()
+
+        stats.write(tmp_path / "a.md", "a")
+        stats.write(tmp_path / "b.md", "b")
+        stats.write(tmp_path / "a.md", "a")
+
+        assert stats.written == 2
+        assert stats.unchanged == 1
+        assert stats.get_summary() == "2 files written, 1 unchanged"
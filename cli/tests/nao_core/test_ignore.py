@@ -0,0 +1,29 @@
+"""Unit tests for .naoignore matching."""
+
+from pathlib import Path
+
+from nao_core.ignore import NAOIGNORE_FILENAME, NaoIgnore
+
+
+class TestNaoIgnore:
+    def test_load_skips_comments_and_blank_lines(self, tmp_path: Path):
+        (tmp_path / NAOIGNORE_FILENAME).write_text("# generated\n\ntemplates/\n*.j2\n")
+
+        assert NaoIgnore.load(tmp_path).patterns == ("templates/", "*.j2")
+
+    def test_load_without_file(self, tmp_path: Path):
+        assert NaoIgnore.load(tmp_path).patterns == ()
+
+    def test_directory_patterns_match_anywhere(self):
+        naoignore = NaoIgnore(("templates/",))
+
+        assert naoignore.matches("templates/a.md")
+        assert naoignore.matches("repos/app/templates/b.md")
+        assert not naoignore.matches("docs/templates.md")
+
+    def test_glob_patterns_match_names_and_paths(self):
+        naoignore = NaoIgnore(("*.j2", "docs/internal*"))
+
+        assert naoignore.matches("a/b/query.sql.j2")
+        assert naoignore.matches("docs/internal-notes.md")
+        assert not naoignore.matches("docs/a.md")
@@ -0,0 +1,113 @@
+"""Unit tests for the full-text search index."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from nao_core.search import get_search_index_path, search, split_identifiers, update_search_index
+
+
+def _write(path: Path, content: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    table_dir = tmp_path / "databases" / "type=duckdb" / "database=shop" / "schema=sales" / "table=orders"
+    _write(table_dir / "columns.md", "# orders\n\n- order_id (int64)\n- customerId (int64)\n- amount (float64)\n")
+    _write(tmp_path / "docs" / "revenue.md", "# Revenue\n\nRevenue is the sum of order amounts.\n")
+    _write(tmp_path / "RULES.md", "Always answer with SQL.\n")
+    return tmp_path
+
+
+def _search(project: Path, query: str, **kwargs) -> list[str]:
+    return [hit.path for hit in search(get_search_index_path(project), query, **kwargs)]
+
+
+class TestSplitIdentifiers:
+    def test_splits_snake_case_camel_case_and_dotted_names(self):
+        assert split_identifiers("orders.customer_id customerName") == ["orders", "customer", "id", "name"]
+
+    def test_skips_plain_words(self):
+        assert split_identifiers("revenue is the sum") == []
+
+
+class TestUpdateSearchIndex:
+    def test_indexes_markdown_files(self, project: Path):
+        result = update_search_index(project)
+
+        assert (result.indexed, result.unchanged, result.removed) == (3, 0, 0)
+        assert get_search_index_path(project).exists()
+
+    def test_only_reindexes_changed_files(self, project: Path):
+        update_search_index(project)
+        revenue = project / "docs" / "revenue.md"
+        revenue.write_text("# Revenue\n\nNet revenue excludes refunds.\n")
+        os.utime(revenue, ns=(0, 1))
+
+        result = update_search_index(project)
+
+        assert (result.indexed, result.unchanged) == (1, 2)
+        assert _search(project, "refunds") == ["docs/revenue.md"]
+        assert _search(project, "amounts") == []
+
+    def test_drops_removed_files(self, project: Path):
+        update_search_index(project)
+        (project / "RULES.md").unlink()
+
+        result = update_search_index(project)
+
+        assert result.removed == 1
+        assert _search(project, "answer") == []
+
+    def test_respects_naoignore_and_hidden_folders(self, project: Path):
+        _write(project / ".naoignore", "docs/\n")
+        _write(project / ".nao" / "notes.md", "revenue\n")
+
+        update_search_index(project)
+
+        assert _search(project, "revenue") == []
+
+
+class TestSearch:
+    def test_matches_identifier_parts(self, project: Path):
+        update_search_index(project)
+
+        hits = search(get_search_index_path(project), "customer")
+
+        assert [hit.path for hit in hits] == [
+            "databases/type=duckdb/database=shop/schema=sales/table=orders/columns.md"
+        ]
+        assert hits[0].title == "shop.sales.orders columns"
+        assert hits[0].source == "databases"
+        assert "**customerId**" in hits[0].snippet
+
+    def test_ranks_title_matches_first(self, project: Path):
+        update_search_index(project)
+
+        assert _search(project, "revenue orders", limit=1) == ["docs/revenue.md"]
+        assert _search(project, "orders")[0].endswith("table=orders/columns.md")
+
+    def test_falls_back_to_any_word(self, project: Path):
+        update_search_index(project)
+
+        assert _search(project, "refunds sql") == ["RULES.md"]
+
+    def test_filters_by_source(self, project: Path):
+        update_search_index(project)
+
+        assert _search(project, "order", source="docs") == ["docs/revenue.md"]
+
+    def test_requires_an_index(self, tmp_path: Path):
+        with pytest.raises(FileNotFoundError):
+            search(get_search_index_path(tmp_path), "orders")
+
+    def test_project_path_with_uri_characters(self, tmp_path: Path):
+        project = tmp_path / "my project #1?"
+        _write(project / "docs" / "revenue.md", "# Revenue\n")
+        update_search_index(project)
+
+        assert _search(project, "revenue") == ["docs/revenue.md"]